@@ -0,0 +1,5 @@
+from VRPSolverEasy.src.bench import *
+
+if __name__ == "__main__":
+    import sys
+    sys.exit(main())
@@ -0,0 +1 @@
+from VRPSolverEasy.src.cache import *
@@ -2,11 +2,9 @@
 Capacitated Vehicle Routing Problem with Time Windows. """
 
 
-import os
-import math
 import sys
 import getopt
-from VRPSolverEasy.src import solver
+from VRPSolverEasy.src import solver, io, distances
 
 
 class DataCvrptw:
@@ -42,22 +40,6 @@ class DataCvrptw:
         self.depot_service_time = depot_service_time
 
 
-def read_instance(name: str):
-    """ Read an instance in the folder data from a given name """
-
-    with open(
-            os.path.normpath(name),
-            "r", encoding="UTF-8") as file:
-        return [str(element) for element in file.read().split()]
-
-
-
-def compute_euclidean_distance(x_i, y_i, x_j, y_j, number_digit=3):
-    """Compute the euclidean distance between 2 points from graph"""
-    return round(math.sqrt((x_i - x_j)**2 +
-                           (y_i - y_j)**2), number_digit)
-
-
 def solve_demo(instance_name,
                time_resolution=30,
                solver_name_input="CLP",
@@ -111,34 +93,14 @@ def solve_demo(instance_name,
                            demand=data.cust_demands[i]
                            )
 
-
-    # Compute the links between depot and other points
-    for i,cust_i in enumerate(data.cust_coordinates):
-        dist = compute_euclidean_distance(cust_i[0],
-                                          cust_i[1],
-                                          data.depot_coordinates[0],
-                                          data.depot_coordinates[1]
-                                          )
-        model.add_link(start_point_id=0,
-                       end_point_id=i + 1,
-                       distance=dist,
-                       time=dist
-                       )
-
-    # Compute the links between points
-    for i,cust_i in enumerate(data.cust_coordinates):
-        for j in range(i + 1, len(data.cust_coordinates)):
-            dist = compute_euclidean_distance(cust_i[0],
-                                              cust_i[1],
-                                              data.cust_coordinates[j][0],
-                                              data.cust_coordinates[j][1]
-                                              )
-            model.add_link(start_point_id=i + 1,
-                           end_point_id=j + 1,
-                           distance=dist,
-                           time=dist
-                           )
-
+    # Compute the links between all points (depot 0 and customers)
+    x_coordinates = [data.depot_coordinates[0]] + [
+        cust_i[0] for cust_i in data.cust_coordinates]
+    y_coordinates = [data.depot_coordinates[1]] + [
+        cust_i[1] for cust_i in data.cust_coordinates]
+    matrix = distances.distance_matrix(x_coordinates, y_coordinates,
+                                       rounding=3)
+    model.add_links_from_matrix(matrix, time=matrix)
 
     # set parameters
     model.set_parameters(time_limit=time_resolution,
@@ -163,68 +125,22 @@ def solve_demo(instance_name,
 def read_cvrptw_instances(instance_full_path):
     """Read literature instances of CVRPTW ("Solomon" format) by giving the name of instance
         and returns dictionary containing all elements of model"""
-    instance_iter = iter(
-        read_instance(instance_full_path))
-
-    for i in range(4):
-        next(instance_iter)
-
-    max_number_input = int(next(instance_iter))
-    capacity_input = int(next(instance_iter))
-
-    for i in range(13):
-        next(instance_iter)
-
-    depot_x = int(next(instance_iter))
-    depot_y = int(next(instance_iter))
-    next(instance_iter) #depot demand
-    depot_tw_begin = int(next(instance_iter))
-    depot_tw_end = int(next(instance_iter))
-    depot_service_time = int(next(instance_iter))
-    id_point = 0
-
-    vehicle_capacity = capacity_input
-    vehicle_max_number = max_number_input
-
-    depot_coordinates = [depot_x, depot_y]
-
-    cust_coordinates = []
-    cust_demands = []
-    cust_tw_begin = []
-    cust_tw_end = []
-    cust_service_time = []
-
-    # Add the customers in the list of points
-    while True:
-        id_point += 1
-        value = next(instance_iter, None)
-        if value is None:
-            break
-        x_coord = float(next(instance_iter))
-        y_coord = float(next(instance_iter))
-        demand = int(next(instance_iter))
-        tw_begin = int(next(instance_iter))
-        tw_end = int(next(instance_iter))
-        service_time = int(next(instance_iter))
-
-        cust_coordinates.append([x_coord, y_coord])
-        cust_tw_begin.append(tw_begin)
-        cust_tw_end.append(tw_end + service_time)
-        cust_service_time.append(service_time)
-        cust_demands.append(demand)
-
-    return DataCvrptw(vehicle_capacity,
-                      id_point - 1,
-                      vehicle_max_number,
-                      cust_demands,
-                      cust_coordinates,
-                      depot_coordinates,
-                      cust_tw_begin,
-                      cust_tw_end,
-                      cust_service_time,
-                      depot_tw_begin,
-                      depot_tw_end,
-                      depot_service_time
+    instance = io.read_solomon(instance_full_path)
+    customers = range(1, instance.dimension)
+
+    return DataCvrptw(int(instance.vehicle_capacities[0]),
+                      instance.dimension - 1,
+                      int(instance.vehicle_max_numbers[0]),
+                      instance.demands[1:].tolist(),
+                      [[instance.x[i], instance.y[i]] for i in customers],
+                      [instance.x[0], instance.y[0]],
+                      instance.tw_begin[1:].tolist(),
+                      [instance.tw_end[i] + instance.service_times[i]
+                       for i in customers],
+                      instance.service_times[1:].tolist(),
+                      instance.tw_begin[0],
+                      instance.tw_end[0],
+                      instance.service_times[0]
                       )
 
 
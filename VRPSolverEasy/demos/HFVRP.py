@@ -1,11 +1,9 @@
 """ This module allows to solve Queiroga instances of
 Heterogeneous Fleet Vehicle Routing Problem """
 
-import os
-import math
 import sys
 import getopt
-from VRPSolverEasy.src import solver
+from VRPSolverEasy.src import solver, io, distances
 
 
 class DataHfvrp:
@@ -34,19 +32,6 @@ class DataHfvrp:
         self.depot_coordinates = depot_coordinates
 
 
-def compute_euclidean_distance(x_i, y_i, x_j, y_j, number_digit=3):
-    """Compute the euclidean distance between 2 points from graph"""
-    return round(math.sqrt((x_i - x_j)**2 +
-                           (y_i - y_j)**2), number_digit)
-
-
-def read_instance(name: str):
-    """ Read an instance in the folder data from a given name """
-    with open(
-            os.path.normpath(name),
-            "r", encoding="UTF-8") as file:
-        return [str(element) for element in file.read().split()]
-
 def solve_demo(instance_name,
                time_resolution=30,
                solver_name_input="CLP",
@@ -93,28 +78,14 @@ def solve_demo(instance_name,
                            demand=data.cust_demands[i]
                            )
 
-    # Compute the links between depot and other points
-    for i,cust_i in enumerate(data.cust_coordinates):
-        dist = compute_euclidean_distance(cust_i[0],
-                                          cust_i[1],
-                                          data.depot_coordinates[0],
-                                          data.depot_coordinates[1])
-        model.add_link(start_point_id=0,
-                       end_point_id=i + 1,
-                       distance=dist
-                       )
-
-    # Compute the links between points
-    for i,cust_i in enumerate(data.cust_coordinates):
-        for j in range(i + 1, len(data.cust_coordinates)):
-            dist = compute_euclidean_distance(cust_i[0],
-                                              cust_i[1],
-                                              data.cust_coordinates[j][0],
-                                              data.cust_coordinates[j][1])
-            model.add_link(start_point_id=i + 1,
-                           end_point_id=j + 1,
-                           distance=dist
-                           )
+    # Compute the links between all points (depot 0 and customers)
+    x_coordinates = [data.depot_coordinates[0]] + [
+        cust_i[0] for cust_i in data.cust_coordinates]
+    y_coordinates = [data.depot_coordinates[1]] + [
+        cust_i[1] for cust_i in data.cust_coordinates]
+    model.add_links_from_matrix(distances.distance_matrix(x_coordinates,
+                                                          y_coordinates,
+                                                          rounding=3))
 
     # set parameters
     model.set_parameters(time_limit=time_resolution,
@@ -139,59 +110,18 @@ def solve_demo(instance_name,
 def read_hfvrp_instances(instance_full_path):
     """Read literature instances of HFVRP by giving the name of instance
         and returns dictionary containing all elements of model"""
-    instance_iter = iter(
-        read_instance(instance_full_path))
-
-    nb_points = int(next(instance_iter))
-
-    next(instance_iter)  # pass id depot (always 0)
-    depot_x = int(next(instance_iter))
-    depot_y = int(next(instance_iter))
-    next(instance_iter) #depot demand
-    id_point = 0
-
-    # get demands and coordinates
-    cust_coordinates = []
-    cust_demands = []
-    depot_coordinates = [depot_x, depot_y]
-
-    for _ in range(nb_points):
-        id_point += 1
-        next(instance_iter)  # pass id point (take index)
-        x_coord = float(next(instance_iter))
-        y_coord = float(next(instance_iter))
-        demand = int(next(instance_iter))
-        cust_coordinates.append([x_coord, y_coord])
-        cust_demands.append(demand)
-
-    nb_vehicles = int(next(instance_iter))
-
-    vehicle_capacities = []
-    vehicle_fixed_costs = []
-    vehicle_var_costs = []
-    vehicle_max_numbers = []
-
-    for _ in range(1, nb_vehicles + 1):
-        capacity = int(next(instance_iter))
-        fixed_cost = float(next(instance_iter))
-        var_cost_dist = float(next(instance_iter))
-        next(instance_iter)  # pass min number
-        max_number = int(next(instance_iter))
-
-        vehicle_capacities.append(capacity)
-        vehicle_fixed_costs.append(fixed_cost)
-        vehicle_var_costs.append(var_cost_dist)
-        vehicle_max_numbers.append(max_number)
-
-    return DataHfvrp(nb_points,
-                     nb_vehicles,
-                     vehicle_capacities,
-                     vehicle_fixed_costs,
-                     vehicle_var_costs,
-                     vehicle_max_numbers,
-                     cust_demands,
-                     cust_coordinates,
-                     depot_coordinates
+    instance = io.read_hfvrp(instance_full_path)
+
+    return DataHfvrp(instance.dimension - 1,
+                     len(instance.vehicle_capacities),
+                     instance.vehicle_capacities.tolist(),
+                     instance.vehicle_fixed_costs.tolist(),
+                     instance.vehicle_var_costs.tolist(),
+                     instance.vehicle_max_numbers.tolist(),
+                     instance.demands[1:].tolist(),
+                     [[instance.x[i], instance.y[i]]
+                      for i in range(1, instance.dimension)],
+                     [instance.x[0], instance.y[0]]
                      )
 
 
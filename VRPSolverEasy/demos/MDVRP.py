@@ -1,11 +1,9 @@
 """ This module allows to solve Cordeau’s instances of
 Multi Depot Vehicle Routing Problem """
 
-import os
-import math
 import sys
 import getopt
-from VRPSolverEasy.src import solver
+from VRPSolverEasy.src import solver, io, distances
 
 
 class DataMdvrp:
@@ -28,21 +26,6 @@ class DataMdvrp:
         self.depot_coordinates = depot_coordinates
 
 
-def compute_euclidean_distance(x_i, y_i, x_j, y_j, number_digit=3):
-    """Compute the euclidean distance between 2 points from graph"""
-    return round(math.sqrt((x_i - x_j)**2 +
-                           (y_i - y_j)**2), number_digit)
-
-
-def read_instance(name: str):
-    """ Read an instance in the folder data from a given name """
-
-    with open(
-            os.path.normpath(name),
-            "r", encoding="UTF-8") as file:
-        return [str(element) for element in file.read().split()]
-
-
 def solve_demo(instance_name,
                time_resolution=30,
                solver_name_input="CLP",
@@ -93,34 +76,18 @@ def solve_demo(instance_name,
     for i in range(data.nb_customers,data.nb_customers + data.nb_depots):
         model.add_depot(id=i)
 
-
-
-    nb_link = 0
-
-    # Compute the links between depots and other points
-    for index,coord_depot in enumerate(data.depot_coordinates):
-        for i, cust_i in enumerate(data.cust_coordinates):
-            dist = compute_euclidean_distance(
-                cust_i[0],
-                cust_i[1],
-                coord_depot[0],
-                coord_depot[1])
-            model.add_link(start_point_id=index+data.nb_customers,
-                           end_point_id=i,
-                           distance=dist
-                           )
-
-    # Compute the links between points
-    for i,cust_i in enumerate(data.cust_coordinates):
-        for j in range(i + 1, len(data.cust_coordinates)):
-            dist = compute_euclidean_distance(cust_i[0],
-                                              cust_i[1],
-                                              data.cust_coordinates[j][0],
-                                              data.cust_coordinates[j][1])
-            model.add_link(start_point_id=i,
-                           end_point_id=j,
-                           distance=dist
-                           )
+    # Compute the links between all points (customers then depots),
+    # there is no link between two depots
+    coordinates = data.cust_coordinates + data.depot_coordinates
+    nb_points = len(coordinates)
+    is_customer = [i < data.nb_customers for i in range(nb_points)]
+    model.add_links_from_matrix(
+        distances.distance_matrix([coord[0] for coord in coordinates],
+                                  [coord[1] for coord in coordinates],
+                                  rounding=3),
+        sparsity_mask=[[is_customer[i] or is_customer[j]
+                        for j in range(nb_points)]
+                       for i in range(nb_points)])
 
     # set parameters
     model.set_parameters(time_limit=time_resolution,
@@ -145,55 +112,17 @@ def solve_demo(instance_name,
 def read_mdvrp_instances(instance_full_path):
     """Read literature instances of MDVRP by giving the name of instance
         and returns dictionary containing all elements of model"""
-    instance_iter = iter(
-        read_instance(instance_full_path))
-
-    # pass type instance
-    next(instance_iter)
-
-    next(instance_iter)
-
-    nb_customers = int(next(instance_iter))
-    nb_depots = int(next(instance_iter))
-
-    vehicle_capacities = []
-    for _ in range(nb_depots):
-        # pass max duration
-        next(instance_iter)
-        vehicle_capacities.append(int(next(instance_iter)))
-
-    cust_demands = []
-    cust_coordinates = []
-    for _ in range(nb_customers):
-        next(instance_iter)
-        cust_x = int(next(instance_iter))
-        cust_y = int(next(instance_iter))
-        cust_coordinates.append([cust_x, cust_y])
-        # pass duration
-        next(instance_iter)
-
-        cust_demand = int(next(instance_iter))
-        cust_demands.append(cust_demand)
-        for _ in range(6):
-            next(instance_iter)
-
-    depot_coordinates = []
-    # add depots and vehicle types
-    for _ in range(nb_depots):
-        next(instance_iter)
-        cust_x = int(next(instance_iter))
-        cust_y = int(next(instance_iter))
-        depot_coordinates.append([cust_x, cust_y])
-
-        for _ in range(4):
-            next(instance_iter)
+    instance = io.read_mdvrp(instance_full_path)
+    nb_customers = instance.dimension - len(instance.depots)
 
     return DataMdvrp(nb_customers,
-                     nb_depots,
-                     vehicle_capacities[0],
-                     cust_demands,
-                     cust_coordinates,
-                     depot_coordinates
+                     len(instance.depots),
+                     int(instance.vehicle_capacities[0]),
+                     instance.demands[:nb_customers].tolist(),
+                     [[instance.x[i], instance.y[i]]
+                      for i in range(nb_customers)],
+                     [[instance.x[i], instance.y[i]]
+                      for i in instance.depots]
                      )
 
 
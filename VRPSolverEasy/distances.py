@@ -0,0 +1 @@
+from VRPSolverEasy.src.distances import *
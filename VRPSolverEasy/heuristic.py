@@ -0,0 +1 @@
+from VRPSolverEasy.src.heuristic import *
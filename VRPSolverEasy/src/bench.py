@@ -0,0 +1,385 @@
+"""This module measures the time of each stage of a resolution on the
+instances given with the demos (CVRP, CVRPTW, HFVRP and MDVRP).
+
+For each instance, the stages are : reading the file (parse), building
+the model (build), :py:meth:`Model.check_depots`, :py:meth:`Model.set_json`
+(with the size of the json format given to bapcod), the resolution by
+bapcod (solve) and the decoding of its output (decode). The peak of memory
+used by the process and the statistics of the resolution are recorded.
+
+The results are written in json or csv, and compared with the results
+of a previous run kept as baseline. Run with :
+
+    python -m VRPSolverEasy.bench --no-solve --json results.json
+
+The stages before the resolution do not load bapcod, they run without
+the library with --no-solve."""
+
+import argparse
+import csv
+import fnmatch
+import json
+import multiprocessing
+import os
+import platform
+import sys
+import time
+from VRPSolverEasy.src import solver, io, distances
+
+try:
+    import resource
+except ImportError:
+    # not available on Windows, the peak of memory is not measured
+    resource = None
+
+DATA_PATH = os.path.join(os.path.dirname(os.path.dirname(
+    os.path.abspath(__file__))), "demos", "data")
+
+TYPES = ("CVRP", "CVRPTW", "HFVRP", "MDVRP")
+
+FIELDS = ("instance", "type", "dimension", "parse_time", "build_time",
+          "check_depots_time", "set_json_time", "payload_bytes",
+          "solve_time", "decode_time", "peak_rss", "status",
+          "solution_value", "root_lb", "best_lb", "nb_nodes",
+          "solution_time", "error")
+
+# relative increases allowed by compare() for each measure
+THRESHOLDS = {"parse_time": 0.25, "build_time": 0.25,
+              "check_depots_time": 0.25, "set_json_time": 0.25,
+              "payload_bytes": 0.0, "solve_time": 0.25,
+              "decode_time": 0.25, "peak_rss": 0.1}
+
+# increases below these values are ignored (noise of the measures)
+_MINIMUM_DELTAS = {"parse_time": 0.005, "build_time": 0.005,
+                   "check_depots_time": 0.005, "set_json_time": 0.005,
+                   "solve_time": 0.5, "decode_time": 0.005,
+                   "peak_rss": 1 << 20}
+
+_FORMAT_VERSION = 1
+
+
+def instances(data_path=DATA_PATH, types=TYPES, pattern="*"):
+    """Return the paths of instances of the given types whose name
+    matches the pattern (see fnmatch), sorted by type and by name"""
+    paths = []
+    for type_ in types:
+        folder = os.path.join(data_path, type_)
+        if not os.path.isdir(folder):
+            raise ValueError("no folder of instances " + folder)
+        paths.extend(os.path.join(folder, name)
+                     for name in sorted(os.listdir(folder))
+                     if fnmatch.fnmatch(name, pattern) and
+                     not name.startswith(("_", ".")) and
+                     os.path.isfile(os.path.join(folder, name)))
+    return paths
+
+
+def _matrix(instance, rounding):
+    """Return the matrix of distances of an instance"""
+    if instance.edge_weight_type == "EXPLICIT":
+        return instance.edge_weights
+    return distances.distance_matrix(instance.x, instance.y,
+                                     rounding=rounding)
+
+
+def build_model(instance):
+    """Return the model of an instance read by :py:mod:`VRPSolverEasy.io`,
+    built as in the demos of its type"""
+    model = solver.Model()
+    customers = instance.customers
+    nb_customers = len(customers)
+    if instance.type == "MDVRP":
+        # customers then depots, there is no link between two depots
+        for depot in instance.depots:
+            model.add_vehicle_type(
+                id=depot, start_point_id=depot, end_point_id=depot,
+                capacity=int(instance.vehicle_capacities[0]),
+                max_number=nb_customers, var_cost_dist=1)
+        model.add_customers(customers,
+                            demands=[instance.demands[i] for i in customers],
+                            id_customers=[i + 1 for i in customers])
+        model.add_depots(list(instance.depots))
+        is_customer = [i not in set(instance.depots)
+                       for i in range(instance.dimension)]
+        model.add_links_from_matrix(
+            _matrix(instance, 3),
+            sparsity_mask=[[is_customer[i] or is_customer[j]
+                            for j in range(instance.dimension)]
+                           for i in range(instance.dimension)])
+        return model
+
+    depot = instance.depots[0]
+    if instance.type == "HFVRP":
+        for i, capacity in enumerate(instance.vehicle_capacities):
+            model.add_vehicle_type(
+                id=i + 1, start_point_id=depot, end_point_id=depot,
+                capacity=int(capacity),
+                max_number=int(instance.vehicle_max_numbers[i]) or
+                nb_customers,
+                fixed_cost=instance.vehicle_fixed_costs[i],
+                var_cost_dist=instance.vehicle_var_costs[i])
+    else:
+        max_number = int(instance.vehicle_max_numbers[0]) \
+            if len(instance.vehicle_max_numbers) else 0
+        model.add_vehicle_type(
+            id=1, start_point_id=depot, end_point_id=depot,
+            capacity=int(instance.vehicle_capacities[0]),
+            max_number=max_number or nb_customers,
+            tw_begin=instance.tw_begin[depot],
+            tw_end=instance.tw_end[depot], var_cost_dist=1)
+    if instance.type == "CVRPTW":
+        model.add_depot(id=depot,
+                        service_time=instance.service_times[depot],
+                        tw_begin=instance.tw_begin[depot],
+                        tw_end=instance.tw_end[depot])
+        model.add_customers(
+            customers, demands=[instance.demands[i] for i in customers],
+            service_times=[instance.service_times[i] for i in customers],
+            tw_begins=[instance.tw_begin[i] for i in customers],
+            tw_ends=[instance.tw_end[i] + instance.service_times[i]
+                     for i in customers])
+        matrix = _matrix(instance, 3)
+        model.add_links_from_matrix(matrix, time=matrix)
+        return model
+    model.add_depot(id=depot)
+    model.add_customers(customers,
+                        demands=[instance.demands[i] for i in customers])
+    model.add_links_from_matrix(
+        _matrix(instance, 0 if instance.type == "CVRP" else 3))
+    return model
+
+
+def _peak_rss():
+    """Return the peak of memory used by the process in bytes,
+    None if it's not available"""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # kilobytes on Linux, bytes on macOS
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+def measure(path, solve=True, time_limit=30.0, solver_name="CLP"):
+    """Return the measures of the stages on an instance as a dict
+    with the keys of FIELDS (times in seconds, sizes in bytes).
+
+    Additional informations:
+        - solve : if False, bapcod is not called (nor loaded) and the
+          measures of the resolution are None
+        - time_limit, solver_name : parameters of the resolution
+        - an error stops the measures of the instance, its message
+          is given in error
+        - peak_rss is the peak of the process, see :py:func:`run` to
+          measure each instance in its own process"""
+    result = dict.fromkeys(FIELDS)
+    result["instance"] = "/".join((
+        os.path.basename(os.path.dirname(path)), os.path.basename(path)))
+    try:
+        start = time.perf_counter()
+        instance = io.read_instance(path)
+        step = time.perf_counter()
+        result["parse_time"] = step - start
+        result["type"] = instance.type
+        result["dimension"] = instance.dimension
+
+        model = build_model(instance)
+        model.set_parameters(time_limit=time_limit, solver_name=solver_name)
+        model.parameters.print_level = -2
+        step, start = time.perf_counter(), step
+        result["build_time"] = step - start
+
+        model.check_depots()
+        step, start = time.perf_counter(), step
+        result["check_depots_time"] = step - start
+
+        # check_depots is already done, only set_json is measured
+        payload = model._prepare_payload()
+        step, start = time.perf_counter(), step
+        result["set_json_time"] = step - start
+        result["payload_bytes"] = len(payload) - 1
+
+        if solve:
+            if model.parameters.cplex_path != str():
+                solver._load_cplex(model.parameters.cplex_path)
+            solver._get_library()
+            start = time.perf_counter()
+            output = solver._solve_payload(payload)
+            step = time.perf_counter()
+            result["solve_time"] = step - start
+            model._set_output(output)
+            result["decode_time"] = time.perf_counter() - step
+            statistics = model.statistics
+            result["status"] = model.status
+            result["solution_value"] = model.solution.value
+            result["root_lb"] = statistics.root_lb
+            result["best_lb"] = statistics.best_lb
+            result["nb_nodes"] = statistics.nb_branch_and_bound_nodes
+            result["solution_time"] = statistics.solution_time
+    except Exception as error:
+        result["error"] = "%s: %s" % (type(error).__name__, error)
+    result["peak_rss"] = _peak_rss()
+    return result
+
+
+def _measure(arguments):
+    path, options = arguments
+    return measure(path, **options)
+
+
+def run(paths, solve=True, time_limit=30.0, solver_name="CLP",
+        processes=None, progress=None):
+    """Return the list of measures of the instances (see
+    :py:func:`measure`).
+
+    Additional informations:
+        - processes : if None, the instances are measured in this
+          process, otherwise each instance is measured in a new process
+          (peak of memory of the instance only) with this number of
+          processes at once. More than one process disturbs the times
+          of the resolutions
+        - progress : function called with each result"""
+    options = {"solve": solve, "time_limit": time_limit,
+               "solver_name": solver_name}
+    tasks = [(path, options) for path in paths]
+    results = []
+    if processes is None:
+        measures = map(_measure, tasks)
+        pool = None
+    else:
+        if processes < 1:
+            raise ValueError("processes must be greater than 0")
+        pool = multiprocessing.Pool(processes, maxtasksperchild=1)
+        measures = pool.imap(_measure, tasks, chunksize=1)
+    try:
+        for result in measures:
+            results.append(result)
+            if progress is not None:
+                progress(result)
+    finally:
+        if pool is not None:
+            pool.close()
+            pool.join()
+    return results
+
+
+def write_json(results, path):
+    """Write the results in json with the versions of Python and
+    of the platform"""
+    with open(path, "w", encoding="UTF-8") as file:
+        json.dump({"version": _FORMAT_VERSION,
+                   "python": platform.python_version(),
+                   "platform": platform.platform(),
+                   "results": results}, file, indent=1)
+
+
+def write_csv(results, path):
+    """Write the results in csv, one line by instance"""
+    with open(path, "w", encoding="UTF-8", newline="") as file:
+        writer = csv.DictWriter(file, FIELDS, extrasaction="ignore")
+        writer.writeheader()
+        writer.writerows(results)
+
+
+def read_json(path):
+    """Return the results written by :py:func:`write_json`"""
+    with open(path, encoding="UTF-8") as file:
+        content = json.load(file)
+    if content.get("version") != _FORMAT_VERSION:
+        raise ValueError("unknown version of results in " + str(path))
+    return content["results"]
+
+
+def compare(results, baseline, thresholds=None):
+    """Return the regressions of results compared with the baseline as
+    a list of dicts (instance, measure, baseline, value, ratio).
+
+    Additional informations:
+        - thresholds : relative increase allowed by measure (0.25 for
+          25%), THRESHOLDS by default. Other fields can be given, for
+          example solution_value
+        - the increases of times below 5 ms (0.5 s for solve_time) and
+          of peak_rss below 1 MB are ignored
+        - the instances which are not in both lists or have an error
+          and the measures None are ignored"""
+    thresholds = THRESHOLDS if thresholds is None else thresholds
+    baseline = {result["instance"]: result for result in baseline
+                if not result.get("error")}
+    regressions = []
+    for result in results:
+        previous = baseline.get(result["instance"])
+        if previous is None or result.get("error"):
+            continue
+        for name, threshold in thresholds.items():
+            value = result.get(name)
+            reference = previous.get(name)
+            if value is None or reference is None:
+                continue
+            if value > reference * (1 + threshold) and \
+                    value - reference > _MINIMUM_DELTAS.get(name, 0):
+                regressions.append({
+                    "instance": result["instance"], "measure": name,
+                    "baseline": reference, "value": value,
+                    "ratio": value / reference if reference else None})
+    return regressions
+
+
+def main(argv=None):
+    """Run the benchmark from the command line, the exit code is 1 if
+    a regression is found against the baseline"""
+    parser = argparse.ArgumentParser(
+        prog="python -m VRPSolverEasy.bench",
+        description="Measure the stages of resolutions on the instances "
+                    "of the demos")
+    parser.add_argument("--data", default=DATA_PATH,
+                        help="folder of the folders of instances by type")
+    parser.add_argument("--types", nargs="+", default=list(TYPES),
+                        choices=TYPES)
+    parser.add_argument("--pattern", default="*",
+                        help="names of instances (fnmatch pattern)")
+    parser.add_argument("--limit", type=int,
+                        help="maximal number of instances by type")
+    parser.add_argument("--no-solve", dest="solve", action="store_false",
+                        help="do not call bapcod")
+    parser.add_argument("--time-limit", type=float, default=30.0)
+    parser.add_argument("--solver", default="CLP")
+    parser.add_argument("--processes", type=int, default=1,
+                        help="processes at once, each instance is "
+                             "measured in a new process")
+    parser.add_argument("--in-process", action="store_true",
+                        help="measure the instances in this process")
+    parser.add_argument("--json", help="file of results in json")
+    parser.add_argument("--csv", help="file of results in csv")
+    parser.add_argument("--baseline", help="results in json to compare")
+    parser.add_argument("--threshold", type=float,
+                        help="relative increase allowed for all measures")
+    options = parser.parse_args(argv)
+
+    paths = []
+    for type_ in options.types:
+        found = instances(options.data, (type_,), options.pattern)
+        paths.extend(found[:options.limit] if options.limit else found)
+
+    def progress(result):
+        print("%-40s %8s %8s %8s %10s %s" % (
+            result["instance"],
+            *("-" if result[name] is None else "%.3f" % result[name]
+              for name in ("parse_time", "build_time", "solve_time")),
+            result["payload_bytes"], result["error"] or ""))
+
+    results = run(paths, options.solve, options.time_limit, options.solver,
+                  None if options.in_process else options.processes,
+                  progress)
+    if options.json:
+        write_json(results, options.json)
+    if options.csv:
+        write_csv(results, options.csv)
+    if options.baseline:
+        thresholds = THRESHOLDS if options.threshold is None else \
+            dict.fromkeys(THRESHOLDS, options.threshold)
+        regressions = compare(results, read_json(options.baseline),
+                              thresholds)
+        for regression in regressions:
+            print("regression %(instance)s %(measure)s : %(baseline)s -> "
+                  "%(value)s" % regression)
+        return 1 if regressions else 0
+    return 0
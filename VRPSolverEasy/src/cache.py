@@ -0,0 +1,161 @@
+"""This module keeps the outputs of the solver for the models already
+solved, a model given again in the same json format is not solved again.
+
+A cache is given to :py:meth:`Model.solve`, the output of bapcod is stored
+with a key computed from the json format of the model (points, vehicle
+types, links and parameters). The solution and the statistics of a model
+found in the cache are decoded from the stored output, as after a new
+resolution."""
+
+import hashlib
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+
+def payload_key(payload):
+    """Return the key of a model in json format given by bytes (with or
+    without the final null byte), the sha256 of the bytes in hexadecimal"""
+    if payload[-1:] == b"\0":
+        payload = memoryview(payload)[:-1]
+    return hashlib.sha256(payload).hexdigest()
+
+
+class SolutionCache:
+    """Base class of caches of outputs of the solver, the numbers of hits
+    and misses of :py:meth:`get` are counted.
+
+    The subclasses store the outputs with _load(key), _store(key, output),
+    _clear() and _size()."""
+
+    key = staticmethod(payload_key)
+
+    def __init__(self):
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        """Return the output (bytes) stored with the key,
+        None if it's not in the cache"""
+        with self._lock:
+            output = self._load(key)
+            if output is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+        return output
+
+    def put(self, key, output):
+        """Store the output (bytes) of the solver with the key"""
+        with self._lock:
+            self._store(key, bytes(output))
+
+    def clear(self):
+        """Remove all outputs, the counters are kept"""
+        with self._lock:
+            self._clear()
+
+    def __len__(self):
+        with self._lock:
+            return self._size()
+
+    @property
+    def stats(self):
+        """dict : numbers of hits, misses and outputs stored"""
+        return {"hits": self.hits, "misses": self.misses, "size": len(self)}
+
+    def __repr__(self):
+        return "%s(%r)" % (type(self).__name__, self.stats)
+
+
+class MemoryCache(SolutionCache):
+    """Cache in memory keeping the max_size outputs used last"""
+
+    def __init__(self, max_size=128):
+        if max_size < 1:
+            raise ValueError("max_size must be greater than 0")
+        super().__init__()
+        self.max_size = max_size
+        self.__outputs = OrderedDict()
+
+    def _load(self, key):
+        output = self.__outputs.get(key)
+        if output is not None:
+            self.__outputs.move_to_end(key)
+        return output
+
+    def _store(self, key, output):
+        self.__outputs[key] = output
+        self.__outputs.move_to_end(key)
+        while len(self.__outputs) > self.max_size:
+            self.__outputs.popitem(last=False)
+
+    def _clear(self):
+        self.__outputs.clear()
+
+    def _size(self):
+        return len(self.__outputs)
+
+
+class SQLiteCache(SolutionCache):
+    """Cache in a file SQLite shared by processes and kept between runs.
+
+    Additional informations:
+        - ttl : time to live of outputs in seconds, the outputs stored
+          before are ignored and removed at the next store. None if the
+          outputs never expire
+        - the connection can be used by several threads, it's closed
+          by :py:meth:`close` or at the end of a with statement"""
+
+    def __init__(self, path, ttl=None):
+        if ttl is not None and ttl < 0:
+            raise ValueError("ttl must be greater or equal to 0")
+        super().__init__()
+        self.path = path
+        self.ttl = ttl
+        self.__connection = sqlite3.connect(path, check_same_thread=False)
+        with self.__connection:
+            self.__connection.execute(
+                "CREATE TABLE IF NOT EXISTS outputs (key TEXT PRIMARY KEY, "
+                "output BLOB NOT NULL, created REAL NOT NULL)")
+
+    def __oldest(self):
+        """Return the time of creation of the oldest output not expired"""
+        return float("-inf") if self.ttl is None else time.time() - self.ttl
+
+    def _load(self, key):
+        row = self.__connection.execute(
+            "SELECT output FROM outputs WHERE key = ? AND created >= ?",
+            (key, self.__oldest())).fetchone()
+        return None if row is None else bytes(row[0])
+
+    def _store(self, key, output):
+        with self.__connection:
+            if self.ttl is not None:
+                self.__connection.execute(
+                    "DELETE FROM outputs WHERE created < ?",
+                    (self.__oldest(),))
+            self.__connection.execute(
+                "INSERT OR REPLACE INTO outputs VALUES (?, ?, ?)",
+                (key, output, time.time()))
+
+    def _clear(self):
+        with self.__connection:
+            self.__connection.execute("DELETE FROM outputs")
+
+    def _size(self):
+        return self.__connection.execute(
+            "SELECT COUNT(*) FROM outputs WHERE created >= ?",
+            (self.__oldest(),)).fetchone()[0]
+
+    def close(self):
+        """Close the connection to the file"""
+        self.__connection.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
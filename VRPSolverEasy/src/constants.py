@@ -35,6 +35,11 @@ ENUM_STR_PROPERTY = 13
 ENUM_INT_PROPERTY = 14
 TUPLE_PROPERTY = 15
 LESS_MAX_POINTS_ID_PROPERTY = 16
+MATRIX_PROPERTY = 17
+GREATER_MINUS_ONE_PROPERTY = 18
+LENGTH_PROPERTY = 19
+OFFSETS_PROPERTY = 20
+FINITE_PROPERTY = 21
 ERRORS_PROPERTY = {
     INVALID_PROPERTY: " is an invalid property",
     INTEGER_PROPERTY: " must be an integer",
@@ -52,7 +57,13 @@ ERRORS_PROPERTY = {
     LINK_PROPERTY: "The value must be a Link",
     ENUM_STR_PROPERTY: " must be a string in the following list: ",
     ENUM_INT_PROPERTY: " must be an integer in the following list: ",
-    TUPLE_PROPERTY: " must be a tuple of lenght 2 "}
+    TUPLE_PROPERTY: " must be a tuple of lenght 2 ",
+    MATRIX_PROPERTY: " must be a square matrix of size the number of ids",
+    GREATER_MINUS_ONE_PROPERTY: " must be greater or equal than -1",
+    LENGTH_PROPERTY: " must have one value for each id",
+    OFFSETS_PROPERTY: " must be increasing offsets from 0 to the number "
+                      "of incompatible vehicles, one more than ids",
+    FINITE_PROPERTY: " must be a finite number"}
 
 # model errors
 CUSTOMERS_ERROR = -6
@@ -73,6 +84,9 @@ PLATFORM_ERROR = -20
 LOAD_LIB_ERROR = -21
 BAPCOD_ERROR = -22
 MODEL_NOT_SOLVED = -23
+LOAD_MODEL_ERROR = -24
+READ_JSON_ERROR = -25
+STALE_LINK_ERROR = -26
 
 ERRORS_MODEL = {
     CUSTOMERS_ERROR: "CUSTOMERS ERROR",
@@ -102,7 +116,13 @@ ERRORS_MODEL = {
                if the error persists please contact our support
               for more information""",
    MODEL_NOT_SOLVED: """ The model is not yet solved. 
-              You can solve it by using the function solve()""" }
+              You can solve it by using the function solve()""",
+   LOAD_MODEL_ERROR: """The file is not a model saved by Model.save
+              or its version is not supported""",
+   READ_JSON_ERROR: """The json is not a model or a solution
+              in the format given by export""",
+   STALE_LINK_ERROR: """The link was deleted or moved in its dictionary
+              of links since it was read, read it again""" }
 
 # solution status
 INFEASIBLE = -2
@@ -131,6 +151,8 @@ ENUMERATION_STATUS = {ENUMERATION_INFEASIBLE: "ENUMERATION_INFEASIBLE",
                       ENUMERATION_SUCCEEDED: "ENUMERATION_SUCCEEDED"}
 # Dictionary
 KEY_STR = "key"
+INFEASIBLE_CUSTOMERS_STR = ("The model is infeasible, these customers "
+                            "cannot be served by any vehicle : ")
 ID_STR = "id"
 NB_POINTS_STR = "The number of points"
 STATUS = "status"
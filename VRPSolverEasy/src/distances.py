@@ -0,0 +1,163 @@
+"""This module computes matrices of distances and times between points
+given by their coordinates.
+
+A row of the matrix is computed in one call with functions of the
+module math mapped on the columns of coordinates, there is no call of
+a Python function for each pair of points. The rows are arrays of the
+module array (float64 or float32), they can be given directly to
+:py:meth:`Model.add_links_from_matrix`."""
+
+import heapq
+import math
+from array import array
+from itertools import repeat
+from operator import add, mul, sub, truediv
+
+METRICS = ("euclidean", "manhattan", "haversine")
+
+ROUNDINGS = ("exact", "nearest", "one_decimal_floor")
+
+# mean radius of the earth in kilometers
+EARTH_RADIUS = 6371.0
+
+_TYPECODES = {"float64": 'd', "float32": 'f'}
+
+
+def _as_list(values):
+    """Return a list from a sequence, an object with a method tolist
+    (an array of the module array) is converted by it"""
+    if hasattr(values, "tolist"):
+        return values.tolist()
+    return list(values)
+
+
+def _check(x, y, metric, rounding, dtype):
+    """Check the arguments and return the coordinates as lists of floats
+    and the typecode of rows"""
+    x = [float(value) for value in _as_list(x)]
+    y = [float(value) for value in _as_list(y)]
+    if len(x) != len(y):
+        raise ValueError("x and y must have the same length")
+    if metric not in METRICS:
+        raise ValueError("metric must be one of " + ", ".join(METRICS))
+    if not (rounding in ROUNDINGS or
+            (isinstance(rounding, int) and not isinstance(rounding, bool))):
+        raise ValueError("rounding must be a number of digits or one of " +
+                         ", ".join(ROUNDINGS))
+    if dtype not in _TYPECODES:
+        raise ValueError("dtype must be one of " + ", ".join(_TYPECODES))
+    if metric == "haversine":
+        # latitudes and longitudes in radians
+        x = list(map(math.radians, x))
+        y = list(map(math.radians, y))
+    return x, y, _TYPECODES[dtype]
+
+
+def _row(x, y, i, metric):
+    """Return the exact distances from the point i to all points"""
+    x_i, y_i = x[i], y[i]
+    if metric == "euclidean":
+        return list(map(math.hypot, map(sub, x, repeat(x_i)),
+                        map(sub, y, repeat(y_i))))
+    if metric == "manhattan":
+        return list(map(add, map(abs, map(sub, x, repeat(x_i))),
+                        map(abs, map(sub, y, repeat(y_i)))))
+    # haversine formula with x the latitudes and y the longitudes
+    sin_latitudes = list(map(math.sin, map(mul, map(sub, x, repeat(x_i)),
+                                           repeat(0.5))))
+    sin_longitudes = list(map(math.sin, map(mul, map(sub, y, repeat(y_i)),
+                                            repeat(0.5))))
+    cos_latitudes = map(mul, map(math.cos, x), repeat(math.cos(x_i)))
+    haversines = map(add, map(mul, sin_latitudes, sin_latitudes),
+                     map(mul, cos_latitudes,
+                         map(mul, sin_longitudes, sin_longitudes)))
+    return list(map(mul, map(math.asin, map(math.sqrt, map(
+        min, haversines, repeat(1.0)))), repeat(2 * EARTH_RADIUS)))
+
+
+def _rounded(row, rounding, scale):
+    """Return the row divided by scale and rounded"""
+    if scale != 1.0:
+        row = map(truediv, row, repeat(scale))
+    if rounding == "exact":
+        return row
+    if rounding == "nearest":
+        # nearest integer as in TSPLIB
+        return map(float, map(math.floor, map(add, row, repeat(0.5))))
+    if rounding == "one_decimal_floor":
+        return map(truediv, map(math.floor, map(mul, row, repeat(10.0))),
+                   repeat(10.0))
+    return map(round, row, repeat(rounding))
+
+
+def matrix_blocks(x, y, metric="euclidean", rounding="exact",
+                  dtype="float64", block_size=256, scale=1.0):
+    """Generator giving the matrix of distances by blocks of rows,
+    each block is a tuple (first row, list of rows).
+
+    Additional informations:
+        - x, y : coordinates of points (list or array),
+          latitudes and longitudes in degrees for the metric haversine
+          (the distances are in kilometers)
+        - metric : euclidean, manhattan or haversine
+        - rounding : exact, nearest (nearest integer as in TSPLIB),
+          one_decimal_floor (floor with one decimal) or a number
+          of digits given to round()
+        - dtype : float64 or float32
+        - scale : the distances are divided by scale before the rounding,
+          for example a speed to get times"""
+    x, y, typecode = _check(x, y, metric, rounding, dtype)
+    if block_size < 1:
+        raise ValueError("block_size must be greater than 0")
+    for first_row in range(0, len(x), block_size):
+        yield first_row, [
+            array(typecode, _rounded(_row(x, y, i, metric), rounding, scale))
+            for i in range(first_row, min(first_row + block_size, len(x)))]
+
+
+def distance_matrix(x, y, metric="euclidean", rounding="exact",
+                    dtype="float64"):
+    """Return the full matrix of distances between points as a list
+    of rows (see :py:func:`matrix_blocks` for the arguments)"""
+    matrix = []
+    for _, rows in matrix_blocks(x, y, metric, rounding, dtype):
+        matrix.extend(rows)
+    return matrix
+
+
+def time_matrix(x, y, speed=1.0, metric="euclidean", rounding="exact",
+                dtype="float64"):
+    """Return the full matrix of times between points, the distances are
+    divided by the speed before the rounding"""
+    if speed <= 0:
+        raise ValueError("speed must be greater than 0")
+    matrix = []
+    for _, rows in matrix_blocks(x, y, metric, rounding, dtype,
+                                 scale=speed):
+        matrix.extend(rows)
+    return matrix
+
+
+def nearest_neighbors(x, y, k, metric="euclidean", rounding="exact",
+                      dtype="float64"):
+    """Return the k nearest neighbors of each point (the point itself
+    excluded) sorted by distance, as a tuple (neighbors, distances) of
+    lists of rows : neighbors[i] and distances[i] are arrays of length
+    min(k, number of points - 1)"""
+    if k < 0:
+        raise ValueError("k must be greater or equal to 0")
+    neighbors = []
+    distances = []
+    for first_row, rows in matrix_blocks(x, y, metric, rounding, dtype):
+        for i, row in enumerate(rows, first_row):
+            # the point itself is removed after the selection
+            nearest = heapq.nsmallest(k + 1, range(len(row)),
+                                      key=row.__getitem__)
+            if i in nearest:
+                nearest.remove(i)
+            else:
+                nearest.pop()
+            neighbors.append(array('i', nearest))
+            distances.append(array(row.typecode, map(row.__getitem__,
+                                                     nearest)))
+    return neighbors, distances
@@ -0,0 +1,744 @@
+"""This module builds a feasible solution of a model with a heuristic,
+its cost is a good upper bound for the solver.
+
+The routes are built by the savings of Clarke and Wright, then they are
+improved by a local search (relocate, swap, 2-opt in a route and 2-opt*
+between two routes) limited to the nearest neighbors of each customer.
+Time windows, capacities, incompatible vehicles, heterogeneous vehicle
+types with their depots, optional customers and customers with several
+points are taken into account as in :py:meth:`Model.solve`.
+
+The costs of links are computed once for each pair of variable costs of
+vehicle types, in rows of arrays (or of dictionaries if the graph is
+sparse), the moves are evaluated by the costs of the arcs changed before
+the times and loads of the routes are checked."""
+
+import heapq
+import math
+import time
+from array import array
+from itertools import chain
+from random import Random
+
+# margin on times before a time window is considered as violated,
+# as in the repair of initial solutions of Model.solve
+_TIME_TOLERANCE = 1e-6
+
+# minimal decrease of cost for a move to be applied
+_EPSILON = 1e-9
+
+# relative increase of the best cost accepted after a perturbation
+# of all points
+_THRESHOLD = 0.05
+
+
+class _SparseRow(dict):
+    """Row of costs or times of links from a point, inf without link"""
+
+    def __missing__(self, key):
+        return math.inf
+
+
+class _Heuristic:
+    """Routes of a model improved in place, a route is a list of indices
+    of customer points (without depots) with a vehicle type"""
+
+    def __init__(self, model, deadline, nb_neighbors):
+        self.deadline = deadline
+        points = dict.values(model.points)
+        self.point_ids = [point._id for point in points]
+        index = {id: i for i, id in enumerate(self.point_ids)}
+        self.tw_begins = [point._tw_begin for point in points]
+        self.tw_ends = [point._tw_end + _TIME_TOLERANCE for point in points]
+        self.service_times = [point._service_time for point in points]
+        self.demands = [point._demand if point._id_customer else 0
+                        for point in points]
+        # points of each customer and penalties of optional customers
+        self.clusters = {}
+        self.penalties = {}
+        self.id_customers = [point._id_customer for point in points]
+        for i, point in enumerate(points):
+            if point._id_customer > 0:
+                self.clusters.setdefault(point._id_customer, []).append(i)
+                self.penalties[point._id_customer] = max(
+                    self.penalties.get(point._id_customer, 0.0),
+                    point._penalty_or_cost)
+
+        # vehicle types by index, with their rows of costs and times
+        self.vehicle_types = list(dict.values(model.vehicle_types))
+        self.max_numbers = [vehicle_type._max_number
+                            for vehicle_type in self.vehicle_types]
+        self.max_total = model.max_total_vehicles_number
+        # index of the depot of vehicle types without start or end point,
+        # its links to all points cost 0
+        self.none = len(index)
+        self.depots = [(index.get(vehicle_type._start_point_id, self.none),
+                        index.get(vehicle_type._end_point_id, self.none))
+                       for vehicle_type in self.vehicle_types]
+        self.allowed = [bytearray(vehicle_type._id not in
+                                  point._incompatible_vehicles
+                                  for point in points)
+                        for vehicle_type in self.vehicle_types]
+        profiles = {}
+        for vehicle_type in self.vehicle_types:
+            profiles.setdefault((vehicle_type._var_cost_dist,
+                                 vehicle_type._var_cost_time), None)
+        matrices = self.__matrices(model, index, list(profiles))
+        for profile, matrix in zip(list(profiles), matrices):
+            profiles[profile] = matrix
+        self.matrices = [profiles[(vehicle_type._var_cost_dist,
+                                   vehicle_type._var_cost_time)]
+                         for vehicle_type in self.vehicle_types]
+        self.neighbors = self.__neighbors(nb_neighbors)
+
+        self.routes = []
+        self.types = []
+        self.costs = []
+        self.route_of = {}
+        self.unserved = set()
+
+    def __matrices(self, model, index, profiles):
+        """Return for each profile (var_cost_dist, var_cost_time) the rows
+        of costs and times of the cheapest links between points, with
+        a last row and a last column of zeros for the missing depots"""
+        columns = model._link_table()
+        size = len(index)
+        dense = 2 * len(columns[0]) > size * size // 4
+        matrices = []
+        for var_cost_dist, var_cost_time in profiles:
+            if dense:
+                costs = [array('d', [math.inf]) * (size + 1)
+                         for _ in range(size)]
+                times = [array('d', bytes(8 * (size + 1)))
+                         for _ in range(size)]
+            else:
+                costs = [_SparseRow() for _ in range(size)]
+                times = [_SparseRow() for _ in range(size)]
+            for row in chain(costs, times):
+                row[size] = 0.0
+            costs.append(array('d', bytes(8 * (size + 1))))
+            times.append(array('d', bytes(8 * (size + 1))))
+            for start_point_id, end_point_id, is_directed, distance, \
+                    link_time, fixed_cost in zip(*columns):
+                i = index.get(start_point_id)
+                j = index.get(end_point_id)
+                if i is None or j is None:
+                    continue
+                cost = var_cost_dist * distance + \
+                    var_cost_time * link_time + fixed_cost
+                for i, j in ((i, j),) if is_directed or i == j else \
+                        ((i, j), (j, i)):
+                    if cost < costs[i][j] or (cost == costs[i][j] and
+                                              link_time < times[i][j]):
+                        costs[i][j] = cost
+                        times[i][j] = link_time
+            matrices.append((costs, times))
+        return matrices
+
+    def __neighbors(self, nb_neighbors):
+        """Return for each customer point the nearest customer points
+        by the costs of the first vehicle type (in both directions)"""
+        customers = [i for i, id_customer in enumerate(self.id_customers)
+                     if id_customer > 0]
+        if not self.matrices:
+            return {}
+        costs = self.matrices[0][0]
+        neighbors = {}
+        for i in customers:
+            nearest = heapq.nsmallest(nb_neighbors + 1, zip(
+                map(min, map(costs[i].__getitem__, customers),
+                    [costs[j][i] for j in customers]), customers))
+            neighbors[i] = [j for cost, j in nearest
+                            if j != i and cost < math.inf][:nb_neighbors]
+        return neighbors
+
+    def arc(self, k, i, j):
+        """Return the cost of the arc from i to j for the vehicle type k,
+        0 if a point is a missing depot"""
+        return self.matrices[k][0][i][j]
+
+    def cost(self, k, route):
+        """Return the cost of a route (0 if it's empty) without checking
+        the capacity and the time windows"""
+        if not route:
+            return 0.0
+        start, end = self.depots[k]
+        costs = self.matrices[k][0]
+        cost = self.vehicle_types[k]._fixed_cost + \
+            costs[start][route[0]] + costs[route[-1]][end]
+        for i, j in zip(route, route[1:]):
+            cost += costs[i][j]
+        return cost
+
+    def feasible(self, k, route):
+        """Return True if the vehicle type k can serve the route: links,
+        capacity, time windows and incompatible vehicles are checked"""
+        if not route:
+            return True
+        vehicle_type = self.vehicle_types[k]
+        demands = self.demands
+        if sum(map(demands.__getitem__, route)) > vehicle_type._capacity:
+            return False
+        allowed = self.allowed[k]
+        costs, times = self.matrices[k]
+        tw_begins = self.tw_begins
+        tw_ends = self.tw_ends
+        service_times = self.service_times
+        vehicle_tw_end = vehicle_type._tw_end + _TIME_TOLERANCE
+        start, end = self.depots[k]
+        current_time = vehicle_type._tw_begin
+        previous = -1
+        none = self.none
+        for i in chain((start,) if start != none else (), route,
+                       (end,) if end != none else ()):
+            if not allowed[i]:
+                return False
+            if previous >= 0:
+                if costs[previous][i] == math.inf:
+                    return False
+                current_time += times[previous][i]
+            current_time = max(current_time, tw_begins[i]) + \
+                service_times[i]
+            if current_time > tw_ends[i] or current_time > vehicle_tw_end:
+                return False
+            previous = i
+        return True
+
+    def evaluate(self, k, route):
+        """Return the cost of a route for the vehicle type k,
+        inf if it cannot serve the route"""
+        return self.cost(k, route) if self.feasible(k, route) else math.inf
+
+    def expired(self):
+        """Return True if the time limit is reached"""
+        return time.perf_counter() > self.deadline
+
+    def counts(self):
+        """Return the number of routes of each vehicle type"""
+        counts = [0] * len(self.vehicle_types)
+        for k, route in zip(self.types, self.routes):
+            if route:
+                counts[k] += 1
+        return counts
+
+    def set_route(self, r, k, route, cost):
+        """Give a new list of points, vehicle type and cost to a route"""
+        self.routes[r] = route
+        self.types[r] = k
+        self.costs[r] = cost
+        for i in route:
+            self.route_of[i] = r
+
+    def best_type(self, route, counts=None):
+        """Return the cheapest vehicle type which can serve a route and
+        its cost, the types used by counts routes are not candidates"""
+        best = (None, math.inf)
+        for k in range(len(self.vehicle_types)):
+            if counts is not None and counts[k] >= self.max_numbers[k]:
+                continue
+            cost = self.evaluate(k, route)
+            if cost < best[1]:
+                best = (k, cost)
+        return best
+
+    def initial_routes(self):
+        """Give a route to each customer by its cheapest point and vehicle
+        type, return False if a customer not optional cannot be served.
+        The optional customers cheaper to leave unserved are removed by
+        the local search"""
+        for id_customer, cluster in self.clusters.items():
+            best = (None, None, math.inf)
+            for i in cluster:
+                k, cost = self.best_type([i])
+                if cost < best[2]:
+                    best = (i, k, cost)
+            i, k, cost = best
+            if i is None:
+                if self.penalties[id_customer] == 0:
+                    return False
+                self.unserved.add(id_customer)
+                continue
+            self.new_route(i, k, cost)
+        return True
+
+    def savings(self):
+        """Merge routes by the savings of Clarke and Wright computed
+        on the nearest neighbors, a merge is applied if the cheapest
+        vehicle type serving the merged route reduces the cost"""
+        savings = []
+        for i, r in self.route_of.items():
+            k = self.types[r]
+            start, end = self.depots[k]
+            for j in self.neighbors[i]:
+                if j in self.route_of:
+                    savings.append((
+                        self.arc(k, i, end) + self.arc(k, start, j) -
+                        self.arc(k, i, j), i, j))
+        savings.sort(reverse=True)
+        for count, (_, i, j) in enumerate(savings):
+            if count & 255 == 0 and self.expired():
+                return
+            r_i = self.route_of[i]
+            r_j = self.route_of[j]
+            route_i = self.routes[r_i]
+            route_j = self.routes[r_j]
+            if r_i == r_j or route_i[-1] != i or route_j[0] != j:
+                continue
+            merged = route_i + route_j
+            k, cost = self.best_type(merged)
+            if cost < self.costs[r_i] + self.costs[r_j] - _EPSILON:
+                self.set_route(r_i, k, merged, cost)
+                self.set_route(r_j, self.types[r_j], [], 0.0)
+
+    def best_insertion(self, i, excluded=None):
+        """Return the cheapest feasible insertion of the point i in the
+        routes as a tuple (increase of cost, route, new route)"""
+        best = (math.inf, None, None)
+        for r, route in enumerate(self.routes):
+            if not route or r == excluded:
+                continue
+            k = self.types[r]
+            if not self.allowed[k][i]:
+                continue
+            start, end = self.depots[k]
+            previous = chain((start,), route)
+            for position, (a, b) in enumerate(zip(previous,
+                                                  chain(route, (end,)))):
+                increase = self.arc(k, a, i) + self.arc(k, i, b) - \
+                    self.arc(k, a, b)
+                if increase >= best[0]:
+                    continue
+                new_route = route[:position] + [i] + route[position:]
+                if self.feasible(k, new_route):
+                    best = (increase, r, new_route)
+        return best
+
+    def fit_fleet(self):
+        """Change the vehicle types of routes and remove the smallest
+        routes until the numbers of vehicles are respected, return False
+        if it's not possible"""
+        while True:
+            counts = self.counts()
+            # routes given to vehicle types still available
+            changed = True
+            while changed:
+                changed = False
+                best = (math.inf, None, None)
+                for r, (k, route) in enumerate(zip(self.types,
+                                                   self.routes)):
+                    if not route or counts[k] <= self.max_numbers[k]:
+                        continue
+                    k_new, cost = self.best_type(route, counts)
+                    if cost - self.costs[r] < best[0]:
+                        best = (cost - self.costs[r], r, k_new)
+                if best[1] is not None:
+                    _, r, k_new = best
+                    counts[self.types[r]] -= 1
+                    counts[k_new] += 1
+                    self.set_route(r, k_new, self.routes[r],
+                                   self.evaluate(k_new, self.routes[r]))
+                    changed = True
+            over = [k for k, count in enumerate(counts)
+                    if count > self.max_numbers[k]]
+            if not over and sum(counts) <= self.max_total:
+                return True
+            if self.expired() or not self.remove_route(over):
+                return False
+
+    def remove_route(self, types):
+        """Insert the customers of the smallest route (of the given
+        vehicle types if not empty) in the other routes, the optional
+        customers which cannot be inserted are not served. Return False
+        if no route can be removed"""
+        candidates = sorted(
+            (len(route), r) for r, route in enumerate(self.routes)
+            if route and (not types or self.types[r] in types))
+        for _, r in candidates:
+            saved = [(s, self.types[s], list(route), self.costs[s])
+                     for s, route in enumerate(self.routes) if route]
+            removed = True
+            unserved = []
+            for i in list(self.routes[r]):
+                _, s, new_route = self.best_insertion(i, excluded=r)
+                if s is None and self.penalties[self.id_customers[i]] > 0:
+                    unserved.append(i)
+                    continue
+                if s is None:
+                    removed = False
+                    break
+                self.set_route(s, self.types[s], new_route,
+                               self.cost(self.types[s], new_route))
+            if removed:
+                self.set_route(r, self.types[r], [], 0.0)
+                for i in unserved:
+                    del self.route_of[i]
+                    self.unserved.add(self.id_customers[i])
+                return True
+            for s, k, route, cost in saved:
+                self.set_route(s, k, route, cost)
+        return False
+
+    def apply(self, changes):
+        """Apply moves given as a list of tuples (route, new route) if
+        they are feasible and reduce the cost, return True if applied"""
+        increase = 0.0
+        new_costs = []
+        for r, new_route in changes:
+            cost = self.cost(self.types[r], new_route)
+            new_costs.append(cost)
+            increase += cost - self.costs[r]
+        if increase >= -_EPSILON or not all(
+                self.feasible(self.types[r], new_route)
+                for r, new_route in changes):
+            return False
+        for (r, new_route), cost in zip(changes, new_costs):
+            self.set_route(r, self.types[r], new_route, cost)
+        return True
+
+    def __ends(self, r, position):
+        """Return the points before and after a position in a route,
+        the depots of its vehicle type at the ends"""
+        route = self.routes[r]
+        start, end = self.depots[self.types[r]]
+        return (route[position - 1] if position > 0 else start,
+                route[position + 1] if position + 1 < len(route) else end)
+
+    def moves(self, i, j):
+        """Return the moves between the point i and its neighbor j
+        served by a route, as lists of tuples (route, new route). The
+        moves between two routes are given only if the decrease of cost
+        computed from the arcs changed is positive"""
+        r_i = self.route_of[i]
+        r_j = self.route_of[j]
+        route_i = self.routes[r_i]
+        route_j = self.routes[r_j]
+        p_i = route_i.index(i)
+        p_j = route_j.index(j)
+        if r_i == r_j:
+            without_i = route_i[:p_i] + route_i[p_i + 1:]
+            p = without_i.index(j)
+            # relocate i after j and before j
+            yield [(r_i, without_i[:p + 1] + [i] + without_i[p + 1:])]
+            yield [(r_i, without_i[:p] + [i] + without_i[p:])]
+            # swap
+            route = list(route_i)
+            route[p_i], route[p_j] = j, i
+            yield [(r_i, route)]
+            # 2-opt: the arc after i ends at j
+            first, last = sorted((p_i, p_j))
+            yield [(r_i, route_i[:first + 1] +
+                    route_i[last:first:-1] + route_i[last + 1:])]
+            return
+        k_i = self.types[r_i]
+        k_j = self.types[r_j]
+        costs_i = self.matrices[k_i][0]
+        costs_j = self.matrices[k_j][0]
+        a, b = self.__ends(r_i, p_i)
+        c, d = self.__ends(r_j, p_j)
+        removal = self.costs[r_i] if len(route_i) == 1 else \
+            costs_i[a][i] + costs_i[i][b] - costs_i[a][b]
+        # relocate i after j and before j
+        if removal + costs_j[j][d] - costs_j[j][i] - costs_j[i][d] > \
+                _EPSILON:
+            yield [(r_i, route_i[:p_i] + route_i[p_i + 1:]),
+                   (r_j, route_j[:p_j + 1] + [i] + route_j[p_j + 1:])]
+        if removal + costs_j[c][j] - costs_j[c][i] - costs_j[i][j] > \
+                _EPSILON:
+            yield [(r_i, route_i[:p_i] + route_i[p_i + 1:]),
+                   (r_j, route_j[:p_j] + [i] + route_j[p_j:])]
+        # swap
+        if costs_i[a][i] + costs_i[i][b] - costs_i[a][j] - costs_i[j][b] + \
+                costs_j[c][j] + costs_j[j][d] - costs_j[c][i] - \
+                costs_j[i][d] > _EPSILON:
+            yield [(r_i, route_i[:p_i] + [j] + route_i[p_i + 1:]),
+                   (r_j, route_j[:p_j] + [i] + route_j[p_j + 1:])]
+        # 2-opt*: i is followed by j and their tails are exchanged, the
+        # decrease is computed from the arcs if the costs and the end
+        # depots are the same and no route is emptied
+        if costs_i is not costs_j or \
+                self.depots[k_i][1] != self.depots[k_j][1] or \
+                (p_j == 0 and p_i + 1 == len(route_i)) or \
+                costs_i[i][b] + costs_i[c][j] - costs_i[i][j] - \
+                costs_i[c][b] > _EPSILON:
+            yield [(r_i, route_i[:p_i + 1] + route_j[p_j:]),
+                   (r_j, route_j[:p_j] + route_i[p_i + 1:])]
+
+    def optional_moves(self):
+        """Remove the optional customers cheaper to leave unserved and
+        insert the unserved ones cheaper to serve, return the routes
+        changed"""
+        changed = set()
+        for id_customer, penalty in self.penalties.items():
+            if penalty == 0:
+                continue
+            if id_customer in self.unserved:
+                best = (penalty, None, None)
+                for i in self.clusters[id_customer]:
+                    increase, r, new_route = self.best_insertion(i)
+                    if increase < best[0] - _EPSILON:
+                        best = (increase, r, new_route)
+                _, r, new_route = best
+                if r is not None:
+                    self.set_route(r, self.types[r], new_route,
+                                   self.cost(self.types[r], new_route))
+                    self.unserved.discard(id_customer)
+                    changed.add(r)
+                continue
+            for i in self.clusters[id_customer]:
+                if i not in self.route_of:
+                    continue
+                r = self.route_of[i]
+                route = [j for j in self.routes[r] if j != i]
+                cost = self.cost(self.types[r], route)
+                if cost + penalty < self.costs[r] - _EPSILON and \
+                        self.feasible(self.types[r], route):
+                    self.set_route(r, self.types[r], route, cost)
+                    del self.route_of[i]
+                    self.unserved.add(id_customer)
+                    changed.add(r)
+        return changed
+
+    def vehicle_type_moves(self):
+        """Give to the routes the cheaper vehicle types still available,
+        return the routes changed"""
+        changed = set()
+        counts = self.counts()
+        for r, route in enumerate(self.routes):
+            if not route:
+                continue
+            counts[self.types[r]] -= 1
+            k, cost = self.best_type(route, counts)
+            if cost < self.costs[r] - _EPSILON:
+                self.set_route(r, k, route, cost)
+                changed.add(r)
+            counts[self.types[r]] += 1
+        return changed
+
+    def local_search(self, points=None):
+        """Apply the first move reducing the cost for each customer and
+        its neighbors until no move improves the routes or the time
+        is over. Only the given points and the points of the routes
+        changed are examined (all served points by default)"""
+        queue = dict.fromkeys(self.route_of if points is None else points)
+        while not self.expired():
+            while queue:
+                i = next(iter(queue))
+                del queue[i]
+                if i not in self.route_of:
+                    continue
+                for j in self.neighbors[i]:
+                    if j not in self.route_of:
+                        continue
+                    for changes in self.moves(i, j):
+                        if self.apply(changes):
+                            for _, route in changes:
+                                queue.update(dict.fromkeys(route))
+                            break
+                    else:
+                        continue
+                    break
+                if self.expired():
+                    return
+            changed = self.optional_moves() | self.vehicle_type_moves()
+            if not changed:
+                return
+            for r in changed:
+                queue.update(dict.fromkeys(self.routes[r]))
+
+    def total_cost(self):
+        """Return the cost of routes plus the penalties of optional
+        customers not served"""
+        return sum(self.costs) + sum(self.penalties[id_customer]
+                                     for id_customer in self.unserved)
+
+    def state(self):
+        """Return a copy of the routes, restored by set_state"""
+        return ([list(route) for route in self.routes], list(self.types),
+                list(self.costs), dict(self.route_of), set(self.unserved))
+
+    def set_state(self, state):
+        """Restore the routes given by state"""
+        routes, types, costs, route_of, unserved = state
+        self.routes = [list(route) for route in routes]
+        self.types = list(types)
+        self.costs = list(costs)
+        self.route_of = dict(route_of)
+        self.unserved = set(unserved)
+
+    def new_route(self, i, k, cost):
+        """Add a route serving the point i with the vehicle type k"""
+        self.routes.append(None)
+        self.types.append(None)
+        self.costs.append(None)
+        self.set_route(len(self.routes) - 1, k, [i], cost)
+
+    def insert(self, i):
+        """Insert the point i where the cost increases the least, in a
+        route or in a new route, return False if it's not possible"""
+        increase, r, new_route = self.best_insertion(i)
+        counts = self.counts()
+        if sum(counts) < self.max_total:
+            k, cost = self.best_type([i], counts)
+            if cost < increase:
+                self.new_route(i, k, cost)
+                return True
+        if r is None:
+            return False
+        self.set_route(r, self.types[r], new_route,
+                       self.cost(self.types[r], new_route))
+        return True
+
+    def insertions(self):
+        """Build the routes by inserting the customers by decreasing
+        demands where the cost increases the least, a route is added
+        only if a customer cannot be inserted, with the largest vehicle
+        type available. The customers which cannot be served are tried
+        again after the other ones. Return False if a customer not
+        optional cannot be served"""
+        self.set_state(([], [], [], {}, set()))
+        demands = self.demands
+        order = sorted(self.clusters, key=lambda id_customer: -max(
+            map(demands.__getitem__, self.clusters[id_customer])))
+        deferred = set()
+        for id_customer in order:
+            best = (math.inf, None, None, None)
+            for i in self.clusters[id_customer]:
+                increase, r, new_route = self.best_insertion(i)
+                if increase < best[0]:
+                    best = (increase, i, r, new_route)
+            _, i, r, new_route = best
+            if r is not None:
+                self.set_route(r, self.types[r], new_route,
+                               self.cost(self.types[r], new_route))
+                continue
+            counts = self.counts()
+            best = (-1, 0.0, None, None)
+            if sum(counts) < self.max_total:
+                for i in self.clusters[id_customer]:
+                    for k, vehicle_type in enumerate(self.vehicle_types):
+                        if counts[k] >= self.max_numbers[k]:
+                            continue
+                        cost = self.evaluate(k, [i])
+                        if cost < math.inf and (vehicle_type._capacity,
+                                                -cost) > best[:2]:
+                            best = (vehicle_type._capacity, -cost, i, k)
+            _, cost, i, k = best
+            if i is None and id_customer not in deferred:
+                deferred.add(id_customer)
+                order.append(id_customer)
+                continue
+            if i is None:
+                if self.penalties[id_customer] == 0:
+                    return False
+                self.unserved.add(id_customer)
+                continue
+            self.new_route(i, k, -cost)
+        return True
+
+    def perturb(self, random, size):
+        """Remove a customer and its nearest served neighbors from the
+        routes and insert them again in a random order, return the points
+        removed (empty if a customer cannot be inserted)"""
+        first = random.choice(list(self.route_of))
+        removed = [first] + [j for j in self.neighbors[first]
+                             if j in self.route_of][:size - 1]
+        for i in removed:
+            r = self.route_of.pop(i)
+            route = [j for j in self.routes[r] if j != i]
+            self.set_route(r, self.types[r], route,
+                           self.cost(self.types[r], route))
+        random.shuffle(removed)
+        for i in removed:
+            if not self.insert(i):
+                if self.penalties[self.id_customers[i]] == 0:
+                    return []
+                self.unserved.add(self.id_customers[i])
+        return removed
+
+    def iterated_local_search(self, nb_iterations, seed):
+        """Perturb the current routes and apply the local search on the
+        points moved, the new routes are kept if their cost is less than
+        the best cost increased by a threshold (record-to-record travel).
+        The best routes found are restored at the end"""
+        random = Random(seed)
+        best = current = self.state()
+        best_cost = self.total_cost()
+        size = max(2, min(len(self.route_of) // 5, 20))
+        # the increase accepted is proportional to the points moved
+        threshold = _THRESHOLD * size / max(len(self.route_of), 1)
+        for _ in range(nb_iterations):
+            if self.expired() or not self.route_of:
+                break
+            removed = self.perturb(random, size)
+            if removed:
+                self.local_search(removed)
+                cost = self.total_cost()
+                if cost < best_cost - _EPSILON:
+                    best = current = self.state()
+                    best_cost = cost
+                    continue
+                if cost < best_cost * (1 + threshold):
+                    current = self.state()
+                    continue
+            self.set_state(current)
+        self.set_state(best)
+
+    def solution(self):
+        """Return the cost and the routes as tuples (vehicle type id,
+        point ids with the depots)"""
+        routes = []
+        for k, route in zip(self.types, self.routes):
+            if not route:
+                continue
+            start, end = self.depots[k]
+            routes.append((self.vehicle_types[k]._id, [
+                self.point_ids[i] for i in chain(
+                    (start,) if start != self.none else (), route,
+                    (end,) if end != self.none else ())]))
+        return self.total_cost(), routes
+
+
+def solve(model, time_limit=20.0, nb_neighbors=20, nb_iterations=100,
+          seed=0):
+    """Return a solution of a model found by the heuristic as a tuple
+    (cost, routes), routes is a list of tuples (vehicle type id, point
+    ids with the depots) which can be given as initial_solution to
+    :py:meth:`Model.solve`. The cost is None and the routes are empty if
+    the heuristic cannot serve all customers which are not optional with
+    the vehicles available.
+
+    Additional informations:
+        - time_limit : maximal time in seconds, the best routes found
+          are returned when it's reached
+        - nb_neighbors : number of nearest customers of each customer
+          used by the savings and by the moves of the local search
+        - nb_iterations : number of perturbations of the best routes
+          (a customer and its nearest neighbors are inserted again)
+          followed by the local search, seed : seed of the random
+          perturbations, the same routes are found for the same seed
+          if the time limit is not reached
+        - the cost is computed as by bapcod: fixed cost of the vehicle
+          type, var_cost_dist * distance + var_cost_time * time and
+          fixed cost of each link used, plus the penalties of the
+          optional customers not served. The depots of a vehicle type
+          are the points where its routes start and end"""
+    if time_limit < 0:
+        raise ValueError("time_limit must be greater or equal to 0")
+    if nb_neighbors < 1:
+        raise ValueError("nb_neighbors must be greater than 0")
+    if nb_iterations < 0:
+        raise ValueError("nb_iterations must be greater or equal to 0")
+    deadline = time.perf_counter() + time_limit
+    model.check_depots()
+    heuristic = _Heuristic(model, deadline, nb_neighbors)
+    built = heuristic.initial_routes()
+    if built:
+        heuristic.savings()
+        built = heuristic.fit_fleet()
+    # the savings need a route for each customer and can use more
+    # vehicles than available
+    if not built and not (heuristic.insertions() and heuristic.fit_fleet()):
+        return None, []
+    heuristic.local_search()
+    heuristic.iterated_local_search(nb_iterations, seed)
+    return heuristic.solution()
@@ -0,0 +1,387 @@
+"""This module reads instances of the literature in arrays :
+CVRPLIB (TSPLIB format), Solomon (CVRPTW), Golden and CVRPLIB (HFVRP)
+and Cordeau (MDVRP) formats.
+
+The columns are arrays of the module array (numpy is not a dependency
+of the package), they support the buffer protocol and can be viewed
+without copy with memoryview."""
+
+import math
+import mmap
+import os
+import re
+from array import array
+
+# keyword at the beginning of a line, followed by ':' for a header entry,
+# alone for the beginning of a section
+_KEYWORD = re.compile(rb"^[ \t]*([A-Z][A-Z_]*)[ \t]*(?::([^\r\n]*))?", re.M)
+
+# first header entry of a file in the format of CVRPLIB
+_HEADER = re.compile(rb"\s*[A-Z][A-Z_]*[ \t]*:")
+
+# equivalent formats of explicit weights for symmetric matrices
+_EXPLICIT_FORMATS = {
+    "FULL_MATRIX": "FULL_MATRIX",
+    "UPPER_ROW": "UPPER_ROW", "LOWER_COL": "UPPER_ROW",
+    "LOWER_ROW": "LOWER_ROW", "UPPER_COL": "LOWER_ROW",
+    "UPPER_DIAG_ROW": "UPPER_DIAG_ROW", "LOWER_DIAG_COL": "UPPER_DIAG_ROW",
+    "LOWER_DIAG_ROW": "LOWER_DIAG_ROW", "UPPER_DIAG_COL": "LOWER_DIAG_ROW"}
+
+EDGE_WEIGHT_TYPES = ("EUC_2D", "CEIL_2D", "MAN_2D", "MAX_2D", "GEO", "ATT",
+                     "EXPLICIT")
+
+
+class InstanceError(Exception):
+    """ Exception raised for errors in the file of an instance.
+
+    Attributes:
+        message -- explanation of the error
+   """
+
+    def __init__(self, path, message):
+        self.message = str(path) + " : " + message
+        super().__init__(self.message)
+
+
+class Instance:
+    """Contains all data of an instance, the points are in the order
+    of the file and the columns are arrays of length dimension:
+        - x, y : coordinates
+        - demands : demands of points (0 for depots)
+        - tw_begin, tw_end : time windows (0 if not given)
+        - service_times : service time of points
+
+    Additional informations:
+        - depots : positions of depots in the columns of points
+        - vehicle_capacities, vehicle_fixed_costs, vehicle_var_costs,
+          vehicle_max_numbers : columns of vehicle types,
+          a max number equal to 0 means unlimited
+        - vehicle_max_durations : maximal duration of routes of
+          the vehicles of each depot (MDVRP only)
+        - edge_weights : list of rows of the matrix of weights
+          if the edge weight type is EXPLICIT, None otherwise
+    """
+
+    def __init__(self, name=str(), type=str(), dimension=0):
+        self.name = name
+        self.type = type
+        self.dimension = dimension
+        self.edge_weight_type = "EUC_2D"
+        self.x = array('d', [0.0]) * dimension
+        self.y = array('d', [0.0]) * dimension
+        self.demands = array('q', [0]) * dimension
+        self.tw_begin = array('d', [0.0]) * dimension
+        self.tw_end = array('d', [0.0]) * dimension
+        self.service_times = array('d', [0.0]) * dimension
+        self.depots = array('i', [0])
+        self.vehicle_capacities = array('q')
+        self.vehicle_fixed_costs = array('d')
+        self.vehicle_var_costs = array('d')
+        self.vehicle_max_numbers = array('q')
+        self.vehicle_max_durations = array('d')
+        self.edge_weights = None
+
+    @property
+    def customers(self):
+        """list(int) : positions of customers in the columns of points"""
+        depots = set(self.depots)
+        return [i for i in range(self.dimension) if i not in depots]
+
+    def distance(self, i, j):
+        """Return the distance between the points at positions i and j
+        with the conventions of TSPLIB for the edge weight type
+        (EUC_2D distances are rounded to the nearest integer)"""
+        if self.edge_weight_type == "EXPLICIT":
+            return self.edge_weights[i][j]
+        delta_x = self.x[i] - self.x[j]
+        delta_y = self.y[i] - self.y[j]
+        if self.edge_weight_type == "EUC_2D":
+            return float(int(math.sqrt(delta_x**2 + delta_y**2) + 0.5))
+        if self.edge_weight_type == "CEIL_2D":
+            return float(math.ceil(math.sqrt(delta_x**2 + delta_y**2)))
+        if self.edge_weight_type == "MAN_2D":
+            return float(int(abs(delta_x) + abs(delta_y) + 0.5))
+        if self.edge_weight_type == "MAX_2D":
+            return float(max(int(abs(delta_x) + 0.5),
+                             int(abs(delta_y) + 0.5)))
+        if self.edge_weight_type == "ATT":
+            distance = math.sqrt((delta_x**2 + delta_y**2) / 10.0)
+            rounded = int(distance + 0.5)
+            return float(rounded + 1 if rounded < distance else rounded)
+        if self.edge_weight_type == "GEO":
+            latitude_i, longitude_i = _geo_radians(self.x[i], self.y[i])
+            latitude_j, longitude_j = _geo_radians(self.x[j], self.y[j])
+            q_1 = math.cos(longitude_i - longitude_j)
+            q_2 = math.cos(latitude_i - latitude_j)
+            q_3 = math.cos(latitude_i + latitude_j)
+            return float(int(6378.388 * math.acos(
+                0.5 * ((1.0 + q_1) * q_2 - (1.0 - q_1) * q_3)) + 1.0))
+        raise ValueError("EDGE_WEIGHT_TYPE : " + self.edge_weight_type +
+                         " is not supported")
+
+    def __repr__(self):
+        return (f"Instance(name={self.name!r}, type={self.type!r}, "
+                f"dimension={self.dimension})")
+
+
+def _geo_radians(x_coord, y_coord):
+    """Return latitude and longitude in radians of TSPLIB coordinates
+    given in degrees.minutes"""
+    coordinates = []
+    for value in (x_coord, y_coord):
+        degrees = int(value)
+        coordinates.append(math.pi * (degrees + 5.0 * (value - degrees) / 3.0)
+                           / 180.0)
+    return coordinates
+
+
+class _Mapped:
+    """Context manager giving the content of a file mapped in memory"""
+
+    def __init__(self, path):
+        self.__file = open(os.path.normpath(path), "rb")
+        self.__data = b""
+
+    def __enter__(self):
+        if os.fstat(self.__file.fileno()).st_size > 0:
+            self.__data = mmap.mmap(self.__file.fileno(), 0,
+                                    access=mmap.ACCESS_READ)
+        return self.__data
+
+    def __exit__(self, *args):
+        if isinstance(self.__data, mmap.mmap):
+            self.__data.close()
+        self.__file.close()
+
+
+def _columns(path, values, nb_columns, nb_rows, name):
+    """Return the columns of a table given by the values of its rows"""
+    if len(values) < nb_columns * nb_rows:
+        raise InstanceError(path, name + " is incomplete")
+    return [values[i:nb_columns * nb_rows:nb_columns]
+            for i in range(nb_columns)]
+
+
+def _indexed_column(path, values, dimension, name, typecode='d'):
+    """Return the column of values of a section "id value" """
+    ids, column = _columns(path, values, 2, dimension, name)
+    if list(ids) != list(range(1, dimension + 1)):
+        raise InstanceError(path, "unexpected index in " + name)
+    return array(typecode, map(int, column)) if typecode == 'q' else column
+
+
+def _explicit_weights(path, values, dimension, weight_format):
+    """Return the full matrix of weights given in an explicit format"""
+    if weight_format not in _EXPLICIT_FORMATS:
+        raise InstanceError(path, "EDGE_WEIGHT_FORMAT : " + weight_format +
+                            " is not supported")
+    weight_format = _EXPLICIT_FORMATS[weight_format]
+    if weight_format == "FULL_MATRIX":
+        _columns(path, values, dimension, dimension, "EDGE_WEIGHT_SECTION")
+        return [values[i * dimension:(i + 1) * dimension]
+                for i in range(dimension)]
+    matrix = [array('d', [0.0]) * dimension for _ in range(dimension)]
+    diagonal = "DIAG" in weight_format
+    position = 0
+    for i in range(dimension):
+        if weight_format.startswith("UPPER"):
+            columns = range(i if diagonal else i + 1, dimension)
+        else:
+            columns = range(0, i + 1 if diagonal else i)
+        row = values[position:position + len(columns)]
+        if len(row) < len(columns):
+            raise InstanceError(path, "EDGE_WEIGHT_SECTION is incomplete")
+        position += len(columns)
+        for j, weight in zip(columns, row):
+            matrix[i][j] = weight
+            matrix[j][i] = weight
+    return matrix
+
+
+def read_cvrplib(path):
+    """Read an instance in the format of CVRPLIB (TSPLIB format),
+    including the heterogeneous fleet instances with the sections
+    CAPACITIES, FIXED_COSTS, VARIABLE_COSTS and NUMBER_OF_VEHICLES"""
+    header = {}
+    sections = {}
+    with _Mapped(path) as data:
+        matches = list(_KEYWORD.finditer(data))
+        for match, following in zip(matches, matches[1:] + [None]):
+            key = match.group(1).decode()
+            if match.group(2) is not None:
+                header[key] = match.group(2).decode().strip()
+            elif key != "EOF":
+                end = len(data) if following is None else following.start()
+                sections[key] = array('d', map(float,
+                                               data[match.end():end].split()))
+    if "DIMENSION" not in header:
+        raise InstanceError(path, "DIMENSION is not given")
+    dimension = int(header["DIMENSION"])
+    instance = Instance(header.get("NAME", str()),
+                        header.get("TYPE", "CVRP"), dimension)
+    instance.edge_weight_type = header.get("EDGE_WEIGHT_TYPE", "EUC_2D")
+    if instance.edge_weight_type not in EDGE_WEIGHT_TYPES:
+        raise InstanceError(path, "EDGE_WEIGHT_TYPE : " +
+                            instance.edge_weight_type + " is not supported")
+
+    coordinates = sections.get("NODE_COORD_SECTION",
+                               sections.get("DISPLAY_DATA_SECTION"))
+    if coordinates is not None:
+        nb_columns = len(coordinates) // dimension if dimension else 3
+        columns = _columns(path, coordinates, nb_columns, dimension,
+                           "NODE_COORD_SECTION")
+        if list(columns[0]) != list(range(1, dimension + 1)):
+            raise InstanceError(path, "unexpected index in NODE_COORD_SECTION")
+        instance.x, instance.y = columns[1], columns[2]
+    elif instance.edge_weight_type != "EXPLICIT":
+        raise InstanceError(path, "NODE_COORD_SECTION is not given")
+    if instance.edge_weight_type == "EXPLICIT":
+        if "EDGE_WEIGHT_SECTION" not in sections:
+            raise InstanceError(path, "EDGE_WEIGHT_SECTION is not given")
+        instance.edge_weights = _explicit_weights(
+            path, sections["EDGE_WEIGHT_SECTION"], dimension,
+            header.get("EDGE_WEIGHT_FORMAT", "FULL_MATRIX"))
+
+    if "DEMAND_SECTION" in sections:
+        instance.demands = _indexed_column(path, sections["DEMAND_SECTION"],
+                                           dimension, "DEMAND_SECTION", 'q')
+    if "SERVICE_TIME_SECTION" in sections:
+        instance.service_times = _indexed_column(
+            path, sections["SERVICE_TIME_SECTION"], dimension,
+            "SERVICE_TIME_SECTION")
+    if "TIME_WINDOW_SECTION" in sections:
+        ids, instance.tw_begin, instance.tw_end = _columns(
+            path, sections["TIME_WINDOW_SECTION"], 3, dimension,
+            "TIME_WINDOW_SECTION")
+    if "DEPOT_SECTION" in sections:
+        depots = sections["DEPOT_SECTION"]
+        end = depots.index(-1) if -1 in depots else len(depots)
+        instance.depots = array('i', (int(depot) - 1
+                                      for depot in depots[:end]))
+
+    if "CAPACITIES" in sections:
+        nb_types = int(header.get("VEHICLE_KINDS",
+                                  len(sections["CAPACITIES"])))
+        instance.vehicle_capacities = array(
+            'q', map(int, sections["CAPACITIES"][:nb_types]))
+        for key, column in (("FIXED_COSTS", "vehicle_fixed_costs"),
+                            ("VARIABLE_COSTS", "vehicle_var_costs")):
+            setattr(instance, column, sections.get(
+                key, array('d', [float(key == "VARIABLE_COSTS")]) * nb_types
+            )[:nb_types])
+        instance.vehicle_max_numbers = array(
+            'q', map(int, sections.get("NUMBER_OF_VEHICLES",
+                                       array('d', [0]) * nb_types)[:nb_types]))
+    else:
+        instance.vehicle_capacities = array(
+            'q', [int(float(header.get("CAPACITY", 0)))])
+        instance.vehicle_fixed_costs = array('d', [0.0])
+        instance.vehicle_var_costs = array('d', [1.0])
+        instance.vehicle_max_numbers = array(
+            'q', [int(header.get("VEHICLES", 0))])
+    return instance
+
+
+def read_solomon(path):
+    """Read an instance of CVRPTW in the format of Solomon, the due dates
+    of the file are in tw_end (the service time is not added)"""
+    with _Mapped(path) as data:
+        name = data[:data.find(b"\n")].decode().strip()
+        vehicle = data.find(b"CAPACITY")
+        customer = data.find(b"CUSTOMER")
+        if vehicle < 0 or customer < 0:
+            raise InstanceError(path, "VEHICLE or CUSTOMER is not given")
+        max_number, capacity = data[vehicle + len(b"CAPACITY"):
+                                    customer].split()
+        # the line following CUSTOMER gives the names of columns
+        table = data.find(b"\n", data.find(b"\n", customer) + 1)
+        values = array('d', map(float, data[table:].split()))
+    dimension = len(values) // 7
+    instance = Instance(name, "CVRPTW", dimension)
+    (ids, instance.x, instance.y, demands, instance.tw_begin,
+     instance.tw_end, instance.service_times) = _columns(
+        path, values, 7, dimension, "CUSTOMER")
+    instance.demands = array('q', map(int, demands))
+    instance.vehicle_capacities = array('q', [int(capacity)])
+    instance.vehicle_fixed_costs = array('d', [0.0])
+    instance.vehicle_var_costs = array('d', [1.0])
+    instance.vehicle_max_numbers = array('q', [int(max_number)])
+    return instance
+
+
+def read_hfvrp(path):
+    """Read an instance of HFVRP in the format of Golden (the number of
+    customers, the points "id x y demand", the number of vehicle types and
+    the vehicle types "capacity fixed_cost var_cost min_number max_number")
+    or in the format of CVRPLIB"""
+    with _Mapped(path) as data:
+        if _HEADER.match(data):
+            return read_cvrplib(path)
+        values = array('d', map(float, data[:].split()))
+    if len(values) == 0:
+        raise InstanceError(path, "the file is empty")
+    dimension = int(values[0]) + 1
+    instance = Instance(os.path.splitext(os.path.basename(path))[0],
+                        "HFVRP", dimension)
+    ids, instance.x, instance.y, demands = _columns(
+        path, values[1:], 4, dimension, "points")
+    instance.demands = array('q', map(int, demands))
+    position = 1 + 4 * dimension
+    if len(values) <= position:
+        raise InstanceError(path, "the vehicle types are not given")
+    nb_types = int(values[position])
+    (capacities, instance.vehicle_fixed_costs, instance.vehicle_var_costs,
+     min_numbers, max_numbers) = _columns(
+        path, values[position + 1:], 5, nb_types, "vehicle types")
+    instance.vehicle_capacities = array('q', map(int, capacities))
+    instance.vehicle_max_numbers = array('q', map(int, max_numbers))
+    return instance
+
+
+def read_mdvrp(path):
+    """Read an instance of MDVRP in the format of Cordeau, the depots are
+    the last points. The time windows are read if they are given at the
+    end of the lines of points"""
+    with _Mapped(path) as data:
+        lines = [line.split() for line in data[:].splitlines()]
+    lines = [line for line in lines if line]
+    if len(lines) == 0 or len(lines[0]) < 4:
+        raise InstanceError(path, "the first line must be \"type m n t\"")
+    max_number, nb_customers, nb_depots = map(int, lines[0][1:4])
+    dimension = nb_customers + nb_depots
+    if len(lines) < 1 + nb_depots + dimension:
+        raise InstanceError(path, "the points are incomplete")
+    instance = Instance(os.path.splitext(os.path.basename(path))[0],
+                        "MDVRP", dimension)
+    for line in lines[1:1 + nb_depots]:
+        instance.vehicle_max_durations.append(float(line[0]))
+        instance.vehicle_capacities.append(int(float(line[1])))
+    instance.vehicle_fixed_costs = array('d', [0.0]) * nb_depots
+    instance.vehicle_var_costs = array('d', [1.0]) * nb_depots
+    instance.vehicle_max_numbers = array('q', [max_number]) * nb_depots
+    for i, line in enumerate(lines[1 + nb_depots:1 + nb_depots + dimension]):
+        # i x y d q f a list(a) [e l]
+        instance.x[i] = float(line[1])
+        instance.y[i] = float(line[2])
+        instance.service_times[i] = float(line[3])
+        instance.demands[i] = int(float(line[4]))
+        end = 7 + int(line[6]) if len(line) > 6 else len(line)
+        if len(line) >= end + 2:
+            instance.tw_begin[i] = float(line[end])
+            instance.tw_end[i] = float(line[end + 1])
+    instance.depots = array('i', range(nb_customers, dimension))
+    return instance
+
+
+def read_instance(path):
+    """Read an instance in one of the supported formats, the format is
+    given by the content of the file"""
+    with _Mapped(path) as data:
+        if _HEADER.match(data):
+            return read_cvrplib(path)
+        if data.find(b"CUSTOMER") >= 0 and data.find(b"VEHICLE") >= 0:
+            return read_solomon(path)
+        first_line = data[:data.find(b"\n")].split()
+    if len(first_line) == 1:
+        return read_hfvrp(path)
+    return read_mdvrp(path)
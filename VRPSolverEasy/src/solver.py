@@ -1,11 +1,26 @@
 """This module solves vehicle routing problems using branch&cut&price methods"""
 
+import asyncio
 import ctypes as _c
+import gc
+import heapq
+import io as _io
 import json
+import math
+import mmap as _mmap
+import multiprocessing
 import platform
 import os
+import re
+import struct
 import sys
-from VRPSolverEasy.src import constants
+import threading
+import time
+from array import array
+from concurrent import futures
+from itertools import chain, compress, groupby, islice, starmap
+from operator import itemgetter
+from VRPSolverEasy.src import constants, heuristic
 if sys.version_info > (3, 7):
     import collections.abc as collections
 else:
@@ -42,6 +57,632 @@ class ModelError(Exception):
         super().__init__(self.message)
 
 
+class BulkError(ModelError):
+    """ Exception raised by the functions adding many elements at once,
+    it gives all the invalid values, nothing is added.
+
+    Attributes:
+        message -- explanation of the errors
+        errors -- list of the invalid values and their error
+   """
+
+    def __init__(self, errors):
+        self.errors = errors
+        self.message = "\n".join(errors)
+        Exception.__init__(self, self.message)
+
+
+class _BapcodLibrary:
+    """Handle on the shared library bapcod with its functions bound once"""
+
+    def __init__(self, cdll, path):
+        self.path = path
+        self.cdll = cdll
+        self.solve = cdll.solveModel
+        self.solve.argtypes = [_c.c_char_p]
+        self.solve.restype = _c.POINTER(_c.c_char_p)
+        self.free_memory = cdll.freeMemory
+        self.free_memory.argtypes = [_c.POINTER(_c.c_char_p)]
+        self.free_memory.restype = _c.c_void_p
+
+
+# The library is loaded once per process and shared by all models.
+# A failed load is remembered so that next solves fail fast.
+# Bapcod is not reentrant, calls to solveModel are serialized by
+# _solve_lock; ctypes releases the GIL during the call.
+_library_lock = threading.Lock()
+_solve_lock = threading.Lock()
+_library = None
+_library_error = None
+_cplex_paths = []
+
+
+def _library_name():
+    """Return the file name of the library bapcod for the current platform"""
+    if platform.system() == constants.WINDOWS_PLATFORM:
+        return constants.LIBRARY_WINDOWS
+    if platform.system() == constants.LINUX_PLATFORM:
+        return constants.LIBRARY_LINUX
+    if platform.system() == constants.MAC_PLATFORM:
+        return constants.LIBRARY_MAC
+    raise ModelError(constants.PLATFORM_ERROR)
+
+
+def _library_candidates(lib_name):
+    """Return the paths tried to load the native library:
+
+    1. The current folder
+    2. The platform folder (lib/Windows for example)
+    3. The system folders (delegates the loading behavior to the system)
+    """
+    return [os.path.join(os.path.dirname(os.path.realpath(__file__)),
+                         lib_name),
+            os.path.join(os.path.join(os.path.realpath(__file__ + "/../../lib/"),
+                                      platform.system()), lib_name),
+            lib_name]
+
+
+def _open_library(candidate):
+    """Open a native library with ctypes"""
+    # Python 3.8 has changed the behavior of CDLL on Windows.
+    if hasattr(os, 'add_dll_directory'):
+        return _c.CDLL(candidate, winmode=0)
+    return _c.CDLL(candidate)
+
+
+def load_library(path=None):
+    """Load the shared library bapcod and keep it for the whole process.
+
+    If path is not given, the library is searched in the current folder,
+    the platform folder of the package and the system folders.
+    Calling this function again reloads the library and clears a
+    previous loading failure. Returns :py:func:`library_info`."""
+    global _library, _library_error
+    with _library_lock:
+        _library = None
+        _library_error = None
+        try:
+            candidates = [path] if path is not None else \
+                _library_candidates(_library_name())
+        except ModelError as error:
+            _library_error = error
+            raise
+        for candidate in candidates:
+            try:
+                _library = _BapcodLibrary(_open_library(candidate), candidate)
+                break
+            except BaseException:
+                pass
+        if _library is None:
+            _library_error = ModelError(constants.LOAD_LIB_ERROR)
+            raise _library_error
+    return library_info()
+
+
+def library_info():
+    """Return a dictionary describing the state of the library bapcod:
+    loaded (bool), path (str), platform (str), error (str) and
+    cplex_paths (list of loaded cplex libraries)"""
+    return {"loaded": _library is not None,
+            "path": _library.path if _library is not None else None,
+            "platform": platform.system(),
+            "error": _library_error.message if _library_error is not None
+            else None,
+            "cplex_paths": list(_cplex_paths)}
+
+
+def _get_library():
+    """Return the loaded library, loading it at first use"""
+    if _library is not None:
+        return _library
+    if _library_error is not None:
+        raise _library_error
+    load_library()
+    return _library
+
+
+def _solve_payload(payload, cplex_path=str()):
+    """Run bapcod on a model in json format (bytes) and return
+    the output in json format (bytes)"""
+    if cplex_path != str():
+        _load_cplex(cplex_path)
+    lib_bapcod = _get_library()
+    if isinstance(payload, bytearray):
+        # the buffer ends with a null byte and is given without copy
+        input = (_c.c_char * len(payload)).from_buffer(payload)
+    else:
+        input = _c.c_char_p(payload)
+    try:
+        with _solve_lock:
+            output = lib_bapcod.solve(input)
+            try:
+                # the output is copied once before being freed by bapcod
+                return _c.string_at(output)
+            finally:
+                lib_bapcod.free_memory(output)
+    except BaseException:
+        raise ModelError(constants.BAPCOD_ERROR)
+
+
+def _load_cplex(cplex_path):
+    """Load the library cplex once for a given path"""
+    path = os.path.realpath(cplex_path)
+    if path in _cplex_paths:
+        return
+    with _library_lock:
+        if path in _cplex_paths:
+            return
+        try:
+            _c.cdll.LoadLibrary(path)
+        except BaseException:
+            raise ModelError(constants.BAPCOD_ERROR)
+        _cplex_paths.append(path)
+
+
+def _as_list(values):
+    """Return a list from a sequence, an object with a method tolist
+    (an array of the module array) is converted by it"""
+    if hasattr(values, "tolist"):
+        return values.tolist()
+    return list(values)
+
+
+def _as_rows(matrix):
+    """Return a matrix as a list of lists"""
+    return [_as_list(row) for row in _as_list(matrix)]
+
+
+# exact types accepted by the fast path of constructors, other values
+# go through the setters which raise the right errors
+_NUMBER_TYPES = (int, float)
+
+
+def _finite_number(name, value):
+    """Return a number of a subclass of int or float as float, raise
+    a PropertyError if it's not finite"""
+    if type(value) not in _NUMBER_TYPES:
+        value = float(value)
+    if not math.isfinite(value):
+        raise PropertyError(name, constants.FINITE_PROPERTY)
+    return value
+
+
+def _filled(typecode, value, size):
+    """Return an array of given size filled with the same value"""
+    return array(typecode, [value]) * size
+
+
+_TYPES_CODES = {(int,): constants.INTEGER_PROPERTY,
+                _NUMBER_TYPES: constants.NUMBER_PROPERTY,
+                (str,): constants.STRING_PROPERTY,
+                (bool,): constants.BOOLEAN_PROPERTY}
+
+_MINIMUM_CODES = {-1: constants.GREATER_MINUS_ONE_PROPERTY,
+                  0: constants.GREATER_ZERO_PROPERTY,
+                  1: constants.GREATER_ONE_PROPERTY}
+
+_MAXIMUM_CODES = {1022: constants.LESS_MAX_POINTS_PROPERTY,
+                  10000: constants.LESS_MAX_POINTS_ID_PROPERTY}
+
+
+def _value_error(value, types, minimum, maximum):
+    """Return the code of error of a value, None if it's valid"""
+    if type(value) not in types:
+        return _TYPES_CODES[types]
+    if type(value) is float and not math.isfinite(value):
+        return constants.FINITE_PROPERTY
+    if minimum is not None and value < minimum:
+        return _MINIMUM_CODES[minimum]
+    if maximum is not None and value > maximum:
+        return _MAXIMUM_CODES[maximum]
+    return None
+
+
+def _checked_column(errors, name, values, size, default, types,
+                    minimum=None, maximum=None):
+    """Return a column of values as a list (filled with default if values
+    is None), the values must have exactly one of the types and be between
+    minimum and maximum (and be finite for numbers). The invalid values are
+    added in errors with their row, they are searched only if the checks
+    of the whole column fail"""
+    if values is None:
+        return [default] * size
+    values = _as_list(values)
+    if size is not None and len(values) != size:
+        errors.append(name + constants.ERRORS_PROPERTY[
+            constants.LENGTH_PROPERTY])
+        return values
+    if not values or (set(map(type, values)).issubset(types) and
+                      (float not in types or math.isfinite(sum(values))) and
+                      (minimum is None or min(values) >= minimum) and
+                      (maximum is None or max(values) <= maximum)):
+        return values
+    for row, value in enumerate(values):
+        code = _value_error(value, types, minimum, maximum)
+        if code is not None:
+            errors.append("%s[%d]%s" % (name, row,
+                                        constants.ERRORS_PROPERTY[code]))
+    return values
+
+
+def _checked_lists(errors, offsets, values, size):
+    """Return the lists of incompatible vehicles given by offsets and
+    values (compressed rows), one new list by row"""
+    if offsets is None and values is None:
+        return [[] for _ in range(size)]
+    offsets = _as_list(() if offsets is None else offsets)
+    values = _checked_column(errors, "incompatible_vehicles",
+                             () if values is None else values, None, None,
+                             (int,), 1)
+    if len(offsets) != size + 1 or offsets[0] != 0 or \
+            offsets[-1] != len(values) or \
+            any(type(offset) is not int for offset in offsets) or \
+            any(map(int.__gt__, offsets, offsets[1:])):
+        errors.append("incompatible_offsets" + constants.ERRORS_PROPERTY[
+            constants.OFFSETS_PROPERTY])
+        return [[] for _ in range(size)]
+    return [values[begin:end] for begin, end in zip(offsets, offsets[1:])]
+
+
+def _check_matrix(matrix, name, size=None, non_negative=True):
+    """Check in one pass that a matrix is square and contains only
+    finite numbers (non-negative if asked), returns its rows as arrays
+    of floats"""
+    try:
+        rows = [array('d', row) for row in _as_rows(matrix)]
+    except TypeError:
+        raise PropertyError(name, constants.NUMBER_PROPERTY)
+    if size is None:
+        size = len(rows)
+    if len(rows) != size or any(len(row) != size for row in rows):
+        raise PropertyError(name, constants.MATRIX_PROPERTY)
+    # the sum of a row is finite if all its values are (or overflows)
+    if not all(math.isfinite(sum(row)) or all(map(math.isfinite, row))
+               for row in rows):
+        raise PropertyError(name, constants.FINITE_PROPERTY)
+    if non_negative and any(min(row) < 0 for row in rows if len(row) > 0):
+        raise PropertyError(name, constants.GREATER_ZERO_PROPERTY)
+    return rows
+
+
+# strings "true"/"false" of the 8 bits of each byte, lowest bit first
+_JSON_BITS = [tuple("true" if byte >> bit & 1 else "false"
+                    for bit in range(8)) for byte in range(256)]
+
+# bits of each byte as booleans
+_BITS = [tuple(bool(byte >> bit & 1) for bit in range(8))
+         for byte in range(256)]
+
+# number of links written at once in the json buffer
+_JSON_BLOCK_SIZE = 65536
+
+# binary format of models (see Model.save), a prefix (magic bytes,
+# version, size of the header) is followed by the header in json format
+# and the sections of arrays, each aligned on 8 bytes
+_BINARY_MAGIC = b"VRPSEASY"
+_BINARY_VERSION = 1
+_BINARY_PREFIX = struct.Struct("<8sII")
+
+# typecodes of the arrays of a binary model
+_SECTION_TYPECODES = frozenset("Biqd")
+
+# attributes of parameters saved with the model
+_SAVED_PARAMETERS = ("time_limit", "upper_bound", "heuristic_used",
+                     "time_limit_heuristic", "config_file", "solver_name",
+                     "print_level", "action", "cplex_path")
+
+# json documents are read by chunks of characters (see _JsonReader)
+_JSON_CHUNK_SIZE = 1 << 20
+_JSON_SPACES = re.compile(r"[ \t\n\r]*")
+
+# attributes of parameters by key in json format
+_JSON_PARAMETERS = {parameter.value: parameter.name.lower()
+                    for parameter in constants.PARAMETERS}
+
+# margin on times before a time window is considered as violated
+# by the preprocessing
+_TIME_TOLERANCE = 1e-6
+
+
+def _dumps(value):
+    """Return a value in compact json format"""
+    return json.dumps(value, separators=(",", ":"))
+
+
+def _format_links(columns):
+    """Return an iterator on the links given by columns in json format.
+
+    columns is a tuple (start point ids, end point ids, names,
+    is_directed, distances, times, fixed costs, rows kept), the optional
+    columns are None when all values are the default one"""
+    fields = (constants.LINK.START_POINT_ID, constants.LINK.END_POINT_ID,
+              constants.LINK.NAME, constants.LINK.IS_DIRECTED,
+              constants.LINK.DISTANCE, constants.LINK.TIME,
+              constants.LINK.FIXED_COST)
+    formats = ("%d", "%d", "%s", "%s", "%r", "%r", "%r")
+    used = [i for i in range(len(fields)) if columns[i] is not None]
+    template = "{" + ",".join('"%s":%s' % (fields[i].value, formats[i])
+                              for i in used) + "}"
+    rows = zip(*(columns[i] for i in used))
+    if columns[7] is not None:
+        rows = compress(rows, columns[7])
+    return map(template.__mod__, rows)
+
+
+def _link_columns(links):
+    """Return the columns of a list of links for the json format"""
+    distances = [link._distance for link in links]
+    times = [link._time for link in links]
+    fixed_costs = [link._fixed_cost for link in links]
+    return ([link._start_point_id for link in links],
+            [link._end_point_id for link in links],
+            [json.dumps(link._name) for link in links]
+            if any(link._name for link in links) else None,
+            ["true" if link._is_directed else "false" for link in links]
+            if any(link._is_directed for link in links) else None,
+            distances if any(distances) else None,
+            times if any(times) else None,
+            fixed_costs if any(fixed_costs) else None,
+            None)
+
+
+def _pack_bits(flags):
+    """Return a bitmask (bytearray) from an iterable of booleans"""
+    flags = list(flags)
+    flags.extend([False] * (-len(flags) % 8))
+    return bytearray(sum(flag << bit for bit, flag in
+                         enumerate(flags[position:position + 8]))
+                     for position in range(0, len(flags), 8))
+
+
+def _bits(mask, size):
+    """Return an iterator on the size first bits of a bitmask"""
+    return islice(chain.from_iterable(map(_BITS.__getitem__, mask)), size)
+
+
+def _number_column(values):
+    """Return a column of numbers as an array of integers if all values
+    are integers, otherwise as an array of floats with the bitmask of
+    integer values (None if there are none)"""
+    values = list(values)
+    types = set(map(type, values))
+    if types.issubset((int,)):
+        try:
+            return array('q', values), None
+        except OverflowError:
+            pass
+    return array('d', values), \
+        _pack_bits(type(value) is int for value in values) \
+        if int in types else None
+
+
+def _number_values(column, mask=None):
+    """Return the values of a column of numbers given by _number_column"""
+    values = column.tolist()
+    if mask is not None:
+        values = [int(value) if is_int else value
+                  for value, is_int in zip(values, _bits(mask, len(values)))]
+    return values
+
+
+def _add_numbers(sections, name, values):
+    """Add in sections a column of numbers and its bitmask of integers"""
+    column, mask = _number_column(values)
+    sections[name] = column
+    if mask is not None:
+        sections[name + ".ints"] = mask
+
+
+def _add_names(sections, names_tables, name, names):
+    """Add in sections the ids of names in a table of names"""
+    names = list(names)
+    table = list(dict.fromkeys(names))
+    sections[name] = array('i', map({value: name_id for name_id, value
+                                     in enumerate(table)}.__getitem__, names))
+    names_tables[name] = table
+
+
+def _read_section(view, entry, copy, swap=False):
+    """Return a section of a binary model as a memoryview on the file
+    or, if copy is True, as an array (a bytearray for bytes), raise
+    a ValueError if the section is not entirely in the file"""
+    offset, typecode, size = entry
+    if type(offset) is not int or type(size) is not int or \
+            typecode not in _SECTION_TYPECODES or offset < 0 or size < 0:
+        raise ValueError(entry)
+    end = offset + size * struct.calcsize(typecode)
+    if end > len(view):
+        raise ValueError(entry)
+    section = view[offset:end]
+    if typecode == 'B':
+        return bytearray(section) if copy else section
+    if not (copy or swap):
+        return section.cast(typecode)
+    column = array(typecode)
+    column.frombytes(section)
+    if swap:
+        column.byteswap()
+    return column
+
+
+def _routes_distance(routes, links):
+    """Return the total distance of the routes of a RoutesArray, each arc
+    takes the link with the name of its incoming arc given by bapcod
+    (the shortest one between parallel links with this name), None if
+    an arc has no link"""
+    distances = {}
+    total_distance = 0.0
+    point_ids = routes.point_ids
+    arc_name_ids = routes._arc_name_ids
+    offsets = routes.offsets
+    for index in range(len(routes)):
+        begin, end = offsets[index], offsets[index + 1]
+        for arc in zip(point_ids[begin:end - 1], point_ids[begin + 1:end],
+                       arc_name_ids[begin + 1:end]):
+            distance = distances.get(arc)
+            if distance is None:
+                start_point_id, end_point_id, name_id = arc
+                arc_links = list(links.get((start_point_id, end_point_id),
+                                           ()))
+                arc_links += [link for link in links.get(
+                    (end_point_id, start_point_id), ())
+                    if not link.is_directed]
+                name = routes._names[name_id]
+                named = [link for link in arc_links if link.name == name]
+                arc_distances = [link.distance
+                                 for link in (named or arc_links)]
+                if start_point_id == end_point_id:
+                    # a route without customers needs no link
+                    arc_distances.append(0.0)
+                if not arc_distances:
+                    return None
+                distance = distances[arc] = min(arc_distances)
+            total_distance += distance
+    return total_distance
+
+
+def _write_blocks(buffer, blocks):
+    """Write in the buffer the blocks of json separated by commas"""
+    first = True
+    for block in blocks:
+        if block:
+            if not first:
+                buffer += b","
+            buffer += block
+            first = False
+
+
+class _JsonReader:
+    """Incremental reader of a json document read by chunks in a text
+    file, the members of objects and the elements of arrays are decoded
+    one by one, so a large array is never in memory as a whole"""
+
+    def __init__(self, file):
+        self.__file = file
+        self.__text = str()
+        self.__position = 0
+        self.__end_of_file = False
+        self.__nb_chunks = 0
+        self.__decode = json.JSONDecoder().raw_decode
+
+    def __fill(self):
+        """Read the next chunk, return False at the end of the file"""
+        chunk = self.__file.read(_JSON_CHUNK_SIZE)
+        if not chunk:
+            self.__end_of_file = True
+            return False
+        self.__text = self.__text[self.__position:] + chunk
+        self.__position = 0
+        self.__nb_chunks += 1
+        return True
+
+    def next_char(self):
+        """Return the next character which is not a space,
+        without reading it"""
+        while True:
+            self.__position = _JSON_SPACES.match(self.__text,
+                                                 self.__position).end()
+            if self.__position < len(self.__text):
+                return self.__text[self.__position]
+            if not self.__fill():
+                raise ValueError("unexpected end of json")
+
+    def expect(self, char):
+        """Read the next character which must be char"""
+        if self.next_char() != char:
+            raise ValueError("expected " + char)
+        self.__position += 1
+
+    def value(self):
+        """Read and return the next value"""
+        self.next_char()
+        while True:
+            try:
+                value, end = self.__decode(self.__text, self.__position)
+                # a number at the end of the chunk can continue
+                # in the next one
+                if end < len(self.__text) or self.__end_of_file:
+                    self.__position = end
+                    return value
+            except ValueError:
+                if self.__end_of_file:
+                    raise
+            self.__fill()
+
+    def __items(self, opening, closing):
+        """Generator reading the separators of an object or an array,
+        the caller reads each item"""
+        self.expect(opening)
+        if self.next_char() == closing:
+            self.__position += 1
+            return
+        while True:
+            yield
+            char = self.next_char()
+            self.__position += 1
+            if char == closing:
+                return
+            if char != ",":
+                raise ValueError("expected , or " + closing)
+
+    def members(self):
+        """Generator giving the keys of an object,
+        the caller reads the value of each key"""
+        for _ in self.__items("{", "}"):
+            key = self.value()
+            if not isinstance(key, str):
+                raise ValueError("expected a key")
+            self.expect(":")
+            yield key
+
+    def batches(self):
+        """Generator giving the elements of an array by lists, the objects
+        until the last closing brace of the chunk are decoded at once"""
+        failed_chunk = -1
+        for _ in self.__items("[", "]"):
+            end = self.__text.rfind("}", self.__position) + 1
+            if end and failed_chunk != self.__nb_chunks:
+                # the text fails to decode if the brace doesn't close
+                # an element, in a name for example
+                try:
+                    batch = json.loads(
+                        "[" + self.__text[self.__position:end] + "]")
+                    self.__position = end
+                    yield batch
+                    continue
+                except ValueError:
+                    failed_chunk = self.__nb_chunks
+            yield [self.value()]
+
+    def elements(self):
+        """Generator giving the elements of an array"""
+        return chain.from_iterable(self.batches())
+
+
+def _json_file(source):
+    """Return a text file from a path or from a json document
+    given by bytes (a final null byte is ignored)"""
+    if isinstance(source, (bytes, bytearray, memoryview)):
+        data = bytes(source)
+        if data.endswith(b"\0"):
+            data = data[:-1]
+        return _io.StringIO(data.decode('UTF-8'))
+    return open(source, encoding='UTF-8')
+
+
+def _invalidate_json(cls):
+    """Class decorator, the setters of properties clear the cached
+    json format of the object"""
+    for name, value in list(vars(cls).items()):
+        if isinstance(value, property) and value.fset is not None:
+            def fset(self, new_value, fset=value.fset):
+                fset(self, new_value)
+                self._json = None
+            setattr(cls, name, property(value.fget, fset, value.fdel,
+                                        value.__doc__))
+    return cls
+
+
 class VehicleTypesDict(dict,collections.MutableMapping):
     """Dictionary of vehicle types
 
@@ -80,6 +721,13 @@ class VehicleTypesDict(dict,collections.MutableMapping):
         return list(value.get_vehicle_type(debug)
                     for value in dict.values(self))
 
+    def _write_json(self, buffer):
+        """Write the vehicle types in json format in the buffer"""
+        if len(dict.values(self)) == 0:
+            raise ModelError(constants.MIN_VEHICLE_TYPES_ERROR)
+        buffer += ",".join([value._json_str() for value in
+                            dict.values(self)]).encode('UTF-8')
+
 
 class PointsDict(dict,collections.MutableMapping):
     """Dictionary of points ( depots and customers)
@@ -89,6 +737,10 @@ class PointsDict(dict,collections.MutableMapping):
 
     """
 
+    # number of points set or deleted, used to know if the indexes
+    # of depots and customers of the model are up to date
+    _version = 0
+
     def __getitem__(self, key):
         return dict.__getitem__(self, key)
 
@@ -104,10 +756,12 @@ class PointsDict(dict,collections.MutableMapping):
                 constants.NB_POINTS_STR,
                 constants.LESS_MAX_POINTS_PROPERTY)
         dict.__setitem__(self, key, value)
+        self._version += 1
 
             
     def __delitem__(self, key):
         dict.__delitem__(self, key)
+        self._version += 1
 
     def __iter__(self):
         return dict.__iter__(self)
@@ -123,6 +777,13 @@ class PointsDict(dict,collections.MutableMapping):
             raise ModelError(constants.MIN_POINTS_ERROR)
         return list(value.get_point(debug) for value in dict.values(self))
 
+    def _write_json(self, buffer):
+        """Write the points in json format in the buffer"""
+        if len(dict.values(self)) == 0:
+            raise ModelError(constants.MIN_POINTS_ERROR)
+        buffer += ",".join([value._json_str() for value in
+                            dict.values(self)]).encode('UTF-8')
+
 
 class LinksDict(dict,collections.MutableMapping):
     """Dictionary of links
@@ -132,6 +793,10 @@ class LinksDict(dict,collections.MutableMapping):
 
     """
 
+    # number of modifications, used to know if the adjacency index
+    # of the model is up to date
+    _version = 0
+
     def __getitem__(self, key):
         return dict.__getitem__(self, key)
 
@@ -142,9 +807,11 @@ class LinksDict(dict,collections.MutableMapping):
             if not isinstance(i,Link):
                 raise PropertyError(str(), 12)
         dict.__setitem__(self, key, value)
+        self._version += 1
 
     def __delitem__(self, key):
         dict.__delitem__(self, key)
+        self._version += 1
 
     def __iter__(self):
         return dict.__iter__(self)
@@ -160,11 +827,545 @@ class LinksDict(dict,collections.MutableMapping):
             raise ModelError(constants.MIN_LINKS_ERROR)
         return list(value.get_link(debug) for list_ in dict.values(self) for value in list_ )
 
+    def _write_json(self, buffer):
+        """Write the links in json format in the buffer, only the links
+           modified since the last call are formatted again"""
+        links = [link for list_ in dict.values(self) for link in list_]
+        if len(links) == 0:
+            raise ModelError(constants.MIN_LINKS_ERROR)
+        modified = [link for link in links if link._json is None]
+        for link, text in zip(modified,
+                              _format_links(_link_columns(modified))):
+            link._json = text
+        for start in range(0, len(links), _JSON_BLOCK_SIZE):
+            if start > 0:
+                buffer += b","
+            buffer += ",".join([link._json for link in
+                                links[start:start + _JSON_BLOCK_SIZE]]
+                               ).encode('UTF-8')
+
+    def add(self, link):
+        """Add a link, parallel links are kept in the list of the key"""
+        key = (link.start_point_id, link.end_point_id)
+        if dict.__contains__(self, key):
+            dict.__getitem__(self, key).append(link)
+            self._version += 1
+        else:
+            self[key] = [link]
+
+    def _extend(self, links):
+        """Add links already valid, parallel links are kept in the list
+           of the key"""
+        self._version += 1
+        for link in links:
+            key = (link._start_point_id, link._end_point_id)
+            list_ = dict.get(self, key)
+            if list_ is None:
+                dict.__setitem__(self, key, [link])
+            else:
+                list_.append(link)
+
+    def delete_rows(self, rows):
+        """Delete the links of the given rows (positions of links
+           in the lists of the dictionary, taken in order)"""
+        self._version += 1
+        rows = set(rows)
+        first_row = 0
+        for key, list_ in list(dict.items(self)):
+            kept = [link for row, link in enumerate(list_, first_row)
+                    if row not in rows]
+            first_row += len(list_)
+            if not kept:
+                dict.__delitem__(self, key)
+            elif len(kept) < len(list_):
+                dict.__setitem__(self, key, kept)
+
+
+class ArrayLinksDict(collections.MutableMapping):
+    """Dictionary of links stored by columns in arrays, one row by link
+
+    key (tuple): (start point id, end point id)
+    value: list of class Link, built each time the key is read,
+           the values set in a link read are written in its row
+           (a ModelError is raised if the link was deleted or its row
+           moved by a deletion since it was read)
+
+    Ids are stored on 32 bits, distances, times and fixed costs on 64 bits,
+    is_directed on one bit and names in a table shared by the links
+    with the same name.
+
+    """
+
+    def __init__(self, links=None):
+        self._start_point_ids = array('i')
+        self._end_point_ids = array('i')
+        self._distances = array('d')
+        self._times = array('d')
+        self._fixed_costs = array('d')
+        self._is_directed = bytearray()
+        self._name_ids = array('i')
+        self._names = [str()]
+        self._name_ids_by_name = {str(): 0}
+        # rows of each key, built at first access by key
+        self._index = None
+        self._nb_deleted = 0
+        # number of deletions, the links read before a deletion
+        # cannot be written in their rows
+        self._layout = 0
+        # number of modifications, used to know if the adjacency index
+        # of the model is up to date
+        self._version = 0
+        # blocks of rows already in json format
+        self._json_blocks = []
+        self._json_rows = 0
+        if links is not None:
+            for key in links:
+                for link in links[key]:
+                    self.add(link)
+
+    @classmethod
+    def _from_columns(cls, start_point_ids, end_point_ids, distances, times,
+                      fixed_costs, is_directed, name_ids, names):
+        """Return the links given by columns already valid, the columns
+           can be arrays or memoryviews on a file mapped in memory which
+           are copied in arrays only when rows are added"""
+        links = cls()
+        links._start_point_ids = start_point_ids
+        links._end_point_ids = end_point_ids
+        links._distances = distances
+        links._times = times
+        links._fixed_costs = fixed_costs
+        links._is_directed = is_directed
+        links._name_ids = name_ids
+        links._names = list(names)
+        links._name_ids_by_name = {name: name_id for name_id, name
+                                   in enumerate(links._names)}
+        return links
+
+    def __own_columns(self):
+        """Copy in arrays the columns which are memoryviews"""
+        if not isinstance(self._start_point_ids, memoryview):
+            return
+        for name in ("_start_point_ids", "_end_point_ids", "_distances",
+                     "_times", "_fixed_costs", "_name_ids"):
+            view = getattr(self, name)
+            column = array(view.format)
+            column.frombytes(view.cast('B'))
+            setattr(self, name, column)
+        self._is_directed = bytearray(self._is_directed)
+
+    def __build_index(self):
+        if self._index is None:
+            self._index = {}
+            for row, key in enumerate(zip(self._start_point_ids,
+                                          self._end_point_ids)):
+                if key[0] >= 0:
+                    self._index.setdefault(key, []).append(row)
+        return self._index
+
+    def __is_directed(self, row):
+        return bool(self._is_directed[row >> 3] >> (row & 7) & 1)
+
+    def __set_is_directed(self, row):
+        self._is_directed[row >> 3] |= 1 << (row & 7)
+
+    def __link(self, row):
+        link = _ArrayLink(self._start_point_ids[row],
+                          self._end_point_ids[row],
+                          self._names[self._name_ids[row]],
+                          self.__is_directed(row), self._distances[row],
+                          self._times[row], self._fixed_costs[row])
+        link._links = self
+        link._row = row
+        link._layout = self._layout
+        return link
+
+    def _write_link(self, link):
+        """Write the values of a link read from the dictionary in its row"""
+        row = link._row
+        if link._layout != self._layout:
+            raise ModelError(constants.STALE_LINK_ERROR)
+        self.__own_columns()
+        self._version += 1
+        key = (self._start_point_ids[row], self._end_point_ids[row])
+        if key != (link._start_point_id, link._end_point_id):
+            self._start_point_ids[row] = link._start_point_id
+            self._end_point_ids[row] = link._end_point_id
+            self._index = None
+        self._distances[row] = link._distance
+        self._times[row] = link._time
+        self._fixed_costs[row] = link._fixed_cost
+        self._name_ids[row] = self.__name_id(link._name)
+        if link._is_directed:
+            self.__set_is_directed(row)
+        else:
+            self._is_directed[row >> 3] &= ~(1 << (row & 7)) & 0xff
+        if row < self._json_rows:
+            self._json_blocks = []
+            self._json_rows = 0
+
+    def __getitem__(self, key):
+        return [self.__link(row) for row in self.__build_index()[key]]
+
+    def __setitem__(self, key, value):
+        if not isinstance(value, list):
+            raise ModelError(constants.ADD_LINK_ERROR)
+        for i in value:
+            if not isinstance(i,Link):
+                raise PropertyError(str(), 12)
+        if key in self:
+            del self[key]
+        for link in value:
+            self.add(link)
+
+    def __delitem__(self, key):
+        self.__own_columns()
+        self._version += 1
+        self._layout += 1
+        for row in self.__build_index().pop(key):
+            # deleted rows are kept with negative ids until compact()
+            self._start_point_ids[row] = -1
+            self._nb_deleted += 1
+        self._json_blocks = []
+        self._json_rows = 0
+        if self._nb_deleted > len(self._start_point_ids) // 2:
+            self.compact()
+
+    def __iter__(self):
+        return iter(self.__build_index())
+
+    def __len__(self):
+        return len(self.__build_index())
+
+    def __contains__(self, x):
+        return x in self.__build_index()
+
+    def __name_id(self, name):
+        name_id = self._name_ids_by_name.get(name)
+        if name_id is None:
+            name_id = len(self._names)
+            self._names.append(name)
+            self._name_ids_by_name[name] = name_id
+        return name_id
+
+    def __append_rows(self, start_point_ids, end_point_ids, distances, times,
+                      fixed_costs, is_directed, name_ids):
+        self.__own_columns()
+        self._version += 1
+        first_row = len(self._start_point_ids)
+        self._start_point_ids.extend(start_point_ids)
+        self._end_point_ids.extend(end_point_ids)
+        self._distances.extend(distances)
+        self._times.extend(times)
+        self._fixed_costs.extend(fixed_costs)
+        self._name_ids.extend(name_ids)
+        last_row = len(self._start_point_ids)
+        self._is_directed.extend(
+            bytes(((last_row + 7) >> 3) - len(self._is_directed)))
+        if is_directed:
+            row = first_row
+            while row < last_row and row & 7:
+                self.__set_is_directed(row)
+                row += 1
+            nb_bytes = (last_row - row) >> 3
+            self._is_directed[row >> 3:(row >> 3) + nb_bytes] = \
+                b'\xff' * nb_bytes
+            row += nb_bytes << 3
+            while row < last_row:
+                self.__set_is_directed(row)
+                row += 1
+        if self._index is not None:
+            for row in range(first_row, last_row):
+                key = (self._start_point_ids[row], self._end_point_ids[row])
+                self._index.setdefault(key, []).append(row)
+
+    def add(self, link):
+        """Add a link, parallel links are kept in the list of the key"""
+        if not isinstance(link, Link):
+            raise PropertyError(str(), constants.LINK_PROPERTY)
+        self.__append_rows((link.start_point_id,), (link.end_point_id,),
+                           (link.distance,), (link.time,),
+                           (link.fixed_cost,), link.is_directed,
+                           (self.__name_id(link.name),))
+
+    def extend(self, start_point_ids, end_point_ids, distances, times=None,
+               fixed_costs=None, is_directed=False, name=str()):
+        """Add links given by columns without building objects Link,
+           the values must already be valid"""
+        size = len(end_point_ids)
+        self.__append_rows(start_point_ids, end_point_ids, distances,
+                           _filled('d', 0.0, size) if times is None
+                           else times,
+                           _filled('d', 0.0, size) if fixed_costs is None
+                           else fixed_costs,
+                           is_directed,
+                           _filled('i', self.__name_id(name), size))
+
+    def _extend_columns(self, start_point_ids, end_point_ids, names,
+                        is_directed, distances, times, fixed_costs):
+        """Add links given by columns already valid, with a name and
+           a value of is_directed for each link"""
+        first_row = len(self._start_point_ids)
+        for name in dict.fromkeys(names):
+            self.__name_id(name)
+        self.__append_rows(start_point_ids, end_point_ids, distances, times,
+                           fixed_costs, False,
+                           map(self._name_ids_by_name.__getitem__, names))
+        for row in compress(range(first_row, len(self._start_point_ids)),
+                            is_directed):
+            self.__set_is_directed(row)
+        self._version += 1
+
+    def compact(self):
+        """Remove the rows of deleted links from the arrays"""
+        if self._nb_deleted == 0:
+            return
+        kept = list(map((0).__le__, self._start_point_ids))
+        self._is_directed = _pack_bits(compress(self._directed_rows(), kept))
+        for name in ("_start_point_ids", "_end_point_ids", "_distances",
+                     "_times", "_fixed_costs", "_name_ids"):
+            column = getattr(self, name)
+            typecode = column.format if isinstance(column, memoryview) \
+                else column.typecode
+            setattr(self, name, array(typecode, compress(column, kept)))
+        self._index = None
+        self._nb_deleted = 0
+        self._json_blocks = []
+        self._json_rows = 0
+
+    def delete_rows(self, rows):
+        """Delete the links of the given rows (positions in the arrays)
+           and compact the arrays"""
+        self.__own_columns()
+        self._version += 1
+        self._layout += 1
+        for row in rows:
+            if self._start_point_ids[row] >= 0:
+                self._start_point_ids[row] = -1
+                self._nb_deleted += 1
+        self._index = None
+        self.compact()
+
+    def _directed_rows(self):
+        """Return an iterator on is_directed of each row"""
+        return _bits(self._is_directed, len(self._start_point_ids))
+
+    def _json_size(self):
+        """Return the number of bytes of the links in json format"""
+        if len(self._start_point_ids) == self._nb_deleted:
+            return 0
+        buffer = bytearray()
+        self._write_json(buffer)
+        return len(buffer)
+
+    def _json_columns(self, first_row=0):
+        """Return the columns of links from a row for the json format,
+           read directly from the arrays"""
+        start_point_ids = self._start_point_ids[first_row:]
+        distances = self._distances[first_row:]
+        times = self._times[first_row:]
+        fixed_costs = self._fixed_costs[first_row:]
+        name_ids = self._name_ids[first_row:]
+        names = None
+        if any(name_ids):
+            table = [json.dumps(name) for name in self._names]
+            names = map(table.__getitem__, name_ids)
+        is_directed = None
+        if any(self._is_directed[first_row >> 3:]):
+            is_directed = islice(chain.from_iterable(
+                map(_JSON_BITS.__getitem__,
+                    self._is_directed[first_row >> 3:])),
+                first_row & 7, None)
+        return (start_point_ids, self._end_point_ids[first_row:], names,
+                is_directed,
+                distances if any(distances) else None,
+                times if any(times) else None,
+                fixed_costs if any(fixed_costs) else None,
+                map((0).__le__, start_point_ids)
+                if self._nb_deleted else None)
+
+    def _write_json(self, buffer):
+        """Write the links in json format in the buffer, only the rows
+           added since the last call are formatted if no link
+           was deleted"""
+        if len(self._start_point_ids) == self._nb_deleted:
+            raise ModelError(constants.MIN_LINKS_ERROR)
+        if self._json_rows < len(self._start_point_ids):
+            rows = _format_links(self._json_columns(self._json_rows))
+            block = ",".join(islice(rows, _JSON_BLOCK_SIZE))
+            while block:
+                self._json_blocks.append(block.encode('UTF-8'))
+                block = ",".join(islice(rows, _JSON_BLOCK_SIZE))
+            self._json_rows = len(self._start_point_ids)
+        _write_blocks(buffer, self._json_blocks)
+
+    @property
+    def nbytes(self):
+        """int : number of bytes used by the arrays of links"""
+        return sum(column.itemsize * len(column) for column in
+                   (self._start_point_ids, self._end_point_ids,
+                    self._distances, self._times, self._fixed_costs,
+                    self._name_ids)) + len(self._is_directed)
+
+    def values(self, debug=False):
+        if len(self._start_point_ids) == self._nb_deleted:
+            raise ModelError(constants.MIN_LINKS_ERROR)
+        links = []
+        for row, start_point_id in enumerate(self._start_point_ids):
+            if start_point_id < 0:
+                continue
+            link = {}
+            link[constants.LINK.START_POINT_ID.value] = start_point_id
+            link[constants.LINK.END_POINT_ID.value] = self._end_point_ids[row]
+            name = self._names[self._name_ids[row]]
+            if name != str() or debug:
+                link[constants.LINK.NAME.value] = name
+            is_directed = self.__is_directed(row)
+            if is_directed or debug:
+                link[constants.LINK.IS_DIRECTED.value] = is_directed
+            if self._distances[row] != 0 or debug:
+                link[constants.LINK.DISTANCE.value] = self._distances[row]
+            if self._times[row] != 0 or debug:
+                link[constants.LINK.TIME.value] = self._times[row]
+            if self._fixed_costs[row] != 0 or debug:
+                link[constants.LINK.FIXED_COST.value] = self._fixed_costs[row]
+            links.append(link)
+        return links
+
+
+class AdjacencyIndex:
+    """Index of the arcs of the links by point, kept by the model
+    (see :py:attr:`Model.adjacency`)
+
+    An arc from a point to another one is given by a link directed
+    between them or by a link not directed in either direction, the
+    number of links of each arc counts the parallel links.
+
+    Additional informations:
+        - the successors, the predecessors and the neighbors (links not
+          directed) of a point are found in O(1), the arcs of a point
+          in O(degree)
+        - the index is updated with each link added or deleted by
+          :py:meth:`Model.add_link` and :py:meth:`Model.delete_link`,
+          it's built again after the other modifications of the
+          dictionary of links or of the points and is_directed of a link
+        - the lists of links are not watched, a link appended to or
+          removed from model.links[key] in place is not seen by the
+          index: add it with :py:meth:`Model.add_link` or set the list
+          again with model.links[key] = list_
+        - :py:meth:`csr` gives the arcs in compressed sparse rows
+    """
+
+    __slots__ = ("_out", "_in", "_undirected")
+
+    def __init__(self, start_point_ids=(), end_point_ids=(),
+                 is_directed=()):
+        # number of links of the arcs by point and by other point
+        self._out = {}
+        self._in = {}
+        self._undirected = {}
+        for start_point_id, end_point_id, directed in zip(
+                start_point_ids, end_point_ids, is_directed):
+            self.add(start_point_id, end_point_id, directed)
+
+    @staticmethod
+    def __change(index, point_id, other_id, number):
+        arcs = index.get(point_id)
+        if arcs is None:
+            index[point_id] = {other_id: number}
+            return
+        number += arcs.get(other_id, 0)
+        if number > 0:
+            arcs[other_id] = number
+            return
+        arcs.pop(other_id, None)
+        if not arcs:
+            del index[point_id]
+
+    def __update(self, start_point_id, end_point_id, is_directed, number):
+        change = self.__change
+        change(self._out, start_point_id, end_point_id, number)
+        change(self._in, end_point_id, start_point_id, number)
+        if is_directed:
+            return
+        change(self._undirected, start_point_id, end_point_id, number)
+        if start_point_id != end_point_id:
+            change(self._undirected, end_point_id, start_point_id, number)
+            change(self._out, end_point_id, start_point_id, number)
+            change(self._in, start_point_id, end_point_id, number)
+
+    def add(self, start_point_id, end_point_id, is_directed=False):
+        """Add the arcs of a link"""
+        self.__update(start_point_id, end_point_id, is_directed, 1)
+
+    def discard(self, start_point_id, end_point_id, is_directed=False):
+        """Remove the arcs of a link"""
+        self.__update(start_point_id, end_point_id, is_directed, -1)
+
+    def successors(self, point_id):
+        """Return the ids of points reached from a point by a link"""
+        return list(self._out.get(point_id, ()))
+
+    def predecessors(self, point_id):
+        """Return the ids of points reaching a point by a link"""
+        return list(self._in.get(point_id, ()))
+
+    def neighbors(self, point_id):
+        """Return the ids of points linked to a point by a link
+        not directed"""
+        return list(self._undirected.get(point_id, ()))
+
+    def nb_links(self, start_point_id, end_point_id):
+        """Return the number of links which can be used from a point
+        to another one"""
+        return self._out.get(start_point_id, {}).get(end_point_id, 0)
+
+    def __contains__(self, arc):
+        start_point_id, end_point_id = arc
+        return end_point_id in self._out.get(start_point_id, ())
+
+    def __len__(self):
+        """number of arcs"""
+        return sum(map(len, self._out.values()))
+
+    def csr(self, direction="out"):
+        """Return the arcs in compressed sparse rows as a tuple of arrays
+        (point ids, offsets, other point ids, numbers of links), the
+        arcs of point_ids[i] are given by offsets[i]:offsets[i + 1].
 
+        Additional informations:
+            - direction : out (successors), in (predecessors) or
+              undirected (neighbors)
+            - the points are sorted by id and the other points of
+              each point too"""
+        indexes = {"out": self._out, "in": self._in,
+                   "undirected": self._undirected}
+        if direction not in indexes:
+            raise ValueError("direction must be one of " +
+                             ", ".join(indexes))
+        index = indexes[direction]
+        point_ids = array('i', sorted(index))
+        offsets = array('q', [0])
+        other_ids = array('i')
+        numbers = array('i')
+        for point_id in point_ids:
+            arcs = index[point_id]
+            sorted_ids = sorted(arcs)
+            other_ids.extend(sorted_ids)
+            numbers.extend(map(arcs.__getitem__, sorted_ids))
+            offsets.append(len(other_ids))
+        return point_ids, offsets, other_ids, numbers
+
+
+@_invalidate_json
 class VehicleType:
     """Define a vehicle type with different attributes.
     """
 
+    __slots__ = ("_id", "_name", "_capacity", "_fixed_cost", "_var_cost_dist",
+                 "_var_cost_time", "_max_number", "_start_point_id",
+                 "_end_point_id", "_tw_begin", "_tw_end", "_json")
+
     def __init__(
             self,
             id: int,
@@ -178,6 +1379,30 @@ class VehicleType:
             max_number=1,
             tw_begin=0,
             tw_end=0):
+        if (type(id) is int and id >= 1 and type(name) is str
+                and type(capacity) is int and capacity >= 0
+                and type(fixed_cost) in _NUMBER_TYPES
+                and type(var_cost_dist) in _NUMBER_TYPES
+                and type(var_cost_time) in _NUMBER_TYPES
+                and type(max_number) is int and max_number >= 0
+                and type(start_point_id) is int and start_point_id >= -1
+                and type(end_point_id) is int and end_point_id >= -1
+                and type(tw_begin) in _NUMBER_TYPES
+                and type(tw_end) in _NUMBER_TYPES):
+            # all values are valid, the setters are not needed
+            self._name = name
+            self._id = id
+            self._capacity = capacity
+            self._fixed_cost = fixed_cost
+            self._var_cost_dist = var_cost_dist
+            self._var_cost_time = var_cost_time
+            self._max_number = max_number
+            self._start_point_id = start_point_id
+            self._end_point_id = end_point_id
+            self._tw_begin = tw_begin
+            self._tw_end = tw_end
+            self._json = None
+            return
         self.name = name
         self.id = id
         self.capacity = capacity
@@ -383,10 +1608,18 @@ class VehicleType:
                      TIME_WINDOWS_END.value] = self.tw_end
         return veh_type
 
+    def _json_str(self):
+        """Return the vehicle type in json format, kept until
+        a property is modified"""
+        if self._json is None:
+            self._json = _dumps(self.get_vehicle_type())
+        return self._json
+
     def __repr__(self):
         return repr(self.get_vehicle_type())
 
 
+@_invalidate_json
 class Point:
     """Define a point of graph (customer or depot).
        
@@ -404,9 +1637,40 @@ class Point:
              the customer or are not accepted in a depot.
     """
 
+    # number of modifications of id_customer of all points, used to know
+    # if the indexes of depots and customers of the models are up to date
+    _id_customers_version = 0
+
+    __slots__ = ("_id", "_name", "_id_customer", "_penalty_or_cost",
+                 "_service_time", "_tw_begin", "_tw_end", "_time_windows",
+                 "_demand", "_incompatible_vehicles", "_json")
+
     def __init__(self, id, name=str(), id_customer=0, penalty_or_cost=0.0,
                  service_time=0, tw_begin=0, tw_end=0, demand=0,
                  incompatible_vehicles=[]):
+        if (type(id) is int and 0 <= id <= 10000 and type(name) is str
+                and type(id_customer) is int and 0 <= id_customer <= 1022
+                and type(penalty_or_cost) in _NUMBER_TYPES
+                and type(service_time) in _NUMBER_TYPES
+                and type(tw_begin) in _NUMBER_TYPES
+                and type(tw_end) in _NUMBER_TYPES
+                and type(demand) is int and demand >= 0
+                and type(incompatible_vehicles) is list
+                and (not incompatible_vehicles or
+                     all(type(x) is int for x in incompatible_vehicles))):
+            # all values are valid, the setters are not needed
+            self._name = name
+            self._id_customer = id_customer
+            self._id = id
+            self._service_time = service_time
+            self._tw_begin = tw_begin
+            self._tw_end = tw_end
+            self._time_windows = (tw_begin, tw_end)
+            self._penalty_or_cost = penalty_or_cost
+            self._demand = demand
+            self._incompatible_vehicles = incompatible_vehicles
+            self._json = None
+            return
         self.name = name
         self.id_customer = id_customer
         self.id = id
@@ -469,8 +1733,23 @@ class Point:
         if id_customer > 1022:
             raise PropertyError(constants.POINT.ID_CUSTOMER.value,
                                 constants.LESS_MAX_POINTS_PROPERTY)
+        if id_customer != getattr(self, "_id_customer", id_customer):
+            Point._id_customers_version += 1
         self._id_customer = id_customer
 
+    @property
+    def penalty_or_cost(self):
+        """getter function of penalty_or_cost"""
+        return self._penalty_or_cost
+
+    @penalty_or_cost.setter
+    def penalty_or_cost(self, penalty_or_cost):
+        """setter function of penalty_or_cost"""
+        if not isinstance(penalty_or_cost, (int, float)):
+            raise PropertyError(constants.POINT.PENALTY_OR_COST.value,
+                                constants.NUMBER_PROPERTY)
+        self._penalty_or_cost = penalty_or_cost
+
     @property
     def penalty(self):
         """getter function of penalty"""
@@ -598,6 +1877,33 @@ class Point:
                     constants.LIST_INTEGER_PROPERTY)
         self._incompatible_vehicles = incompatible_vehicles_in
 
+    @classmethod
+    def _from_columns(cls, ids, names, id_customers, penalties_or_costs,
+                      service_times, tw_begins, tw_ends, demands,
+                      incompatible_vehicles):
+        """Return the points given by columns of values already checked"""
+        points = []
+        append = points.append
+        new = cls.__new__
+        for (id, name, id_customer, penalty_or_cost, service_time, tw_begin,
+             tw_end, demand, incompatible) in zip(
+                ids, names, id_customers, penalties_or_costs, service_times,
+                tw_begins, tw_ends, demands, incompatible_vehicles):
+            point = new(cls)
+            point._id = id
+            point._name = name
+            point._id_customer = id_customer
+            point._penalty_or_cost = penalty_or_cost
+            point._service_time = service_time
+            point._tw_begin = tw_begin
+            point._tw_end = tw_end
+            point._time_windows = (tw_begin, tw_end)
+            point._demand = demand
+            point._incompatible_vehicles = incompatible
+            point._json = None
+            append(point)
+        return points
+
     def get_point(self, debug=False):
         """Get all components of a Point which are
          different of default value"""
@@ -623,6 +1929,15 @@ class Point:
                   .value] = self.incompatible_vehicles
         return point
 
+    def _json_str(self):
+        """Return the point in json format, kept until a property is
+        modified or the list of incompatible vehicles changes"""
+        if self._json is None or \
+                self._json[0] != self._incompatible_vehicles:
+            self._json = (list(self._incompatible_vehicles),
+                          _dumps(self.get_point()))
+        return self._json[1]
+
     def __repr__(self):
         return repr(self.get_point())
 
@@ -638,6 +1953,8 @@ class Customer(Point):
        - demand(int): must be an integer
     """
 
+    __slots__ = ()
+
     def __init__(
             self,
             id,
@@ -676,6 +1993,8 @@ class Depot(Point):
         capacity: must be an integer
     """
 
+    __slots__ = ()
+
     def __init__(
             self,
             id,
@@ -689,6 +2008,7 @@ class Depot(Point):
                          0, incompatible_vehicles)
 
 
+@_invalidate_json
 class Link:
     """Define a link of graph.
 
@@ -697,8 +2017,34 @@ class Link:
         start point with the same time and distance
     """
 
+    # number of modifications of is_directed, start_point_id and
+    # end_point_id of all links, used to know if the adjacency indexes
+    # of the models are up to date
+    _arcs_version = 0
+
+    __slots__ = ("_name", "_is_directed", "_start_point_id", "_end_point_id",
+                 "_distance", "_time", "_fixed_cost", "_json")
+
     def __init__(self, start_point_id, end_point_id, name=str(), is_directed=False,
                  distance=0.0, time=0.0, fixed_cost=0.0):
+        if (type(start_point_id) is int and start_point_id >= 0
+                and type(end_point_id) is int and end_point_id >= 0
+                and type(name) is str and type(is_directed) is bool
+                and type(distance) in _NUMBER_TYPES
+                and 0 <= distance < math.inf
+                and type(time) in _NUMBER_TYPES and 0 <= time < math.inf
+                and type(fixed_cost) in _NUMBER_TYPES
+                and -math.inf < fixed_cost < math.inf):
+            # all values are valid, the setters are not needed
+            self._name = name
+            self._is_directed = is_directed
+            self._start_point_id = start_point_id
+            self._end_point_id = end_point_id
+            self._distance = distance
+            self._time = time
+            self._fixed_cost = fixed_cost
+            self._json = None
+            return
         self.name = name
         self.is_directed = is_directed
         self.start_point_id = start_point_id
@@ -731,6 +2077,8 @@ class Link:
         if not isinstance(is_directed, (bool)):
             raise PropertyError(constants.LINK.NAME.value,
                                 constants.BOOLEAN_PROPERTY)
+        if is_directed != getattr(self, "_is_directed", is_directed):
+            Link._arcs_version += 1
         self._is_directed = is_directed
 
     @property
@@ -747,6 +2095,8 @@ class Link:
         if start_point_id < 0:
             raise PropertyError(constants.LINK.START_POINT_ID.value,
                                 constants.GREATER_ZERO_PROPERTY)
+        if start_point_id != getattr(self, "_start_point_id", start_point_id):
+            Link._arcs_version += 1
         self._start_point_id = start_point_id
 
     @property
@@ -763,6 +2113,8 @@ class Link:
         if end_point_id < 0:
             raise PropertyError(constants.LINK.END_POINT_ID.value,
                                 constants.GREATER_ZERO_PROPERTY)
+        if end_point_id != getattr(self, "_end_point_id", end_point_id):
+            Link._arcs_version += 1
         self._end_point_id = end_point_id
 
     @property
@@ -776,6 +2128,7 @@ class Link:
         if not isinstance(distance, (int, float)):
             raise PropertyError(constants.LINK.DISTANCE.value,
                                 constants.NUMBER_PROPERTY)
+        distance = _finite_number(constants.LINK.DISTANCE.value, distance)
         if distance < 0:
             raise PropertyError(constants.LINK.DISTANCE.value,
                                 constants.GREATER_ZERO_PROPERTY)
@@ -792,6 +2145,7 @@ class Link:
         if not isinstance(time, (int, float)):
             raise PropertyError(constants.LINK.TIME.value,
                                 constants.NUMBER_PROPERTY)
+        time = _finite_number(constants.LINK.TIME.value, time)
         if time < 0:
             raise PropertyError(constants.LINK.TIME.value,
                                 constants.GREATER_ZERO_PROPERTY)
@@ -808,6 +2162,7 @@ class Link:
         if not isinstance(fixed_cost, (int, float)):
             raise PropertyError(constants.LINK.FIXED_COST.value,
                                 constants.NUMBER_PROPERTY)
+        fixed_cost = _finite_number(constants.LINK.FIXED_COST.value, fixed_cost)
         self._fixed_cost = fixed_cost
 
     def get_link(self, debug=False):
@@ -832,10 +2187,35 @@ class Link:
         return repr(self.get_link())
 
 
+def _write_through(cls):
+    """Class decorator, the setters of properties write the link in its
+    row of the ArrayLinksDict it was read from"""
+    for name, value in list(vars(Link).items()):
+        if isinstance(value, property) and value.fset is not None:
+            def fset(self, new_value, fset=value.fset):
+                fset(self, new_value)
+                self._links._write_link(self)
+            setattr(cls, name, property(value.fget, fset, value.fdel,
+                                        value.__doc__))
+    return cls
+
+
+@_write_through
+class _ArrayLink(Link):
+    """Link read from an ArrayLinksDict, see :py:class:`ArrayLinksDict`"""
+
+    __slots__ = ("_links", "_row", "_layout")
+
+
+@_invalidate_json
 class Parameters:
     """Define all parameters from model
     """
 
+    __slots__ = ("_time_limit", "_upper_bound", "_heuristic_used",
+                 "_time_limit_heuristic", "_config_file", "_solver_name",
+                 "_print_level", "_action", "_cplex_path", "_json")
+
     def __init__(
             self,
             time_limit=300.0,
@@ -1026,6 +2406,13 @@ class Parameters:
             param[constants.PARAMETERS.PRINT_LEVEL.value] = self.print_level
         return param
 
+    def _json_str(self):
+        """Return the parameters in json format, kept until
+        a property is modified"""
+        if self._json is None:
+            self._json = _dumps(self.get_parameters())
+        return self._json
+
     def __repr__(self):
         return repr(self.get_parameters())
 
@@ -1087,98 +2474,295 @@ class Statistics:
         return repr(self.__json_input)
 
 
+class RoutesArray(collections.Sequence):
+    """Sequence of routes stored in arrays, a :py:class:`Route` is
+    created only when it is accessed.
+
+    The columns are shared by all routes, the points of the route i
+    are at positions offsets[i] to offsets[i + 1]:
+        - vehicle_type_ids(array of int): vehicle type of each route
+        - route_costs(array of float): cost of each route
+        - offsets(array of int): position of the first point of each route
+        - point_ids(array of int): ids of visited points
+        - loads(array of int or float): the loads at each point
+        - end_times(array of int or float): the time at each point
+
+    The loads and the end times are stored in arrays of integers while
+    all values are integers, they are converted in arrays of floats
+    at the first float (bapcod gives floats).
+    """
+
+    __slots__ = ("vehicle_type_ids", "route_costs", "offsets", "point_ids",
+                 "loads", "end_times", "_point_name_ids", "_arc_name_ids",
+                 "_names", "_name_ids_by_name")
+
+    def __init__(self, routes=()):
+        self.vehicle_type_ids = array('i')
+        self.route_costs = array('d')
+        self.offsets = array('q', [0])
+        self.point_ids = array('i')
+        self.loads = array('q')
+        self.end_times = array('q')
+        # names of points and arcs are interned, 0 is the empty name
+        self._point_name_ids = array('i')
+        self._arc_name_ids = array('i')
+        self._names = [str()]
+        self._name_ids_by_name = {str(): 0}
+        for route in routes:
+            for point in route[constants.ROUTE.VISITED_POINTS.value]:
+                self._add_point(point)
+            self._add_route(route)
+
+    def _name_id(self, name):
+        """Return the id of an interned name"""
+        name_id = self._name_ids_by_name.get(name)
+        if name_id is None:
+            name_id = len(self._names)
+            self._names.append(name)
+            self._name_ids_by_name[name] = name_id
+        return name_id
+
+    def _append_number(self, name, value):
+        """Append a number in the column of loads or end times, the
+        column becomes an array of floats at the first float, return
+        the function appending to the column"""
+        column = getattr(self, name)
+        try:
+            column.append(value)
+        except TypeError:
+            column = array('d', column)
+            column.append(value)
+            setattr(self, name, column)
+        return column.append
+
+    def _add_point(self, point):
+        """Add a visited point of the route being decoded"""
+        self.point_ids.append(point[constants.ROUTE.POINT_ID.value])
+        self._append_number("loads", point[constants.ROUTE.LOAD.value])
+        self._append_number("end_times", point[constants.ROUTE.TIME.value])
+        self._point_name_ids.append(
+            self._name_id(point[constants.ROUTE.POINT_NAME.value]))
+        self._arc_name_ids.append(
+            self._name_id(point[constants.ROUTE.INCOMING_ARC_NAME.value]))
+
+    def _add_route(self, route):
+        """Close the route being decoded, its points are already added"""
+        self.vehicle_type_ids.append(
+            route[constants.ROUTE.VEHICLE_TYPE_ID.value])
+        self.route_costs.append(route[constants.ROUTE.ROUTE_COST.value])
+        self.offsets.append(len(self.point_ids))
+
+    def _object_hook(self):
+        """Return a hook of json decoder which stores the visited points
+        and the routes in the arrays instead of dictionaries"""
+        point_id, point_name, load, time, arc_name = (
+            constants.ROUTE.POINT_ID.value, constants.ROUTE.POINT_NAME.value,
+            constants.ROUTE.LOAD.value, constants.ROUTE.TIME.value,
+            constants.ROUTE.INCOMING_ARC_NAME.value)
+        visited_points = constants.ROUTE.VISITED_POINTS.value
+        vehicle_type_id = constants.ROUTE.VEHICLE_TYPE_ID.value
+        route_cost = constants.ROUTE.ROUTE_COST.value
+        add_point_id = self.point_ids.append
+        add_load = self.loads.append
+        add_end_time = self.end_times.append
+        add_point_name = self._point_name_ids.append
+        add_arc_name = self._arc_name_ids.append
+        name_ids = self._name_ids_by_name
+        name_id = self._name_id
+
+        def hook(value):
+            nonlocal add_load, add_end_time
+            if point_id in value:
+                add_point_id(value[point_id])
+                try:
+                    add_load(value[load])
+                except TypeError:
+                    add_load = self._append_number("loads", value[load])
+                try:
+                    add_end_time(value[time])
+                except TypeError:
+                    add_end_time = self._append_number("end_times",
+                                                       value[time])
+                name = value[point_name]
+                add_point_name(name_ids[name] if name in name_ids
+                               else name_id(name))
+                name = value[arc_name]
+                add_arc_name(name_ids[name] if name in name_ids
+                             else name_id(name))
+                return None
+            if visited_points in value:
+                self.vehicle_type_ids.append(value[vehicle_type_id])
+                self.route_costs.append(value[route_cost])
+                self.offsets.append(len(self.point_ids))
+                return None
+            return value
+        return hook
+
+    def _point_names(self, begin, end):
+        return [self._names[i] for i in self._point_name_ids[begin:end]]
+
+    def _arc_names(self, begin, end):
+        return [self._names[i] for i in self._arc_name_ids[begin:end]]
+
+    def __len__(self):
+        return len(self.vehicle_type_ids)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("route index out of range")
+        return Route._from_array(self, index)
+
+    def route(self, index):
+        """Return the route of index in json format"""
+        begin, end = self.offsets[index], self.offsets[index + 1]
+        return {
+            constants.ROUTE.VEHICLE_TYPE_ID.value:
+                self.vehicle_type_ids[index],
+            constants.ROUTE.ROUTE_COST.value: self.route_costs[index],
+            constants.ROUTE.VISITED_POINTS.value: [
+                {constants.ROUTE.INCOMING_ARC_NAME.value: arc_name,
+                 constants.ROUTE.POINT_ID.value: point_id,
+                 constants.ROUTE.POINT_NAME.value: point_name,
+                 constants.ROUTE.TIME.value: end_time,
+                 constants.ROUTE.LOAD.value: load}
+                for arc_name, point_id, point_name, end_time, load in zip(
+                    self._arc_names(begin, end),
+                    self.point_ids[begin:end],
+                    self._point_names(begin, end),
+                    self.end_times[begin:end], self.loads[begin:end])]}
+
+    @property
+    def nbytes(self):
+        """int : number of bytes used by the arrays of routes"""
+        return sum(column.itemsize * len(column) for column in (
+            self.vehicle_type_ids, self.route_costs, self.offsets,
+            self.point_ids, self.loads, self.end_times,
+            self._point_name_ids, self._arc_name_ids))
+
+
+def _decode_output(output):
+    """Decode the output of bapcod in json format, the routes are
+    stored in a :py:class:`RoutesArray` instead of dictionaries.
+    Return the output without routes and the routes"""
+    routes = RoutesArray()
+    json_output = json.loads(output, object_hook=routes._object_hook())
+    solution = json_output.get("Solution")
+    if solution is not None and "Routes" in solution:
+        del solution["Routes"]
+    return json_output, routes
+
+
 class Route:
-    """Define a route from solution"""
+    """Define a route from solution.
+
+    The visited points are read from the arrays of the solution
+    when a property is accessed"""
+
+    __slots__ = ("__routes", "__index")
 
     def __init__(self, json_input):
-        self.__route = json_input
-        self.__vehicle_type_id = json_input[constants.ROUTE.VEHICLE_TYPE_ID.value]
-        self.__route_cost = json_input[constants.ROUTE.ROUTE_COST.value]
-        self.__point_ids = []
-        self.__point_names = []
-        self.__cap_consumption = []
-        self.__time_consumption = []
-        self.__incoming_arc_names = []
-        for point in json_input[constants.ROUTE.VISITED_POINTS.value]:
-            self.__point_ids.append(point[constants.ROUTE.POINT_ID.value])
-            self.__point_names.append(point[constants.ROUTE.POINT_NAME.value])
-            self.__cap_consumption.append(point[constants.ROUTE.LOAD.value])
-            self.__time_consumption.append(point[constants.ROUTE.TIME.value])
-            self.__incoming_arc_names.append(point[
-                constants.ROUTE.INCOMING_ARC_NAME.value])
+        self.__routes = RoutesArray((json_input,))
+        self.__index = 0
+
+    @classmethod
+    def _from_array(cls, routes, index):
+        """Return the route of index in routes without copy"""
+        route = cls.__new__(cls)
+        route.__routes = routes
+        route.__index = index
+        return route
+
+    def __points(self, column):
+        """Return the values of a column for the visited points"""
+        return column[self.__routes.offsets[self.__index]:
+                      self.__routes.offsets[self.__index + 1]].tolist()
 
     @property
     def route(self):
         """str : formatted string to print route in json format"""
-        return self.__route
+        return self.__routes.route(self.__index)
 
     @property
     def vehicle_type_id(self):
         """int : id of vehicle type making the trip"""
-        return self.__vehicle_type_id
+        return self.__routes.vehicle_type_ids[self.__index]
 
     @property
     def route_cost(self):
         """float : cost incurred by variable and fixed costs"""
-        return self.__route_cost
+        return self.__routes.route_costs[self.__index]
 
     @property
     def point_ids(self):
         """list(int) : if of each point visited"""
-        return self.__point_ids
+        return self.__points(self.__routes.point_ids)
 
     @property
     def point_names(self):
         """list(str) : names of visited points"""
-        return self.__point_names
+        return self.__routes._point_names(
+            self.__routes.offsets[self.__index],
+            self.__routes.offsets[self.__index + 1])
 
     @property
     def cap_consumption(self):
-        """list(float) : the loads at each point """
-        return self.__cap_consumption
+        """list(float) : the loads at each point (int if all loads
+        of the solution are integers)"""
+        return self.__points(self.__routes.loads)
 
     @property
     def time_consumption(self):
-        """list(float) : the time at each point"""
-        return self.__time_consumption
+        """list(float) : the time at each point (int if all times
+        of the solution are integers)"""
+        return self.__points(self.__routes.end_times)
 
     @property
     def incoming_arc_names(self):
         """list(str) : the names of incoming arc"""
-        return self.__incoming_arc_names
-    
+        return self.__routes._arc_names(
+            self.__routes.offsets[self.__index],
+            self.__routes.offsets[self.__index + 1])
+
     def __str__(self):
         route_str = ""
-        time_is_used = sum(self.__time_consumption) > 0
-        capacity_is_used = sum(self.__cap_consumption) > 0
-        name_is_used = all(i != "" for i in self.__point_names)
-        if (len(self.__point_ids))>0 :
-            id_veh = self.__vehicle_type_id
+        point_ids = self.point_ids
+        point_names = self.point_names
+        time_consumption = self.time_consumption
+        cap_consumption = self.cap_consumption
+        time_is_used = sum(time_consumption) > 0
+        capacity_is_used = sum(cap_consumption) > 0
+        name_is_used = all(i != "" for i in point_names)
+        if (len(point_ids))>0 :
+            id_veh = self.vehicle_type_id
             route_str += 'Route for vehicle ' + str(id_veh) + ':\n'
-            route_str += ' ID : ' + str(self.__point_ids[0])
-            for i in range (1,len(self.__point_ids)):
-                route_str +=' --> ' + str(self.__point_ids[i]) 
+            route_str += ' ID : ' + str(point_ids[0])
+            for i in range (1,len(point_ids)):
+                route_str +=' --> ' + str(point_ids[i]) 
             
             if name_is_used:
                 route_str += '\n'
-                route_str += ' Name : ' + str(self.__point_names[0])
-                for i in range (1,len(self.__point_names)):
-                    route_str +=' --> ' + str(self.__point_names[i]) 
+                route_str += ' Name : ' + str(point_names[0])
+                for i in range (1,len(point_names)):
+                    route_str +=' --> ' + str(point_names[i]) 
 
             if time_is_used:
                 route_str += '\n'
-                route_str += ' End time : ' + str(self.__time_consumption[0])
-                for i in range (1,len(self.__time_consumption)):
-                    route_str += ' --> ' + str(self.__time_consumption[i]) 
+                route_str += ' End time : ' + str(time_consumption[0])
+                for i in range (1,len(time_consumption)):
+                    route_str += ' --> ' + str(time_consumption[i]) 
             
             if capacity_is_used:
                 route_str += '\n'
-                route_str += ' Load : ' + str(self.__cap_consumption[0])
-                for i in range (1,len(self.__cap_consumption)):
-                    route_str += ' --> ' + str(self.__cap_consumption[i]) 
+                route_str += ' Load : ' + str(cap_consumption[0])
+                for i in range (1,len(cap_consumption)):
+                    route_str += ' --> ' + str(cap_consumption[i]) 
 
-            if self.__route_cost != 0 :
-                route_str += "\nTotal cost : " + str(self.__route_cost) 
+            if self.route_cost != 0 :
+                route_str += "\nTotal cost : " + str(self.route_cost) 
             route_str += '\n \n'
         return route_str
 
@@ -1187,12 +2771,20 @@ class Route:
 
 
 class Solution:
-    """Contains all elements of solution after running model.solve()."""
+    """Contains all elements of solution after running model.solve().
 
-    def __init__(self, json_input=None, status=constants.MODEL_NOT_SOLVED):
+    The routes are stored in a :py:class:`RoutesArray`, given by routes
+    when json_input is the output decoded without routes. The links
+    of the model give the total distance of routes, computed when the
+    solution is built (the links can be modified afterwards)."""
+
+    def __init__(self, json_input=None, status=constants.MODEL_NOT_SOLVED,
+                 routes=None, links=None):
         self.__json = {}
-        self.__routes = []
+        self.__routes = RoutesArray()
+        self.__routes_list = None
         self.__value = 0
+        self.__total_distance = None
 
         if json_input != None:
             self.__json = json_input
@@ -1200,10 +2792,11 @@ class Solution:
                 self.__value = self.__json["Solution"][
                                         constants.STATISTICS.
                                         SOLUTION_VALUE.value]
-                if len(self.__json["Solution"]["Routes"]) > 0:
-                    for route in self.__json["Solution"]["Routes"]:
-                        self.__routes.append(Route(route))
-
+                if routes is None:
+                    routes = RoutesArray(self.__json["Solution"]["Routes"])
+                self.__routes = routes
+        if links is not None:
+            self.__total_distance = _routes_distance(self.__routes, links)
 
     def __str__(self):
         route_str =f'\nSolution cost : {self.__value} \n \n'
@@ -1216,21 +2809,62 @@ class Solution:
 
     def is_defined(self):
         """ return true if a solution is defined"""
-        return self.__routes != []
+        return len(self.__routes) > 0
 
     @property
     def value(self):
         """float : return the total cost of the solution"""
         return self.__value
 
+    @property
+    def num_routes(self):
+        """int : number of routes"""
+        return len(self.__routes)
+
+    @property
+    def vehicle_type_counts(self):
+        """dict : number of routes of each vehicle type id"""
+        counts = {}
+        for vehicle_type_id in self.__routes.vehicle_type_ids:
+            counts[vehicle_type_id] = counts.get(vehicle_type_id, 0) + 1
+        return counts
+
+    @property
+    def total_distance(self):
+        """float : total distance of routes, computed with the links of
+        the model when the solution was built, None if the links are not
+        known or if an arc of a route has no link. Each arc takes the
+        link with the name of the incoming arc given by bapcod, between
+        parallel links with the same name the shortest one is taken, the
+        value is then a lower bound of the distance travelled"""
+        return self.__total_distance
+
     @property
     def json(self):
-        """str : formatted string to print statistics in json format"""
+        """dict : output of the solver in json format, it's kept if the
+        model is solved with keep_json=True, otherwise the routes
+        are rebuilt from the arrays at each access"""
+        if "Solution" in self.__json and \
+                "Routes" not in self.__json["Solution"]:
+            json_output = dict(self.__json)
+            json_output["Solution"] = dict(self.__json["Solution"])
+            json_output["Solution"]["Routes"] = [
+                self.__routes.route(i) for i in range(len(self.__routes))]
+            return json_output
         return self.__json
 
     @property
     def routes(self):
-        """list(Route) : contains the set of routes"""
+        """list(Route) : contains the set of routes, built at the first
+        access, each route reads its points in routes_array"""
+        if self.__routes_list is None:
+            self.__routes_list = list(self.__routes)
+        return self.__routes_list
+
+    @property
+    def routes_array(self):
+        """RoutesArray : the routes stored in arrays, a route is created
+        when it is accessed"""
         return self.__routes
 
     def export(self, name="instance"):
@@ -1239,21 +2873,154 @@ class Solution:
         with open(name + ".json", "w") as outfile:
             outfile.write(json.dumps(self.json, indent=1))
 
+    @classmethod
+    def from_json(cls, source, links=None):
+        """Import a solution exported by :py:meth:`Solution.export`, from
+        a file or from bytes (the output of the solver for example).
+
+        Additional informations:
+            - the routes are decoded directly in a :py:class:`RoutesArray`
+              without dictionaries
+            - links : links of the model used to compute the total
+              distance of routes"""
+        try:
+            if isinstance(source, (bytes, bytearray, memoryview)):
+                output = bytes(source)
+            else:
+                with open(source, "rb") as file:
+                    output = file.read()
+            json_input, routes = _decode_output(output.rstrip(b"\0"))
+            status = json_input["Status"]["code"] \
+                if "Status" in json_input else constants.MODEL_NOT_SOLVED
+        except (ValueError, TypeError, KeyError):
+            raise ModelError(constants.READ_JSON_ERROR)
+        if not json_input:
+            return cls(links=links)
+        return cls(json_input, status, routes, links)
+
+
+class _CustomerClusters:
+    """Index of the points of each customer (id_customer), the points of
+    a customer are alternative locations sharing the same penalty.
+
+    The penalty of a customer is kept once and given to its points
+    when the model is serialized, only for the customers modified
+    since the last time."""
+
+    __slots__ = ("_point_ids", "_penalties", "_modified")
+
+    def __init__(self, points=()):
+        # ordered sets of point ids by customer
+        self._point_ids = {}
+        self._penalties = {}
+        self._modified = set()
+        self.update((point._id_customer for point in points),
+                    (point._id for point in points),
+                    (point._penalty_or_cost for point in points))
+        # the penalties of existing points are not changed
+        self._modified.clear()
+
+    def __contains__(self, id_customer):
+        return id_customer in self._point_ids
+
+    def __len__(self):
+        return len(self._point_ids)
+
+    def __iter__(self):
+        return iter(self._point_ids)
+
+    def point_ids(self, id_customer):
+        """Return the ids of points of a customer"""
+        return list(self._point_ids.get(id_customer, ()))
+
+    def penalty(self, id_customer):
+        """Return the penalty of a customer"""
+        return self._penalties[id_customer]
+
+    def add(self, id_customer, point_id, penalty):
+        """Add a point to a customer, a penalty different of 0 becomes
+        the penalty of all points of the customer, otherwise the point
+        takes the penalty of the customer"""
+        if id_customer <= 0:
+            return
+        point_ids = self._point_ids.get(id_customer)
+        if point_ids is None:
+            self._point_ids[id_customer] = {point_id: None}
+            self._penalties[id_customer] = penalty
+            return
+        point_ids[point_id] = None
+        if penalty != 0:
+            self._penalties[id_customer] = penalty
+        self._modified.add(id_customer)
+
+    def update(self, id_customers, point_ids, penalties):
+        """Add points to customers (see add)"""
+        customers_point_ids = self._point_ids
+        customers_penalties = self._penalties
+        for id_customer, point_id, penalty in zip(id_customers, point_ids,
+                                                  penalties):
+            if id_customer <= 0:
+                continue
+            customer_point_ids = customers_point_ids.get(id_customer)
+            if customer_point_ids is None:
+                customers_point_ids[id_customer] = {point_id: None}
+                customers_penalties[id_customer] = penalty
+            else:
+                self.add(id_customer, point_id, penalty)
+
+    def discard(self, id_customer, point_id):
+        """Remove a point from a customer, the customer is removed
+        with its last point"""
+        point_ids = self._point_ids.get(id_customer)
+        if point_ids is None:
+            return
+        point_ids.pop(point_id, None)
+        if not point_ids:
+            del self._point_ids[id_customer]
+            del self._penalties[id_customer]
+            self._modified.discard(id_customer)
+
+    def discard_many(self, id_customers, point_ids):
+        """Remove points from customers (see discard)"""
+        for id_customer, point_id in zip(id_customers, point_ids):
+            self.discard(id_customer, point_id)
+
+    def resolve(self, points):
+        """Give the penalty of the customers modified to their points"""
+        for id_customer in self._modified:
+            penalty = self._penalties[id_customer]
+            for point_id in self._point_ids[id_customer]:
+                point = points.get(point_id)
+                if point is not None and point._penalty_or_cost != penalty:
+                    point._penalty_or_cost = penalty
+                    point._json = None
+        self._modified.clear()
+
 
 class Model:
-    """Define a routing model."""
+    """Define a routing model.
 
-    def __init__(self):
+    If array_links is True, links are stored in :py:class:`ArrayLinksDict`
+    which uses much less memory for large graphs.
+    """
+
+    def __init__(self, array_links=False):
         self.__json = {}
+        self.__vehicle_type_depots = {}
+        # adjacency index and the links (with their version) indexed
+        self.__adjacency = None
+        self.__adjacency_links = None
+        self.__adjacency_version = None
         self.vehicle_types = VehicleTypesDict()
         self.points = PointsDict()
-        self.__customers = dict()
-        self.links = LinksDict()
+        self.links = ArrayLinksDict() if array_links else LinksDict()
         self.max_total_vehicles_number = 10000
         self.parameters = Parameters()
         self.__output = str()
         self.solution = Solution()
         self.statistics = Statistics()
+        self.preprocessing = None
+        self.warm_start = None
         self.status = int(constants.MODEL_NOT_SOLVED)
         self.message = constants.ERRORS_MODEL[self.status]
 
@@ -1281,6 +3048,11 @@ class Model:
             raise PropertyError(constants.JSON_OBJECT.VEHICLE_TYPES.value,
                                 constants.LIST_INTEGER_PROPERTY)
         self._vehicle_types = vehicle_types
+        self.__vehicle_type_depots = {
+            vehicle_type._id: (vehicle_type._start_point_id,
+                               vehicle_type._end_point_id)
+            for vehicle_type in dict.values(vehicle_types)}
+        self.__depots_checked = False
 
     @property
     def points(self):
@@ -1301,20 +3073,84 @@ class Model:
         if not isinstance(points, (PointsDict)):
             raise PropertyError(constants.JSON_OBJECT.POINTS.value, 0)
         self._points = points
+        self.__added_vehicle_types = {}
+        self.__index_points()
+
+    def __index_points(self):
+        """Build the indexes of depots and customers of the points"""
+        points = self.points
+        self.__depots = {id for id, point in dict.items(points)
+                            if point._id_customer == 0}
+        self.__depots_checked = False
+        self.__customers = _CustomerClusters(list(dict.values(points)))
+        self.__points_version = (points._version,
+                                 Point._id_customers_version)
+
+    def __sync_points(self):
+        """Build again the indexes of points if points were set or deleted
+        in the dictionary or an id_customer was modified, otherwise than
+        by the functions of the model"""
+        if self.__points_version != (self.points._version,
+                                     Point._id_customers_version):
+            self.__index_points()
+
+    def __points_modified(self, synced):
+        """Keep the indexes of points up to date after a modification of
+        the points by a function of the model which updates them, if
+        they were up to date before"""
+        if synced:
+            self.__points_version = (self.points._version,
+                                     Point._id_customers_version)
 
     @property
     def links(self):
-        """contains the set of links"""
+        """contains the set of links
+
+            Type:
+                - LinksDict : dictionary of lists of links by key
+                  (start point id, end point id)
+                - ArrayLinksDict : same dictionary with links stored
+                  in arrays
+        """
         return self._links
 
     # a setter function of links
     @links.setter
     def links(self, links):
         """setter function of links"""
-        if not isinstance(links, (LinksDict)):
+        if not isinstance(links, (LinksDict, ArrayLinksDict)):
             raise PropertyError(constants.JSON_OBJECT.LINKS.value, 0)
         self._links = links
 
+    @property
+    def adjacency(self):
+        """:py:class:`AdjacencyIndex` : arcs of the links by point, built
+        again only if the links were modified otherwise than by
+        :py:meth:`add_link` and :py:meth:`delete_link`"""
+        adjacency = self.__synced_adjacency()
+        if adjacency is None:
+            start_point_ids, end_point_ids, is_directed, _ = \
+                self.__link_rows()
+            adjacency = AdjacencyIndex(start_point_ids, end_point_ids,
+                                       is_directed)
+            self.__adjacency = adjacency
+            self.__adjacency_links = self.links
+            self.__adjacency_version = self.__links_version()
+        return adjacency
+
+    def __synced_adjacency(self):
+        """Return the adjacency index if it's up to date with the links,
+        None otherwise"""
+        if self.__adjacency_links is self.links and \
+                self.__adjacency_version == self.__links_version():
+            return self.__adjacency
+        return None
+
+    def __links_version(self):
+        """Return the numbers of modifications of the links dictionary
+        and of the points or is_directed of all links"""
+        return self.links._version, Link._arcs_version
+
     @property
     def max_total_vehicles_number(self):
         """the maximum total vehicles number"""
@@ -1400,12 +3236,65 @@ class Model:
             max_number,
             tw_begin,
             tw_end)
+        self.__vehicle_type_depots[id] = (start_point_id, end_point_id)
+        self.__depots_checked = False
+
+    def add_vehicle_types(self, ids, start_point_ids=None, end_point_ids=None,
+                          names=None, capacities=None, fixed_costs=None,
+                          var_costs_dist=None, var_costs_time=None,
+                          max_numbers=None, tw_begins=None, tw_ends=None):
+        """Add vehicle types given by columns (lists or arrays) with one
+           value for each id, a column not given takes the default value
+           of :py:meth:`add_vehicle_type`.
+
+           All columns are checked before and a :py:class:`BulkError`
+           gives all the invalid values, no vehicle type is added then"""
+        errors = []
+        ids = self.__checked_ids(errors, ids, self.vehicle_types,
+                                 constants.ADD_VEHICLE_TYPE_ERROR,
+                                 1)
+        size = len(ids)
+        start_point_ids = _checked_column(errors, "start_point_ids",
+                                          start_point_ids, size, -1,
+                                          (int,), -1)
+        end_point_ids = _checked_column(errors, "end_point_ids",
+                                        end_point_ids, size, -1,
+                                        (int,), -1)
+        names = _checked_column(errors, "names", names, size, str(),
+                                (str,))
+        capacities = _checked_column(errors, "capacities", capacities, size,
+                                     0, (int,), 0)
+        fixed_costs = _checked_column(errors, "fixed_costs", fixed_costs,
+                                      size, 0.0, _NUMBER_TYPES)
+        var_costs_dist = _checked_column(errors, "var_costs_dist",
+                                         var_costs_dist, size, 0.0,
+                                         _NUMBER_TYPES)
+        var_costs_time = _checked_column(errors, "var_costs_time",
+                                         var_costs_time, size, 0.0,
+                                         _NUMBER_TYPES)
+        max_numbers = _checked_column(errors, "max_numbers", max_numbers,
+                                      size, 1, (int,), 0)
+        tw_begins = _checked_column(errors, "tw_begins", tw_begins, size,
+                                    0.0, _NUMBER_TYPES)
+        tw_ends = _checked_column(errors, "tw_ends", tw_ends, size, 0.0,
+                                  _NUMBER_TYPES)
+        if errors:
+            raise BulkError(errors)
+        dict.update(self.vehicle_types, zip(ids, map(
+            VehicleType, ids, start_point_ids, end_point_ids, names,
+            capacities, fixed_costs, var_costs_dist, var_costs_time,
+            max_numbers, tw_begins, tw_ends)))
+        self.__vehicle_type_depots.update(
+            zip(ids, zip(start_point_ids, end_point_ids)))
+        self.__depots_checked = False
 
     def delete_vehicle_type(self, id: int):
         """ Delete a vehicle type by giving his id """
         if id not in self.vehicle_types:
             raise ModelError(constants.DEL_VEHICLE_TYPE_ERROR)
         del self.vehicle_types[id]
+        self.__vehicle_type_depots.pop(id, None)
+        self.__depots_checked = False
 
     def add_link(
             self,
@@ -1417,49 +3306,646 @@ class Model:
             time=0.0,
             fixed_cost=0.0):
         """Add Link in dictionary :py:attr:`links`"""
-        if (start_point_id,end_point_id) in self.links : 
-            self.links[(start_point_id,end_point_id)].append(Link(
-                start_point_id,
-                end_point_id,
-                name,
-                is_directed,
-                distance,
-                time,
-                fixed_cost))
-        else :
-            self.links[(start_point_id,end_point_id)] = [Link(
-                start_point_id,
-                end_point_id,  
-                name,
-                is_directed,
-                distance,
-                time,
-                fixed_cost)]
-                
+        link = Link(
+            start_point_id,
+            end_point_id,
+            name,
+            is_directed,
+            distance,
+            time,
+            fixed_cost)
+        adjacency = self.__synced_adjacency()
+        self.links.add(link)
+        if adjacency is not None:
+            adjacency.add(link._start_point_id, link._end_point_id,
+                          link._is_directed)
+            self.__adjacency_version = self.__links_version()
+
+    def add_links_from_matrix(
+            self,
+            distance,
+            time=None,
+            fixed_cost=None,
+            symmetric=True,
+            sparsity_mask=None,
+            point_ids=None):
+        """Add all links given by a matrix of distances (list of lists or
+           list of arrays) in one pass, without building objects Link.
+
+           Additional informations:
+               - time, fixed_cost : matrices of the same size
+               - symmetric : if True, only the upper triangle is read and
+                 links are not directed, otherwise each pair (i, j) gives
+                 a directed link
+               - sparsity_mask : matrix of booleans, only entries equal to
+                 True give a link
+               - point_ids : id of the point of each row, by default the
+                 index of the row
+               - links are stored in :py:class:`ArrayLinksDict`, the links
+                 already defined are moved in it. The objects Link are
+                 built again at each read of model.links[key], the values
+                 set in a link read (model.links[key][0].distance = x)
+                 are written in the arrays"""
+        matrices = [_check_matrix(distance, constants.LINK.DISTANCE.value)]
+        size = len(matrices[0])
+        for matrix, name, non_negative in (
+                (time, constants.LINK.TIME.value, True),
+                (fixed_cost, constants.LINK.FIXED_COST.value, False)):
+            matrices.append(None if matrix is None else
+                            _check_matrix(matrix, name, size, non_negative))
+        if sparsity_mask is not None:
+            sparsity_mask = _as_rows(sparsity_mask)
+            if len(sparsity_mask) != size or \
+                    any(len(row) != size for row in sparsity_mask):
+                raise PropertyError("sparsity_mask", constants.MATRIX_PROPERTY)
+        if point_ids is None:
+            point_ids = array('i', range(size))
+        else:
+            point_ids = _as_list(point_ids)
+            if len(point_ids) != size:
+                raise PropertyError("point_ids", constants.MATRIX_PROPERTY)
+            if not all(isinstance(id, int) and id >= 0 for id in point_ids):
+                raise PropertyError("point_ids",
+                                    constants.LIST_INTEGER_PROPERTY)
+            point_ids = array('i', point_ids)
+
+        if not isinstance(self.links, ArrayLinksDict):
+            self.links = ArrayLinksDict(self.links)
+
+        for i in range(size):
+            # columns of the row i giving a link
+            if sparsity_mask is None:
+                first = i + 1 if symmetric else 0
+                rows = [None if matrix is None else
+                        matrix[i][first:i] + matrix[i][i + 1:]
+                        for matrix in matrices]
+                end_point_ids = point_ids[first:i] + point_ids[i + 1:]
+            else:
+                columns = [j for j in range(size) if sparsity_mask[i][j] and
+                           (j > i or (j < i and not symmetric))]
+                rows = [None if matrix is None else
+                        array('d', (matrix[i][j] for j in columns))
+                        for matrix in matrices]
+                end_point_ids = array('i', (point_ids[j] for j in columns))
+            self.links.extend(_filled('i', point_ids[i], len(end_point_ids)),
+                              end_point_ids, rows[0], rows[1], rows[2],
+                              is_directed=not symmetric)
+
+    def __max_capacity(self, point_i, point_j, capacities):
+        """Return the maximal capacity of vehicle types compatible
+        with two points"""
+        incompatible = (tuple(point_i._incompatible_vehicles),
+                        tuple(point_j._incompatible_vehicles))
+        capacity = capacities.get(incompatible)
+        if capacity is None:
+            capacity = capacities[incompatible] = max(
+                (vehicle_type._capacity for vehicle_type in
+                 dict.values(self.vehicle_types)
+                 if vehicle_type._id not in incompatible[0] and
+                 vehicle_type._id not in incompatible[1]), default=0)
+        return capacity
+
+    @staticmethod
+    def __reachable(point_i, point_j, time):
+        """Return True if the point j can be served after the point i
+        in their time windows, the service ends at
+        max(tw_begin, arrival time) + service_time"""
+        return (max(point_j._tw_begin,
+                    point_i._tw_begin + point_i._service_time + time) +
+                point_j._service_time <= point_j._tw_end + _TIME_TOLERANCE)
+
+    def __depot_ids(self):
+        """Return the ids of depots and of points where vehicles
+        start or end their routes"""
+        depot_ids = {point._id for point in dict.values(self.points)
+                     if point._id_customer == 0}
+        for vehicle_type in dict.values(self.vehicle_types):
+            depot_ids.update((vehicle_type._start_point_id,
+                              vehicle_type._end_point_id))
+        return depot_ids
+
+    def __infeasible_rows(self, start_point_ids, end_point_ids, directed,
+                          times, depot_ids, kept, reasons):
+        """Set in reasons the reason of removal of links between customers
+        which cannot be used by any vehicle (capacity or time windows),
+        the rows kept are not checked"""
+        capacities = {}
+        points = self.points
+        for row, (start_point_id, end_point_id, is_directed, link_time) in \
+                enumerate(zip(start_point_ids, end_point_ids, directed,
+                              times)):
+            point_i = points.get(start_point_id)
+            point_j = points.get(end_point_id)
+            if kept[row] or point_i is None or point_j is None or \
+                    start_point_id in depot_ids or \
+                    end_point_id in depot_ids:
+                continue
+            if point_i._demand + point_j._demand > \
+                    self.__max_capacity(point_i, point_j, capacities):
+                reasons[row] = "removed_capacity"
+            elif not (self.__reachable(point_i, point_j, link_time) or
+                      (not is_directed and
+                       self.__reachable(point_j, point_i, link_time))):
+                reasons[row] = "removed_time_windows"
+
+    def sparsify_links(self, k=None, keep=None, remove_infeasible=True):
+        """Remove the links which are useless or rarely used by the
+           solutions, links are stored in :py:class:`ArrayLinksDict`.
+           Return a report (dict) with the number of links removed for
+           each reason and the size of links in json format before and
+           after.
+
+           Additional informations:
+               - k : each point keeps the links to its k nearest neighbors
+                 (by distance), all links of depots are kept.
+                 If k is None, links are removed only if they are infeasible
+               - keep : list of (start point id, end point id) of links
+                 always kept
+               - remove_infeasible : remove the links between customers
+                 whose demands exceed the capacity of all compatible vehicle
+                 types or which cannot be used in the time windows
+                 (with tw_begin, service_time, time of link and tw_end)"""
+        if not isinstance(self.links, ArrayLinksDict):
+            self.links = ArrayLinksDict(self.links)
+        links = self.links
+        links.compact()
+        report = {"links_before": len(links._start_point_ids),
+                  "json_bytes_before": links._json_size(),
+                  "nbytes_before": links.nbytes,
+                  "removed_capacity": 0,
+                  "removed_time_windows": 0,
+                  "removed_neighbors": 0}
+        start_point_ids = links._start_point_ids
+        end_point_ids = links._end_point_ids
+        depot_ids = self.__depot_ids()
+        keep = set() if keep is None else set(map(tuple, keep))
+        kept = [key in keep or key[::-1] in keep
+                for key in zip(start_point_ids, end_point_ids)]
+        reasons = [None] * len(kept)
+
+        if remove_infeasible:
+            self.__infeasible_rows(start_point_ids, end_point_ids,
+                                   links._directed_rows(), links._times,
+                                   depot_ids, kept, reasons)
+
+        if k is not None:
+            if k < 0:
+                raise PropertyError("k", constants.GREATER_ZERO_PROPERTY)
+            rows_by_point = {}
+            for row, (start_point_id, end_point_id) in \
+                    enumerate(zip(start_point_ids, end_point_ids)):
+                if reasons[row] is None:
+                    rows_by_point.setdefault(start_point_id, []).append(row)
+                    rows_by_point.setdefault(end_point_id, []).append(row)
+            nearest = bytearray(len(kept))
+            for point_id, rows in rows_by_point.items():
+                if point_id in depot_ids:
+                    nearest_rows = rows
+                else:
+                    nearest_rows = heapq.nsmallest(
+                        k, rows, key=links._distances.__getitem__)
+                for row in nearest_rows:
+                    nearest[row] = 1
+            for row in range(len(kept)):
+                if reasons[row] is None and not nearest[row] \
+                        and not kept[row]:
+                    reasons[row] = "removed_neighbors"
+
+        removed = [row for row, reason in enumerate(reasons)
+                   if reason is not None]
+        for row in removed:
+            report[reasons[row]] += 1
+        links.delete_rows(removed)
+        report["links_after"] = len(links._start_point_ids)
+        report["json_bytes_after"] = links._json_size()
+        report["json_bytes_saved"] = (report["json_bytes_before"] -
+                                      report["json_bytes_after"])
+        report["nbytes_after"] = links.nbytes
+        return report
+
+    def __link_rows(self):
+        """Return the columns (start point ids, end point ids, is_directed,
+        times) of links, one row by link in the order of delete_rows"""
+        links = self.links
+        if isinstance(links, ArrayLinksDict):
+            links.compact()
+            return (links._start_point_ids, links._end_point_ids,
+                    list(links._directed_rows()), links._times)
+        rows = [link for list_ in dict.values(links) for link in list_]
+        return ([link._start_point_id for link in rows],
+                [link._end_point_id for link in rows],
+                [link._is_directed for link in rows],
+                [link._time for link in rows])
+
+    def _link_table(self):
+        """Return the columns (start point ids, end point ids, is_directed,
+        distances, times, fixed costs) of links, one row by link"""
+        links = self.links
+        if isinstance(links, ArrayLinksDict):
+            links.compact()
+            return (links._start_point_ids, links._end_point_ids,
+                    list(links._directed_rows()), links._distances,
+                    links._times, links._fixed_costs)
+        rows = [link for list_ in dict.values(links) for link in list_]
+        return ([link._start_point_id for link in rows],
+                [link._end_point_id for link in rows],
+                [link._is_directed for link in rows],
+                [link._distance for link in rows],
+                [link._time for link in rows],
+                [link._fixed_cost for link in rows])
+
+    def __earliest_ends(self, successors, start_point_ids):
+        """Return the earliest end of service at each customer reachable
+        from the start points (shortest paths on the times of links),
+        successors gives for each point the list of (point id, time)"""
+        points = self.points
+        ends = {}
+        heap = [(points[id]._tw_begin, id) for id in start_point_ids
+                if id in points]
+        heapq.heapify(heap)
+        while heap:
+            end, id = heapq.heappop(heap)
+            if id in ends:
+                continue
+            ends[id] = end
+            for next_id, link_time in successors.get(id, ()):
+                point = points[next_id]
+                if next_id in ends or point._id_customer == 0:
+                    continue
+                next_end = max(point._tw_begin, end + link_time) + \
+                    point._service_time
+                if next_end <= point._tw_end + _TIME_TOLERANCE:
+                    heapq.heappush(heap, (next_end, next_id))
+        return ends
+
+    def __latest_ends(self, predecessors, end_point_ids):
+        """Return the latest end of service at each customer from which
+        an end point can be reached in time (longest waiting allowed),
+        predecessors gives for each point the list of (point id, time)"""
+        points = self.points
+        ends = {}
+        heap = [(-points[id]._tw_end, id)
+                for id in end_point_ids if id in points]
+        heapq.heapify(heap)
+        while heap:
+            end, id = heapq.heappop(heap)
+            if id in ends:
+                continue
+            ends[id] = end = -end
+            point = points[id]
+            arrival = end - point._service_time if point._id_customer \
+                else end
+            for previous_id, link_time in predecessors.get(id, ()):
+                previous = points[previous_id]
+                if previous_id in ends or previous._id_customer == 0:
+                    continue
+                previous_end = min(arrival - link_time, previous._tw_end)
+                if previous._tw_begin + previous._service_time <= \
+                        previous_end + _TIME_TOLERANCE:
+                    heapq.heappush(heap, (-previous_end, previous_id))
+        return ends
+
+    def preprocess(self, remove_links=True):
+        """Reduce the model given to bapcod without changing its solutions
+           and return a report (dict) of the changes, it's applied by
+           :py:meth:`Model.solve` with preprocess=True.
+
+           Additional informations:
+               - the model is modified in place, the changes below are
+                 not undone after the resolution
+               - the vehicle types whose capacity is less than the demand
+                 of a customer are added to its incompatible vehicles
+               - the time windows of customers are tightened with the
+                 earliest end of service from the start points of vehicles
+                 and the latest end of service allowing to reach their
+                 end points, computed by shortest paths on times of links.
+                 Every tw_end is a bound, a tw_end equal to 0 is a time
+                 window closed at 0 as in bapcod
+               - remove_links : remove the links between customers which
+                 cannot be used by any vehicle (capacity or time windows)
+               - the customers without penalty which cannot be served
+                 are given in infeasible_customers, the model is then
+                 infeasible
+               - times gives the duration in seconds of each step"""
+        started = time.perf_counter()
+        self.__sync_points()
+        self.__customers.resolve(self.points)
+        report = {"incompatibilities_added": 0,
+                  "time_windows_tightened": 0,
+                  "removed_capacity": 0,
+                  "removed_time_windows": 0,
+                  "infeasible_customers": [],
+                  "times": {}}
+        points = self.points
+        vehicle_types = list(dict.values(self.vehicle_types))
+        customers = [point for point in dict.values(points)
+                     if point._id_customer > 0]
+        infeasible = []
+
+        # the vehicle types too small are incompatible with a customer
+        for point in customers:
+            incompatible = point._incompatible_vehicles
+            too_small = [vehicle_type._id for vehicle_type in vehicle_types
+                         if vehicle_type._capacity < point._demand and
+                         vehicle_type._id not in incompatible]
+            if too_small:
+                point.incompatible_vehicles = incompatible + too_small
+                report["incompatibilities_added"] += len(too_small)
+            incompatible = set(point._incompatible_vehicles)
+            if all(vehicle_type._id in incompatible
+                   for vehicle_type in vehicle_types):
+                infeasible.append(point)
+        step = time.perf_counter()
+        report["times"]["incompatibilities"] = step - started
+
+        # time windows from the earliest and latest ends of service
+        start_point_ids, end_point_ids, directed, times = self.__link_rows()
+        successors = {}
+        predecessors = {}
+        for start_point_id, end_point_id, is_directed, link_time in \
+                zip(start_point_ids, end_point_ids, directed, times):
+            if start_point_id in points and end_point_id in points:
+                successors.setdefault(start_point_id, []).append(
+                    (end_point_id, link_time))
+                predecessors.setdefault(end_point_id, []).append(
+                    (start_point_id, link_time))
+                if not is_directed:
+                    successors.setdefault(end_point_id, []).append(
+                        (start_point_id, link_time))
+                    predecessors.setdefault(start_point_id, []).append(
+                        (end_point_id, link_time))
+        # a vehicle without start or end point can begin or finish anywhere
+        earliest = latest = None
+        if vehicle_types and all(vehicle_type._start_point_id >= 0
+                                 for vehicle_type in vehicle_types):
+            earliest = self.__earliest_ends(
+                successors, {vehicle_type._start_point_id
+                             for vehicle_type in vehicle_types})
+        if vehicle_types and all(vehicle_type._end_point_id >= 0
+                                 for vehicle_type in vehicle_types):
+            latest = self.__latest_ends(
+                predecessors, {vehicle_type._end_point_id
+                               for vehicle_type in vehicle_types})
+        for point in customers:
+            service_time = point._service_time
+            earliest_end = point._tw_begin + service_time \
+                if earliest is None else earliest.get(point._id, math.inf)
+            # tw_end is a real bound, even if it's 0
+            latest_end = point._tw_end \
+                if latest is None else latest.get(point._id, -math.inf)
+            if earliest_end > latest_end + _TIME_TOLERANCE:
+                infeasible.append(point)
+                continue
+            tightened = False
+            if latest_end < point._tw_end:
+                point.tw_end = latest_end
+                tightened = True
+            tw_begin = min(earliest_end, latest_end) - service_time
+            if tw_begin > point._tw_begin:
+                point.tw_begin = tw_begin
+                tightened = True
+            report["time_windows_tightened"] += tightened
+        report["infeasible_customers"] = sorted(
+            {point._id for point in infeasible
+             if point._penalty_or_cost == 0})
+        step, started = time.perf_counter(), step
+        report["times"]["time_windows"] = step - started
+
+        if remove_links:
+            reasons = [None] * len(start_point_ids)
+            self.__infeasible_rows(start_point_ids, end_point_ids, directed,
+                                   times, self.__depot_ids(),
+                                   bytes(len(reasons)), reasons)
+            removed = [row for row, reason in enumerate(reasons)
+                       if reason is not None]
+            for row in removed:
+                report[reasons[row]] += 1
+            self.links.delete_rows(removed)
+        step, started = time.perf_counter(), step
+        report["times"]["links"] = step - started
+        report["time"] = sum(report["times"].values())
+        return report
+
+    def evaluate(self, solution):
+        """Check a solution against the model and return a report (dict)
+        with the values of routes computed again from the links and the
+        vehicle types.
+
+        Additional informations:
+            - solution : a :py:class:`Solution`, its routes or a sequence
+              of tuples (vehicle type id, point ids)
+            - costs, distances, times, loads and violations are arrays
+              with a value by route : cost (fixed cost of the vehicle
+              type, variable costs and fixed costs of links), distance,
+              time (end of service at the last point), total demand and
+              number of violations. point_loads and end_times are arrays
+              with a value by point of routes, the points of the route i
+              are given by offsets[i]:offsets[i + 1]
+            - among parallel links, the link named as the incoming arc
+              in the solution is used, otherwise the cheapest one
+            - errors gives each violation as a tuple (route index, kind,
+              value), the route index is -1 for the violations of the
+              whole solution. The kinds are vehicle_type (unknown vehicle
+              type), point (unknown point), start_depot, end_depot,
+              depot (depot visited in the route), link (no link to the
+              point), incompatible_vehicle, capacity, time_window,
+              vehicle_time_window, served_twice, not_served (customer
+              without penalty), max_number (vehicle type id) and
+              max_total
+            - cost is the sum of costs of routes and penalties of
+              customers not served, feasible is True if there is
+              no violation"""
+        points = self.points
+        vehicle_types = self.vehicle_types
+        self.__sync_points()
+        customers = self.__customers
+        customers.resolve(points)
+        routes = solution.routes_array if isinstance(solution, Solution) \
+            else solution
+        if isinstance(routes, RoutesArray):
+            bounds = list(zip(routes.offsets, islice(routes.offsets, 1,
+                                                     None)))
+            names = routes._names
+            given_routes = zip(
+                routes.vehicle_type_ids,
+                (routes.point_ids[begin:end] for begin, end in bounds),
+                (map(names.__getitem__, routes._arc_name_ids[begin:end])
+                 for begin, end in bounds))
+        else:
+            given_routes = (
+                (route.vehicle_type_id, route.point_ids,
+                 route.incoming_arc_names) if isinstance(route, Route)
+                else (route[0], route[1], ()) for route in routes)
+
+        arcs = {}
+        errors = []
+        costs = array('d')
+        distances = array('d')
+        times = array('d')
+        loads = array('d')
+        violations = array('i')
+        point_loads = array('d')
+        end_times = array('d')
+        offsets = array('q', [0])
+        numbers = {}
+        served = set()
+        for index, (vehicle_type_id, point_ids, arc_names) in \
+                enumerate(given_routes):
+            point_ids = list(point_ids)
+            arc_names = list(arc_names)
+            nb_errors = len(errors)
+            vehicle_type = vehicle_types.get(vehicle_type_id)
+            if vehicle_type is None:
+                errors.append((index, "vehicle_type", vehicle_type_id))
+                costs.append(0.0)
+                distances.append(0.0)
+                times.append(0.0)
+                loads.append(0.0)
+                violations.append(1)
+                offsets.append(offsets[-1])
+                continue
+            numbers[vehicle_type_id] = numbers.get(vehicle_type_id, 0) + 1
+            start_point_id = vehicle_type._start_point_id
+            end_point_id = vehicle_type._end_point_id
+            if start_point_id >= 0 and (
+                    not point_ids or point_ids[0] != start_point_id):
+                errors.append((index, "start_depot", start_point_id))
+            if end_point_id >= 0 and (
+                    not point_ids or point_ids[-1] != end_point_id):
+                errors.append((index, "end_depot", end_point_id))
+            capacity = vehicle_type._capacity
+            vehicle_tw_end = vehicle_type._tw_end + _TIME_TOLERANCE
+            cost = vehicle_type._fixed_cost
+            distance = 0.0
+            load = 0.0
+            time_ = vehicle_type._tw_begin
+            last = len(point_ids) - 1
+            previous_id = None
+            for position, point_id in enumerate(point_ids):
+                point = points.get(point_id)
+                if point is None:
+                    errors.append((index, "point", point_id))
+                    previous_id = None
+                    point_loads.append(load)
+                    end_times.append(time_)
+                    continue
+                # a point repeated (empty route) needs no link
+                if previous_id is not None and previous_id != point_id:
+                    arc = self.__arc(
+                        arcs, vehicle_type, previous_id, point_id,
+                        arc_names[position] if position < len(arc_names)
+                        else None)
+                    if arc is None:
+                        errors.append((index, "link", point_id))
+                    else:
+                        cost += arc[0]
+                        time_ += arc[1]
+                        distance += arc[2]
+                id_customer = point._id_customer
+                if id_customer > 0:
+                    load += point._demand
+                    if id_customer in served:
+                        errors.append((index, "served_twice", point_id))
+                    served.add(id_customer)
+                elif 0 < position < last or (
+                        position == 0 and start_point_id < 0) or (
+                        position == last and end_point_id < 0):
+                    errors.append((index, "depot", point_id))
+                if vehicle_type_id in point._incompatible_vehicles:
+                    errors.append((index, "incompatible_vehicle", point_id))
+                time_ = max(time_, point._tw_begin) + point._service_time
+                if time_ > point._tw_end + _TIME_TOLERANCE:
+                    errors.append((index, "time_window", point_id))
+                if time_ > vehicle_tw_end:
+                    errors.append((index, "vehicle_time_window", point_id))
+                point_loads.append(load)
+                end_times.append(time_)
+                previous_id = point_id
+            if load > capacity:
+                errors.append((index, "capacity", load))
+            costs.append(cost)
+            distances.append(distance)
+            times.append(time_)
+            loads.append(load)
+            violations.append(len(errors) - nb_errors)
+            offsets.append(len(end_times))
+
+        for vehicle_type_id, number in numbers.items():
+            if number > vehicle_types[vehicle_type_id]._max_number:
+                errors.append((-1, "max_number", vehicle_type_id))
+        if len(costs) > self.max_total_vehicles_number:
+            errors.append((-1, "max_total", len(costs)))
+        penalties = 0.0
+        for id_customer in customers:
+            if id_customer in served:
+                continue
+            penalty = customers.penalty(id_customer)
+            if penalty == 0:
+                errors.append((-1, "not_served", id_customer))
+            penalties += penalty
+        return {"cost": math.fsum(costs) + penalties,
+                "penalties": penalties,
+                "distance": math.fsum(distances),
+                "feasible": not errors,
+                "errors": errors,
+                "costs": costs,
+                "distances": distances,
+                "times": times,
+                "loads": loads,
+                "violations": violations,
+                "offsets": offsets,
+                "point_loads": point_loads,
+                "end_times": end_times}
 
     def delete_link(self, start_point_id : int,end_point_id : int):
         """ Delete a link by giving start point id and end point id """
         if (start_point_id,end_point_id) not in self.links:
             raise ModelError(constants.DEL_LINK_ERROR)
         else :
+            adjacency = self.__synced_adjacency()
+            deleted = self.links[(start_point_id,end_point_id)] \
+                if adjacency is not None else ()
             del self.links[(start_point_id,end_point_id)]
+            for link in deleted:
+                adjacency.discard(start_point_id, end_point_id,
+                                  link._is_directed)
+            if adjacency is not None:
+                self.__adjacency_version = self.__links_version()
+
+    def arcs(self, start_point_id, end_point_id):
+        """Return the links which can be used from a point to another
+        one : the links (start point id, end point id) and the links
+        (end point id, start point id) not directed"""
+        links = self.links
+        arcs = list(links.get((start_point_id, end_point_id), ()))
+        if start_point_id != end_point_id:
+            arcs += [link for link in
+                     links.get((end_point_id, start_point_id), ())
+                     if not link._is_directed]
+        return arcs
+
+    def out_arcs(self, point_id):
+        """Return the links which can be used from a point as a list
+        of tuples (end point id, link), found with :py:attr:`adjacency`"""
+        return [(end_point_id, link)
+                for end_point_id in self.adjacency.successors(point_id)
+                for link in self.arcs(point_id, end_point_id)]
+
+    def in_arcs(self, point_id):
+        """Return the links which can be used to reach a point as a list
+        of tuples (start point id, link), found with :py:attr:`adjacency`"""
+        return [(start_point_id, link)
+                for start_point_id in self.adjacency.predecessors(point_id)
+                for link in self.arcs(start_point_id, point_id)]
+
+    def arc_cost(self, start_point_id, end_point_id, vehicle_type_id):
+        """Return the cost of the cheapest link from a point to another
+        one for a vehicle type (variable costs of the vehicle type and
+        fixed cost of the link), None if there is no link"""
+        arc = self.__arc({}, self.vehicle_types[vehicle_type_id],
+                         start_point_id, end_point_id)
+        return None if arc is None else arc[0]
 
-    def __propagate_penalties(self,id_customer,id,penalty_or_cost=0):
-        """ Updates the penalties of the same cluster of customers """
-        if id_customer not in self.__customers:
-            self.__customers[id_customer] = [id]
-            
-        else:
-            if(penalty_or_cost != 0):
-                for point_id in self.__customers[id_customer]:
-                    if point_id in self.points:
-                        self.points[point_id].penalty_or_cost = penalty_or_cost
-                self.__customers[id_customer].append(id)
-            else:
-                point_id = self.__customers[id_customer][0]
-                self.points[id].penalty_or_cost = self.points[point_id].penalty_or_cost
-                self.__customers[id_customer].append(id)
-        
     def add_point(
             self,
             id,
@@ -1473,11 +3959,20 @@ class Model:
             incompatible_vehicles=[]):
         """Add Point in dictionary :py:attr:`points`, if we want to add Depot,
            id_customer must be equal to 0, otherwise it cannot be greater
-           than 1022 for a Customer"""
+           than 1022 for a Customer.
+
+           Additional informations:
+               - the points with the same id_customer are alternative
+                 locations of a customer, they share its penalty: a
+                 penalty different of 0 becomes the penalty of all points
+                 of the customer, otherwise the point takes the penalty
+                 of the customer. It's given to the points when the model
+                 is serialized"""
 
         if id in self.points:
             raise ModelError(constants.ADD_POINT_ERROR)
 
+        self.__sync_points()
         self.points[id] = Point(
             id,
             name,
@@ -1490,7 +3985,11 @@ class Model:
             incompatible_vehicles)
 
         if id_customer>0:
-            self.__propagate_penalties(id_customer,id,penalty_or_cost)
+            self.__customers.add(id_customer, id, penalty_or_cost)
+        else:
+            self.__depots.add(id)
+            self.__depots_checked = False
+        self.__points_modified(True)
 
     def add_depot(
             self,
@@ -1509,6 +4008,37 @@ class Model:
                        tw_begin=tw_begin, tw_end=tw_end,
                        incompatible_vehicles=incompatible_vehicles)
 
+    def add_depots(self, ids, names=None, service_times=None, costs=None,
+                   tw_begins=None, tw_ends=None, incompatible_offsets=None,
+                   incompatible_vehicles=None):
+        """Add depots given by columns (lists or arrays)
+           with one value for each id, a column not given takes the
+           default value of :py:meth:`add_depot`.
+
+           Additional informations:
+               - incompatible_offsets, incompatible_vehicles : compressed
+                 rows of incompatible vehicles, the vehicles of the depot
+                 ids[i] are incompatible_vehicles[incompatible_offsets[i]:
+                 incompatible_offsets[i + 1]]
+               - all columns are checked before and a
+                 :py:class:`BulkError` gives all the invalid values,
+                 no depot is added then"""
+        errors = []
+        ids = self.__checked_ids(errors, ids, self.points,
+                                 constants.ADD_POINT_ERROR,
+                                 0, 10000)
+        size = len(ids)
+        points = self.__checked_points(
+            errors, ids, [0] * size, names, service_times, "costs", costs,
+            tw_begins, tw_ends, None, incompatible_offsets,
+            incompatible_vehicles)
+        if errors:
+            raise BulkError(errors)
+        self.__sync_points()
+        dict.update(self.points, zip(ids, points))
+        self.__depots.update(ids)
+        self.__depots_checked = False
+
     def delete_depot(self, id: int):
         """ Delete a depot by giving his id """
         self.delete_customer(id)
@@ -1541,13 +4071,126 @@ class Model:
                        incompatible_vehicles=incompatible_vehicles)
 
 
+    def add_customers(self, ids, demands=None, id_customers=None, names=None,
+                      service_times=None, penalties=None, tw_begins=None,
+                      tw_ends=None, incompatible_offsets=None,
+                      incompatible_vehicles=None):
+        """Add customers given by columns (lists or arrays)
+           with one value for each id, a column not given takes the
+           default value of :py:meth:`add_customer`.
+
+           Additional informations:
+               - incompatible_offsets, incompatible_vehicles : compressed
+                 rows of incompatible vehicles, the vehicles of the customer
+                 ids[i] are incompatible_vehicles[incompatible_offsets[i]:
+                 incompatible_offsets[i + 1]]
+               - the penalties are shared by the points of a customer as
+                 in :py:meth:`add_point`
+               - all columns are checked before and a
+                 :py:class:`BulkError` gives all the invalid values,
+                 no customer is added then"""
+        errors = []
+        ids = self.__checked_ids(errors, ids, self.points,
+                                 constants.ADD_POINT_ERROR,
+                                 0, 10000)
+        size = len(ids)
+        nb_errors = len(errors)
+        id_customers = _checked_column(errors, "id_customers", id_customers,
+                                       size, 0, (int,), 0)
+        if len(errors) == nb_errors:
+            # as in add_customer, the id 0 needs an id_customer
+            for row, (id, id_customer) in enumerate(zip(ids, id_customers)):
+                if id == 0 and id_customer == 0:
+                    errors.append("ids[%d]%s" % (
+                        row, constants.ERRORS_PROPERTY[_MINIMUM_CODES[1]]))
+        if len(errors) == nb_errors:
+            # the id of the point is taken if id_customer is 0
+            id_customers = _checked_column(
+                errors, "id_customers",
+                [id_customer or (id if type(id) is int else 1)
+                 for id, id_customer in zip(ids, id_customers)], size, None,
+                (int,), 1, 1022)
+        points = self.__checked_points(
+            errors, ids, id_customers, names, service_times, "penalties",
+            penalties, tw_begins, tw_ends, demands, incompatible_offsets,
+            incompatible_vehicles)
+        if errors:
+            raise BulkError(errors)
+        self.__sync_points()
+        dict.update(self.points, zip(ids, points))
+        self.__customers.update(id_customers, ids,
+                                (point._penalty_or_cost for point in points))
+
+    def __checked_ids(self, errors, ids, elements, code, minimum,
+                      maximum=None):
+        """Return the column of ids, the invalid ids and the ids already
+        in elements or given twice are added in errors"""
+        ids = _checked_column(errors, "ids", ids, None, None, (int,),
+                              minimum, maximum)
+        given = set(ids) if not errors else set()
+        if len(given) == len(ids) and given.isdisjoint(elements):
+            return ids
+        given = set()
+        for row, id in enumerate(ids):
+            if type(id) is int:
+                if id in elements or id in given:
+                    errors.append("ids[%d] : %s" % (
+                        row, constants.ERRORS_MODEL[code]))
+                given.add(id)
+        return ids
+
+    def __checked_points(self, errors, ids, id_customers, names,
+                         service_times, penalty_name, penalties_or_costs,
+                         tw_begins, tw_ends, demands, incompatible_offsets,
+                         incompatible_vehicles):
+        """Return the points given by columns, the invalid values
+        are added in errors"""
+        size = len(ids)
+        if len(self.points) + size > 1022:
+            errors.append(constants.NB_POINTS_STR + constants.ERRORS_PROPERTY[
+                constants.LESS_MAX_POINTS_PROPERTY])
+        names = _checked_column(errors, "names", names, size, str(),
+                                (str,))
+        service_times = _checked_column(errors, "service_times",
+                                        service_times, size, 0.0,
+                                        _NUMBER_TYPES)
+        penalties_or_costs = _checked_column(
+            errors, penalty_name, penalties_or_costs, size, 0.0, _NUMBER_TYPES)
+        tw_begins = _checked_column(errors, "tw_begins", tw_begins, size,
+                                    0.0, _NUMBER_TYPES)
+        tw_ends = _checked_column(errors, "tw_ends", tw_ends, size, 0.0,
+                                  _NUMBER_TYPES)
+        demands = _checked_column(errors, "demands", demands, size, 0,
+                                  (int,), 0)
+        incompatible_vehicles = _checked_lists(
+            errors, incompatible_offsets, incompatible_vehicles, size)
+        if errors:
+            return []
+        return Point._from_columns(ids, names, id_customers,
+                                   penalties_or_costs, service_times,
+                                   tw_begins, tw_ends, demands,
+                                   incompatible_vehicles)
+
     def delete_customer(self, id: int):
         """ Delete a customer by giving his id """
         if id not in self.points:
             raise ModelError(constants.DEL_POINT_ERROR)
+        self.__sync_points()
+        self.__customers.discard(self.points[id]._id_customer, id)
         del self.points[id]
-        if id in self.__customers:
-            del self.__customers[id]
+        if id in self.__depots:
+            self.__depots.discard(id)
+            self.__depots_checked = False
+        self.__points_modified(True)
+
+    def delete_customers(self, ids):
+        """ Delete customers or depots by giving their ids,
+            nothing is deleted if an id is not in the points """
+        ids = list(dict.fromkeys(ids))
+        if not all(id in self.points for id in ids):
+            raise ModelError(constants.DEL_POINT_ERROR)
+        for id in ids:
+            self.delete_customer(id)
 
     def set_parameters(self, time_limit=300, upper_bound=1000000,
                        heuristic_used=False, time_limit_heuristic=20,
@@ -1576,45 +4219,97 @@ class Model:
 
     def check_depots(self):
         """Update the model if there are defined intermediate 
-        depots not used by vehicles"""
-
-        depots_ids_defined = set()
-        for id in self.points:
-            if self.points[id].id_customer == 0:
-                depots_ids_defined.add(id) 
-
-        
-        ids_vehicles_types = list(self.vehicle_types.keys())
-        for id_veh in ids_vehicles_types:
-            depots_ids_used = set()
-            depots_ids_used.add(self.vehicle_types[id_veh].start_point_id)
-            depots_ids_used.add(self.vehicle_types[id_veh].end_point_id)
-            depot_not_used = depots_ids_defined.difference(depots_ids_used)
-            for id_depot in depot_not_used:
-                values = self.points[id_depot].incompatible_vehicles + [id_veh]
-                self.points[id_depot].incompatible_vehicles = list(set(values))
-        
+        depots not used by vehicles, they become incompatible with
+        these vehicles.
 
+        Additional informations:
+            - the depots and the depots used by each vehicle type are
+              indexed, the incompatibilities are computed again only if
+              these indexes changed since the last call, otherwise only
+              the depots whose incompatible vehicles were modified are
+              updated
+            - the indexes are updated by the functions of the model which
+              add or delete depots and vehicle types, and by setting
+              points or vehicle types
+            - an incompatibility added by this function is removed when
+              the vehicle type starts or ends at the depot
+        """
+        vehicle_type_depots = self.__vehicle_type_depots
+        # start and end points can be modified in the vehicle types
+        for vehicle_type in dict.values(self.vehicle_types):
+            depots = (vehicle_type._start_point_id, vehicle_type._end_point_id)
+            if vehicle_type_depots.get(vehicle_type._id) != depots:
+                vehicle_type_depots[vehicle_type._id] = depots
+                self.__depots_checked = False
+        # vehicle types deleted in the dictionary
+        if vehicle_type_depots.keys() != dict.keys(self.vehicle_types):
+            self.vehicle_types = self.vehicle_types
+            vehicle_type_depots = self.__vehicle_type_depots
+
+        points = self.points
+        self.__sync_points()
+        if self.__depots_checked:
+            depot_ids = [id for id in self.__depots
+                         if points[id]._json is None or
+                         points[id]._json[0] !=
+                         points[id]._incompatible_vehicles]
+        else:
+            used = {}
+            for id_veh, depots in vehicle_type_depots.items():
+                for id_depot in depots:
+                    used.setdefault(id_depot, set()).add(id_veh)
+            ids_vehicle_types = set(vehicle_type_depots)
+            self.__unused_vehicle_types = {
+                id_depot: ids_vehicle_types.difference(used.get(id_depot, ()))
+                for id_depot in self.__depots}
+            self.__depots_checked = True
+            depot_ids = self.__depots
+
+        unused_vehicle_types = self.__unused_vehicle_types
+        added_vehicle_types = self.__added_vehicle_types
+        for id_depot in depot_ids:
+            point = points[id_depot]
+            unused = unused_vehicle_types[id_depot]
+            # the incompatibilities added before for vehicle types which
+            # now use the depot are removed
+            added = added_vehicle_types.get(id_depot, set())
+            removed = added.difference(unused)
+            missing = unused.difference(point._incompatible_vehicles)
+            if missing or removed:
+                # a new list, the list of the point can be shared
+                point._incompatible_vehicles = [
+                    id_veh for id_veh in point._incompatible_vehicles
+                    if id_veh not in removed] + sorted(missing)
+                point._json = None
+                added_vehicle_types[id_depot] = \
+                    added.difference(removed).union(missing)
 
     def set_json(self):
-        """Set model in json format with all elements of model"""
-        self.__json = json.dumps({constants.JSON_OBJECT.MAXNUMBER.value:
-                                  self.max_total_vehicles_number,
-                                  constants.JSON_OBJECT.POINTS.value:
-                                  list(self.points.values()),
-                                  constants.JSON_OBJECT.
-                                  VEHICLE_TYPES.value:
-                                  list(self.vehicle_types.values()),
-                                  constants.JSON_OBJECT.LINKS.value:
-                                  list(self.links.values()),
-                                  constants.JSON_OBJECT.
-                                  PARAMETERS.value:
-                                  self.parameters.get_parameters()},
-                                 indent=1)
+        """Set model in compact json format with all elements of model,
+           it's written in a buffer of bytes ending with a null byte,
+           which is given to bapcod without copy.
+
+           The json format of each element is kept between two calls,
+           only the elements modified or added are formatted again"""
+        self.__sync_points()
+        self.__customers.resolve(self.points)
+        buffer = bytearray(b'{"%s":%d,"%s":[' % (
+            constants.JSON_OBJECT.MAXNUMBER.value.encode(),
+            self.max_total_vehicles_number,
+            constants.JSON_OBJECT.POINTS.value.encode()))
+        self.points._write_json(buffer)
+        buffer += b'],"%s":[' % constants.JSON_OBJECT.VEHICLE_TYPES.value.encode()
+        self.vehicle_types._write_json(buffer)
+        buffer += b'],"%s":[' % constants.JSON_OBJECT.LINKS.value.encode()
+        self.links._write_json(buffer)
+        buffer += b'],"%s":' % constants.JSON_OBJECT.PARAMETERS.value.encode()
+        buffer += self.parameters._json_str().encode('UTF-8')
+        buffer += b'}\0'
+        self.__json = buffer
 
     def __str__(self):
         self.set_json()
-        return self.__json
+        return self.__json[:-1].decode('UTF-8')
 
     def __repr__(self):
         return self.__str__()
@@ -1628,6 +4323,8 @@ class Model:
         #add preprocessing elements in model
         if all_elements:
             self.check_depots()
+        self.__sync_points()
+        self.__customers.resolve(self.points)
 
         model = json.dumps({constants.JSON_OBJECT.MAXNUMBER.value:
                             self.max_total_vehicles_number,
@@ -1643,91 +4340,815 @@ class Model:
         # Writing to sample.json
         with open(name + ".json", "w") as outfile:
             outfile.write(model)
-   
-    def solve(self):
-        """
-        Solve the routing problem by using the shared library bapcod.
-           
-
-        Additional informations:
-            VRPSolverEasy is compatible with Windows 64x,  Linux and macOS only
-        """
-        _lib_bapcod = None
-        _lib_name = None
-        _lib_candidates = []
-
-
-        if platform.system() == constants.WINDOWS_PLATFORM:
-            _lib_name = constants.LIBRARY_WINDOWS
-        elif platform.system() == constants.LINUX_PLATFORM:
-            _lib_name = constants.LIBRARY_LINUX
-        elif platform.system() == constants.MAC_PLATFORM:
-            _lib_name = constants.LIBRARY_MAC
-
-        else:
-            raise ModelError(constants.PLATFORM_ERROR)
 
-        # Load solver
-        if self.parameters.cplex_path != str():
+    def save(self, path):
+        """Save the model in a binary file, the points, vehicle types and
+           links are stored in arrays which are read without parsing by
+           :py:meth:`Model.load`.
+
+           Additional informations:
+               - the file begins with a header in json format giving the
+                 version of the format, the number of vehicles, the
+                 parameters and the position of each array
+               - :py:meth:`Model.export` gives the model in json format
+                 for debugging"""
+        self.__sync_points()
+        self.__customers.resolve(self.points)
+        sections = {}
+        names = {}
+        points = list(dict.values(self.points))
+        sections["points.id"] = array('i', (point._id for point in points))
+        sections["points.id_customer"] = array(
+            'i', (point._id_customer for point in points))
+        for name in ("demand", "penalty_or_cost", "service_time", "tw_begin",
+                     "tw_end"):
+            _add_numbers(sections, "points." + name,
+                         (getattr(point, "_" + name) for point in points))
+        _add_names(sections, names, "points.name",
+                   (point._name for point in points))
+        incompatible_vehicles = [point._incompatible_vehicles
+                                 for point in points]
+        sections["points.incompatible_offsets"] = array('q', [0])
+        sections["points.incompatible_offsets"].extend(
+            map(len, incompatible_vehicles))
+        offsets = sections["points.incompatible_offsets"]
+        for row in range(1, len(offsets)):
+            offsets[row] += offsets[row - 1]
+        sections["points.incompatible_vehicles"] = array(
+            'q', chain.from_iterable(incompatible_vehicles))
+
+        vehicle_types = list(dict.values(self.vehicle_types))
+        for name in ("id", "start_point_id", "end_point_id", "capacity",
+                     "max_number", "fixed_cost", "var_cost_dist",
+                     "var_cost_time", "tw_begin", "tw_end"):
+            _add_numbers(sections, "vehicle_types." + name,
+                         (getattr(vehicle_type, "_" + name)
+                          for vehicle_type in vehicle_types))
+        _add_names(sections, names, "vehicle_types.name",
+                   (vehicle_type._name for vehicle_type in vehicle_types))
+
+        links = self.links
+        if not isinstance(links, ArrayLinksDict):
+            links = ArrayLinksDict(links)
+        links.compact()
+        for name in ("start_point_ids", "end_point_ids", "distances",
+                     "times", "fixed_costs", "is_directed", "name_ids"):
+            sections["links." + name] = getattr(links, "_" + name)
+        names["links.name_ids"] = links._names
+
+        table = {}
+        offset = 0
+        for name, column in sections.items():
+            column = memoryview(column)
+            table[name] = [offset, column.format, len(column)]
+            offset += column.nbytes + (-column.nbytes % 8)
+        header = json.dumps({
+            "format": "VRPSolverEasy model",
+            "version": _BINARY_VERSION,
+            "library_version": __version__,
+            "byteorder": sys.byteorder,
+            "max_total_vehicles_number": self.max_total_vehicles_number,
+            "parameters": {name: getattr(self.parameters, name)
+                           for name in _SAVED_PARAMETERS},
+            "names": names,
+            "sections": table}).encode('UTF-8')
+        with open(path, "wb") as file:
+            file.write(_BINARY_PREFIX.pack(_BINARY_MAGIC, _BINARY_VERSION,
+                                           len(header)))
+            file.write(header)
+            file.write(bytes(-(_BINARY_PREFIX.size + len(header)) % 8))
+            for column in sections.values():
+                column = memoryview(column)
+                file.write(column)
+                file.write(bytes(-column.nbytes % 8))
+
+    @classmethod
+    def load(cls, path, mmap=True):
+        """Load a model saved by :py:meth:`Model.save`, the links are
+           stored in an :py:class:`ArrayLinksDict`.
+
+           Additional informations:
+               - mmap : if True, the file is mapped in memory and the
+                 arrays of links are read in place (copy on write), they
+                 are copied only when links are added. Otherwise the
+                 file is read and the arrays are copied
+               - a file which is not a model, is truncated or whose
+                 arrays don't match the numbers of elements raises a
+                 ModelError"""
+        with open(path, "rb") as file:
             try:
-                _c.cdll.LoadLibrary(
-                    os.path.realpath(
-                        self.parameters.cplex_path))
-            except BaseException:
-                raise ModelError(constants.BAPCOD_ERROR)
-
-        # Try three different locations to load the native library:
-        # 1. The current folder
-        # 2. The platform folder (lib/Windows for example)
-        # 3. The system folders (delegates the loading behavior to the system)
-
-        _lib_candidates.append(os.path.join(os.path.dirname
-                                            (os.path.realpath(__file__)),
-                                            _lib_name))
-
-        _lib_candidates.append(os.path.join(
-            os.path.join(os.path.realpath(__file__ + "/../../lib/"),
-                         platform.system()), _lib_name))
-
-        _lib_candidates.append(_lib_name)
-
-        _loaded_library = None
-        for candidate in _lib_candidates:
+                buffer = _mmap.mmap(file.fileno(), 0,
+                                    access=_mmap.ACCESS_COPY) \
+                    if mmap else file.read()
+                view = memoryview(buffer)
+                magic, version, header_size = \
+                    _BINARY_PREFIX.unpack_from(view)
+                if magic != _BINARY_MAGIC or version > _BINARY_VERSION:
+                    raise ValueError(version)
+                header = json.loads(bytes(view[
+                    _BINARY_PREFIX.size:_BINARY_PREFIX.size + header_size]))
+            except (ValueError, struct.error):
+                raise ModelError(constants.LOAD_MODEL_ERROR)
+        start = _BINARY_PREFIX.size + header_size
+        try:
+            return cls.__load_sections(header, view[start + (-start % 8):],
+                                       mmap)
+        except (ValueError, TypeError, KeyError, IndexError, AttributeError,
+                struct.error):
+            raise ModelError(constants.LOAD_MODEL_ERROR)
+
+    @classmethod
+    def __load_sections(cls, header, view, mmap):
+        """Return the model given by the header and the sections of a
+           binary model, raise a ValueError if the length of a section
+           doesn't match the number of points, vehicle types or links"""
+        swap = header["byteorder"] != sys.byteorder
+        table = header["sections"]
+        names = header["names"]
+
+        def column(name, copy=True, size=None):
+            if size is not None and table[name][2] != size:
+                raise ValueError(name)
+            return _read_section(view, table[name], copy, swap)
+
+        def numbers(name, size):
+            mask = table.get(name + ".ints")
+            return _number_values(column(name, size=size), mask and column(
+                name + ".ints", size=(size + 7) // 8))
+
+        model = cls(array_links=True)
+        model.max_total_vehicles_number = header["max_total_vehicles_number"]
+        for name, value in header["parameters"].items():
+            if name not in _SAVED_PARAMETERS:
+                raise ValueError(name)
+            setattr(model.parameters, name, value)
+
+        ids = column("points.id").tolist()
+        size = len(ids)
+        offsets = column("points.incompatible_offsets",
+                         size=size + 1).tolist()
+        incompatible_vehicles = column(
+            "points.incompatible_vehicles").tolist()
+        if offsets[0] != 0 or offsets[-1] != len(incompatible_vehicles) or \
+                any(map(int.__gt__, offsets, offsets[1:])):
+            raise ValueError("points.incompatible_offsets")
+        points = PointsDict()
+        dict.update(points, zip(ids, Point._from_columns(
+            ids, [names["points.name"][name_id] for name_id
+                  in column("points.name", size=size)],
+            column("points.id_customer", size=size).tolist(),
+            numbers("points.penalty_or_cost", size),
+            numbers("points.service_time", size),
+            numbers("points.tw_begin", size),
+            numbers("points.tw_end", size), numbers("points.demand", size),
+            [incompatible_vehicles[begin:end]
+             for begin, end in zip(offsets, offsets[1:])])))
+        model.points = points
+
+        ids = numbers("vehicle_types.id", table["vehicle_types.id"][2])
+        size = len(ids)
+        vehicle_types = VehicleTypesDict()
+        dict.update(vehicle_types, zip(ids, map(
+            VehicleType, ids, numbers("vehicle_types.start_point_id", size),
+            numbers("vehicle_types.end_point_id", size),
+            [names["vehicle_types.name"][name_id] for name_id
+             in column("vehicle_types.name", size=size)],
+            numbers("vehicle_types.capacity", size),
+            numbers("vehicle_types.fixed_cost", size),
+            numbers("vehicle_types.var_cost_dist", size),
+            numbers("vehicle_types.var_cost_time", size),
+            numbers("vehicle_types.max_number", size),
+            numbers("vehicle_types.tw_begin", size),
+            numbers("vehicle_types.tw_end", size))))
+        model.vehicle_types = vehicle_types
+
+        size = table["links.start_point_ids"][2]
+        model.links = ArrayLinksDict._from_columns(
+            *(column("links." + name, not mmap, size) for name in (
+                "start_point_ids", "end_point_ids", "distances", "times",
+                "fixed_costs")),
+            column("links.is_directed", not mmap, (size + 7) // 8),
+            column("links.name_ids", not mmap, size),
+            names["links.name_ids"])
+        return model
+
+    @classmethod
+    def from_json(cls, source, array_links=False):
+        """Import a model exported by :py:meth:`Model.export` or given in
+           the json format of the solver, from a file or from bytes.
+
+           Additional informations:
+               - source : path of the file or bytes of the json document
+               - the document is read by chunks and the links are decoded
+                 by chunk, they are stored in columns and added at once, as the
+                 points by :py:meth:`add_customers`, :py:meth:`add_depots`
+                 and the vehicle types by :py:meth:`add_vehicle_types`
+               - the model gives the same json format with
+                 :py:meth:`set_json` as the exported model if array_links
+                 is the same, the points, vehicle types and links keep
+                 their order
+               - the invalid values raise a :py:class:`BulkError`, a
+                 document which is not a model raises a ModelError"""
+        model = cls(array_links)
+        # the decoded elements have no cycles, the collections triggered
+        # by their allocations are useless
+        gc_enabled = gc.isenabled()
+        gc.disable()
+        try:
+            with _json_file(source) as file:
+                reader = _JsonReader(file)
+                for key in reader.members():
+                    if key == constants.JSON_OBJECT.MAXNUMBER.value:
+                        model.max_total_vehicles_number = reader.value()
+                    elif key == constants.JSON_OBJECT.POINTS.value:
+                        model.__add_json_points(list(reader.elements()))
+                    elif key == constants.JSON_OBJECT.VEHICLE_TYPES.value:
+                        model.__add_json_vehicle_types(reader.value())
+                    elif key == constants.JSON_OBJECT.LINKS.value:
+                        model.__add_json_links(reader.batches())
+                    elif key == constants.JSON_OBJECT.PARAMETERS.value:
+                        for name, value in reader.value().items():
+                            setattr(model.parameters,
+                                    _JSON_PARAMETERS[name], value)
+                    else:
+                        raise ValueError(key)
+        except (ValueError, TypeError, AttributeError, KeyError):
+            raise ModelError(constants.READ_JSON_ERROR)
+        finally:
+            if gc_enabled:
+                gc.enable()
+        return model
+
+    def __add_json_points(self, points):
+        """Add the points in json format, the consecutive customers and
+        depots are added by columns"""
+        def column(key, default):
+            return [point.get(key, default) for point in run]
+
+        def kind(point):
+            if point.get(constants.POINT.ID_CUSTOMER.value, 0) != 0:
+                return "customer"
+            # a depot with a capacity is added alone
+            if point.get(constants.POINT.DEMAND_OR_CAPACITY.value, 0) != 0:
+                return "point"
+            return "depot"
+
+        for point_kind, run in groupby(points, kind):
+            run = list(run)
+            ids = column(constants.POINT.ID.value, None)
+            names = column(constants.POINT.NAME.value, str())
+            service_times = column(constants.POINT.SERVICE_TIME.value, 0)
+            penalties_or_costs = column(
+                constants.POINT.PENALTY_OR_COST.value, 0)
+            tw_begins = column(constants.POINT.TIME_WINDOWS_BEGIN.value, 0)
+            tw_ends = column(constants.POINT.TIME_WINDOWS_END.value, 0)
+            incompatible_vehicles = column(
+                constants.POINT.INCOMPATIBLE_VEHICLES.value, [])
+            if point_kind == "point":
+                for (id, name, service_time, penalty_or_cost, tw_begin,
+                     tw_end, demand, incompatible) in zip(
+                        ids, names, service_times, penalties_or_costs,
+                        tw_begins, tw_ends, column(
+                            constants.POINT.DEMAND_OR_CAPACITY.value, 0),
+                        incompatible_vehicles):
+                    self.add_point(id, name, 0, service_time,
+                                   penalty_or_cost, tw_begin, tw_end,
+                                   demand, incompatible)
+                continue
+            offsets = [0]
+            for incompatible in incompatible_vehicles:
+                offsets.append(offsets[-1] + len(incompatible))
+            incompatible_vehicles = list(
+                chain.from_iterable(incompatible_vehicles))
+            if point_kind == "depot":
+                self.add_depots(ids, names, service_times,
+                                penalties_or_costs, tw_begins, tw_ends,
+                                offsets, incompatible_vehicles)
+            else:
+                self.add_customers(
+                    ids, column(constants.POINT.DEMAND_OR_CAPACITY.value, 0),
+                    column(constants.POINT.ID_CUSTOMER.value, 0), names,
+                    service_times, penalties_or_costs, tw_begins, tw_ends,
+                    offsets, incompatible_vehicles)
+
+    def __add_json_vehicle_types(self, vehicle_types):
+        """Add the vehicle types in json format"""
+        def column(key, default):
+            return [vehicle_type.get(key.value, default)
+                    for vehicle_type in vehicle_types]
+
+        self.add_vehicle_types(
+            column(constants.VEHICLE_TYPE.ID, None),
+            column(constants.VEHICLE_TYPE.START_POINT_ID, -1),
+            column(constants.VEHICLE_TYPE.END_POINT_ID, -1),
+            column(constants.VEHICLE_TYPE.NAME, str()),
+            column(constants.VEHICLE_TYPE.CAPACITY, 0),
+            column(constants.VEHICLE_TYPE.FIXED_COST, 0),
+            column(constants.VEHICLE_TYPE.VAR_COST_DIST, 0),
+            column(constants.VEHICLE_TYPE.VAR_COST_TIME, 0),
+            column(constants.VEHICLE_TYPE.MAX_NUMBER, 0),
+            column(constants.VEHICLE_TYPE.TIME_WINDOWS_BEGIN, 0),
+            column(constants.VEHICLE_TYPE.TIME_WINDOWS_END, 0))
+
+    def __add_json_links(self, batches):
+        """Add the links in json format read by lists, they are
+        stored in columns which are checked and added at once"""
+        keys = (constants.LINK.START_POINT_ID.value,
+                constants.LINK.END_POINT_ID.value,
+                constants.LINK.NAME.value, constants.LINK.IS_DIRECTED.value,
+                constants.LINK.DISTANCE.value, constants.LINK.TIME.value,
+                constants.LINK.FIXED_COST.value)
+        defaults = (-1, -1, str(), False, 0, 0, 0)
+        columns = tuple([] for _ in keys)
+        all_keys = itemgetter(*keys)
+        for batch in batches:
             try:
-                # Python 3.8 has changed the behavior of CDLL on Windows.
-                if hasattr(os, 'add_dll_directory'):
-                    _lib_bapcod = _c.CDLL(candidate, winmode=0)
+                # all keys are given in the exported format
+                for column, values in zip(columns,
+                                          zip(*map(all_keys, batch))):
+                    column.extend(values)
+            except KeyError:
+                for column, key, default in zip(columns, keys, defaults):
+                    column.extend([link.get(key, default) for link in batch])
+        errors = []
+        start_point_ids, end_point_ids, names, is_directed, distances, \
+            times, fixed_costs = (
+                _checked_column(errors, name, column, None, None, types,
+                                minimum)
+                for name, column, types, minimum in zip(
+                    ("start_point_ids", "end_point_ids", "names",
+                     "is_directed", "distances", "times", "fixed_costs"),
+                    columns, ((int,), (int,), (str,), (bool,),
+                              _NUMBER_TYPES, _NUMBER_TYPES, _NUMBER_TYPES),
+                    (0, 0, None, None, 0, 0, None)))
+        if errors:
+            raise BulkError(errors)
+        if isinstance(self.links, ArrayLinksDict):
+            self.links._extend_columns(start_point_ids, end_point_ids, names,
+                                       is_directed, distances, times,
+                                       fixed_costs)
+            return
+        self.links._extend(starmap(Link, zip(
+            start_point_ids, end_point_ids, names, is_directed, distances,
+            times, fixed_costs)))
+   
+    @staticmethod
+    def __given_routes(initial_solution):
+        """Return the routes of a solution, a sequence of routes or of
+        tuples (vehicle type id, point ids) as a list of tuples"""
+        routes = initial_solution.routes_array \
+            if isinstance(initial_solution, Solution) else initial_solution
+        if isinstance(routes, RoutesArray):
+            offsets = routes.offsets
+            return [(routes.vehicle_type_ids[index], list(
+                routes.point_ids[offsets[index]:offsets[index + 1]]))
+                for index in range(len(routes))]
+        given_routes = []
+        for route in routes:
+            if isinstance(route, Route):
+                given_routes.append((route.vehicle_type_id,
+                                     list(route.point_ids)))
+            else:
+                vehicle_type_id, point_ids = route
+                given_routes.append((vehicle_type_id, list(point_ids)))
+        return given_routes
+
+    def __arc(self, arcs, vehicle_type, start_point_id, end_point_id,
+              name=None):
+        """Return the cheapest link from a point to another one for a
+        vehicle type as a tuple (cost, time, distance, name), None if
+        there is no link. Among parallel links, the links named name are
+        preferred if there are some. The arcs already found are kept
+        in arcs"""
+        key = (vehicle_type._id, start_point_id, end_point_id, name)
+        if key in arcs:
+            return arcs[key]
+        links = self.arcs(start_point_id, end_point_id)
+        if name:
+            links = [link for link in links if link._name == name] or links
+        arcs[key] = arc = min(
+            ((vehicle_type._var_cost_dist * link._distance +
+              vehicle_type._var_cost_time * link._time + link._fixed_cost,
+              link._time, link._distance, link._name) for link in links),
+            default=None)
+        return arc
+
+    def __schedule(self, arcs, vehicle_type, point_ids):
+        """Return the cost, the loads, the end times of service and the
+        names of incoming arcs of a route given by its points (with its
+        depots), None if a link is missing or if the capacity or a time
+        window is violated. A route without its last points gives the
+        same values for its first points"""
+        points = self.points
+        capacity = vehicle_type._capacity
+        vehicle_tw_end = vehicle_type._tw_end + _TIME_TOLERANCE
+        cost = vehicle_type._fixed_cost
+        load = 0
+        time = vehicle_type._tw_begin
+        loads = []
+        end_times = []
+        arc_names = []
+        previous_id = None
+        for point_id in point_ids:
+            point = points[point_id]
+            arc_name = str()
+            if previous_id is not None:
+                arc = self.__arc(arcs, vehicle_type, previous_id, point_id)
+                if arc is None:
+                    return None
+                cost += arc[0]
+                time += arc[1]
+                arc_name = arc[3]
+            time = max(time, point._tw_begin) + point._service_time
+            if point._id_customer > 0:
+                load += point._demand
+            if time > point._tw_end + _TIME_TOLERANCE or \
+                    time > vehicle_tw_end or load > capacity:
+                return None
+            loads.append(load)
+            end_times.append(time)
+            arc_names.append(arc_name)
+            previous_id = point_id
+        return cost, loads, end_times, arc_names
+
+    def __initial_routes(self, initial_solution):
+        """Return the routes of an initial solution repaired for the model
+        as a list of tuples (vehicle type, point ids, schedule) and the
+        cost of the solution, the routes are None if a customer
+        which is not optional cannot be served"""
+        points = self.points
+        self.__sync_points()
+        customers = self.__customers
+        customers.resolve(points)
+        arcs = {}
+        report = self.warm_start
+        routes = []
+        numbers = {}
+        served = set()
+        for vehicle_type_id, point_ids in self.__given_routes(
+                initial_solution):
+            vehicle_type = self.vehicle_types.get(vehicle_type_id)
+            if vehicle_type is None or \
+                    numbers.get(vehicle_type_id, 0) >= \
+                    vehicle_type._max_number or \
+                    len(routes) >= self.max_total_vehicles_number:
+                report["dropped_routes"] += 1
+                continue
+            first = [vehicle_type._start_point_id] \
+                if vehicle_type._start_point_id >= 0 else []
+            last = [vehicle_type._end_point_id] \
+                if vehicle_type._end_point_id >= 0 else []
+            # the depots are given by the vehicle type, the customers which
+            # cannot be visited are dropped
+            route = list(first)
+            for point_id in point_ids:
+                point = points.get(point_id)
+                if point is not None and point._id_customer == 0:
+                    continue
+                if point is not None and \
+                        point._id_customer not in served and \
+                        vehicle_type_id not in point._incompatible_vehicles \
+                        and self.__schedule(arcs, vehicle_type,
+                                            route + [point_id]) is not None:
+                    route.append(point_id)
+                    served.add(point._id_customer)
                 else:
-                    _lib_bapcod = _c.CDLL(candidate)
-                _loaded_library = candidate
-                break
-            except BaseException:
-                pass
-
-        if _loaded_library is None:
-            raise ModelError(constants.LOAD_LIB_ERROR)
+                    report["dropped_points"] += 1
+            schedule = self.__schedule(arcs, vehicle_type, route + last)
+            while schedule is None and len(route) > len(first):
+                served.discard(points[route.pop()]._id_customer)
+                report["dropped_points"] += 1
+                schedule = self.__schedule(arcs, vehicle_type, route + last)
+            if schedule is None or len(route) == len(first):
+                report["dropped_routes"] += 1
+                continue
+            routes.append((vehicle_type, route + last, schedule))
+            numbers[vehicle_type_id] = numbers.get(vehicle_type_id, 0) + 1
+
+        # the customers which are not optional are inserted where the
+        # cost increases the least
+        for id_customer in customers:
+            if id_customer in served or customers.penalty(id_customer) != 0:
+                continue
+            best = None
+            for point_id in customers.point_ids(id_customer):
+                incompatible_vehicles = points[point_id]._incompatible_vehicles
+                candidates = [
+                    (index, vehicle_type, point_ids, schedule[0])
+                    for index, (vehicle_type, point_ids, schedule)
+                    in enumerate(routes)]
+                if len(routes) < self.max_total_vehicles_number:
+                    candidates += [
+                        (None, vehicle_type, [vehicle_type._start_point_id,
+                                              vehicle_type._end_point_id],
+                         0.0)
+                        for vehicle_type in dict.values(self.vehicle_types)
+                        if numbers.get(vehicle_type._id, 0) <
+                        vehicle_type._max_number]
+                for index, vehicle_type, point_ids, cost in candidates:
+                    if vehicle_type._id in incompatible_vehicles:
+                        continue
+                    if index is None:
+                        point_ids = [id for id in point_ids if id >= 0]
+                    first = 1 if vehicle_type._start_point_id >= 0 else 0
+                    last = len(point_ids) - \
+                        (1 if vehicle_type._end_point_id >= 0 else 0)
+                    for position in range(first, last + 1):
+                        route = point_ids[:position] + [point_id] + \
+                            point_ids[position:]
+                        schedule = self.__schedule(arcs, vehicle_type, route)
+                        if schedule is not None and (
+                                best is None or
+                                schedule[0] - cost < best[0]):
+                            best = (schedule[0] - cost, index, vehicle_type,
+                                    route, schedule)
+            if best is None:
+                return None, None
+            _, index, vehicle_type, route, schedule = best
+            if index is None:
+                routes.append((vehicle_type, route, schedule))
+                numbers[vehicle_type._id] = \
+                    numbers.get(vehicle_type._id, 0) + 1
+            else:
+                routes[index] = (vehicle_type, route, schedule)
+            served.add(id_customer)
+            report["inserted_customers"] += 1
+
+        cost = sum(schedule[0] for _, _, schedule in routes) + sum(
+            customers.penalty(id_customer) for id_customer in customers
+            if id_customer not in served)
+        return routes, cost
+
+    def __prepare_solve(self, preprocess, initial_solution, heuristic_time):
+        """Return the payload (see _prepare_payload) and the routes of the
+        initial solution repaired (found by the heuristic in heuristic_time
+        seconds if it's not given), its cost is the upper bound given to
+        the solver if it's lower"""
+        source = "initial_solution"
+        if initial_solution is None:
+            if heuristic_time is None:
+                return self._prepare_payload(preprocess), None
+            source = "heuristic"
+        start = time.perf_counter()
+        self.warm_start = {"source": source, "routes": 0,
+                           "dropped_routes": 0, "dropped_points": 0,
+                           "inserted_customers": 0, "cost": None,
+                           "time": 0.0}
+        if initial_solution is None:
+            _, initial_solution = heuristic.solve(self, heuristic_time)
+        routes, cost = self.__initial_routes(initial_solution)
+        upper_bound = self.parameters.upper_bound
+        if routes is not None:
+            self.warm_start["routes"] = len(routes)
+            self.warm_start["cost"] = cost
+            if cost < upper_bound:
+                self.parameters.upper_bound = cost
+        self.warm_start["time"] = time.perf_counter() - start
+        try:
+            return self._prepare_payload(preprocess), routes
+        finally:
+            self.parameters.upper_bound = upper_bound
+
+    def __set_initial_solution(self, routes, keep_json):
+        """Give the initial solution to the model if the solver proved
+        that no better solution exists or didn't find one"""
+        if routes is None or self.solution.is_defined() or self.status not in (
+                constants.BETTER_SOL_DOES_NOT_EXISTS,
+                constants.BETTER_SOL_NOT_FOUND):
+            return
+        points = self.points
+        output = dict(self.__output)
+        output["Solution"] = {
+            constants.STATISTICS.SOLUTION_VALUE.value:
+            self.warm_start["cost"],
+            "Routes": [{
+                constants.ROUTE.VEHICLE_TYPE_ID.value: vehicle_type._id,
+                constants.ROUTE.ROUTE_COST.value: float(schedule[0]),
+                constants.ROUTE.VISITED_POINTS.value: [{
+                    constants.ROUTE.INCOMING_ARC_NAME.value: arc_name,
+                    constants.ROUTE.POINT_ID.value: point_id,
+                    constants.ROUTE.POINT_NAME.value: points[point_id]._name,
+                    constants.ROUTE.TIME.value: float(end_time),
+                    constants.ROUTE.LOAD.value: float(load)}
+                    for point_id, load, end_time, arc_name in zip(
+                        point_ids, *schedule[1:])]}
+                for vehicle_type, point_ids, schedule in routes]}
+        self._set_output(json.dumps(output).encode('UTF-8'), keep_json)
+
+    def _prepare_payload(self, preprocess=False):
+        """Apply the preprocessing and return the model in json
+        format encoded in UTF-8 (with a final null byte),
+        None if the preprocessing proves that the model is infeasible"""
         self.check_depots()
+        if preprocess:
+            self.preprocessing = self.preprocess()
+            infeasible_customers = self.preprocessing["infeasible_customers"]
+            if infeasible_customers:
+                self.status = constants.INFEASIBLE
+                self.message = constants.INFEASIBLE_CUSTOMERS_STR + \
+                    str(infeasible_customers)
+                self.solution = Solution(status=self.status)
+                return None
         self.set_json()
+        return self.__json
 
-        input = _c.c_char_p(self.__json.encode('UTF-8'))
-        solve = _lib_bapcod.solveModel
-        solve.argtypes = [_c.c_char_p]
-        solve.restype = _c.POINTER(_c.c_char_p)
-        free_memory = _lib_bapcod.freeMemory
-        free_memory.argtypes = [_c.POINTER(_c.c_char_p)]
-        free_memory.restype = _c.c_void_p
-
+    def _set_output(self, output, keep_json=False):
+        """Update status, solution and statistics from the output
+        of bapcod in json format"""
         try:
-            output = solve(input)
-            self.__output = json.loads((_c.c_char_p.from_buffer(output)).value)
+            if keep_json:
+                self.__output, routes = json.loads(output), None
+            else:
+                self.__output, routes = _decode_output(output)
             self.status = self.__output["Status"]["code"]
             self.message = self.__output["Status"]["message"]
-            self.solution = Solution(self.__output,self.status)
+            self.solution = Solution(self.__output, self.status, routes,
+                                     self.links)
 
             if self.status > -1 and self.status < 4 and self.parameters.action != "enumAllFeasibleRoutes":
-                self.statistics = Statistics(self.solution.json["Statistics"])
-                
-            free_memory(output)
+                self.statistics = Statistics(self.__output["Statistics"])
         except BaseException:
             raise ModelError(constants.BAPCOD_ERROR)
 
+    def solve(self, keep_json=False, preprocess=False, cache=None,
+              initial_solution=None, heuristic_time=None):
+        """
+        Solve the routing problem by using the shared library bapcod.
+           
+
+        Additional informations:
+            - VRPSolverEasy is compatible with Windows 64x,  Linux and macOS only
+            - keep_json : if True, the output of the solver in json format
+              is kept in solution.json, otherwise only the arrays of routes
+              are kept (much less memory for many routes)
+            - preprocess : if True, :py:meth:`Model.preprocess` is applied
+              before and its report is kept in preprocessing. If some
+              customers cannot be served, bapcod is not called and the
+              status is INFEASIBLE. The model itself is modified and stays
+              modified after the resolution: incompatible vehicles are
+              added, time windows are tightened and links are removed.
+              Solve a copy (see :py:meth:`Model.save` and
+              :py:meth:`Model.load`) to keep the original model
+            - cache : a :py:class:`SolutionCache` (see
+              :py:mod:`VRPSolverEasy.cache`), if the model in json format
+              was already solved, the output of bapcod is taken in the
+              cache, otherwise it's stored after the resolution
+            - initial_solution : a :py:class:`Solution`, a sequence of
+              :py:class:`Route` or of tuples (vehicle type id, point ids)
+              of a previous resolution. Its routes are repaired for the
+              model: the depots are given by the vehicle types, the
+              points which violate the capacity, a time window or have no
+              link are dropped and the customers not optional which are
+              not served are inserted where the cost increases the least.
+              Its cost is given as upper bound and it becomes the
+              solution if the solver proves that no better solution
+              exists. The report is kept in warm_start. The json format
+              of bapcod cannot receive initial routes as columns, so
+              only the upper bound is given to the solver.
+            - heuristic_time : if it's given and initial_solution is not
+              given, :py:func:`VRPSolverEasy.heuristic.solve` runs during
+              heuristic_time seconds before the resolution and its routes
+              are used as initial_solution. This time is added to the
+              time of the resolution.
+        """
+        payload, routes = self.__prepare_solve(preprocess, initial_solution,
+                                               heuristic_time)
+        if payload is None:
+            return
+        if cache is not None:
+            key = cache.key(payload)
+            output = cache.get(key)
+            if output is not None:
+                self._set_output(output, keep_json)
+                self.__set_initial_solution(routes, keep_json)
+                return
+        # Load solver
+        if self.parameters.cplex_path != str():
+            _load_cplex(self.parameters.cplex_path)
+        _get_library()
+
+        output = _solve_payload(payload)
+        self._set_output(output, keep_json)
+        if cache is not None and \
+                self.status != constants.INTERRUPTED_BY_ERROR:
+            cache.put(key, output)
+        self.__set_initial_solution(routes, keep_json)
+
+    async def solve_async(self, executor=None, keep_json=False,
+                          preprocess=False, cache=None,
+                          initial_solution=None, heuristic_time=None):
+        """
+        Coroutine solving the routing problem in an executor
+        (the default executor of the event loop if not given),
+        the event loop stays free during the resolution.
+
+        Additional informations:
+            - bapcod is not reentrant, resolutions run one at a time
+              in a process, the other ones wait for their turn.
+              Use :py:func:`solve_many` to solve models in parallel.
+            - If the coroutine is cancelled, the resolution already
+              started goes to its end in the executor but its result
+              is discarded, the model keeps its previous solution.
+            - The preparation (preprocess, heuristic, json format) runs
+              in the default executor of the event loop.
+            - keep_json, preprocess, cache, initial_solution,
+              heuristic_time : see :py:meth:`Model.solve`
+        """
+        cplex_path = self.parameters.cplex_path
+        loop = asyncio.get_running_loop()
+        payload, routes = await loop.run_in_executor(
+            None, self.__prepare_solve, preprocess, initial_solution,
+            heuristic_time)
+        if payload is None:
+            return
+        if cache is not None:
+            key = cache.key(payload)
+            output = cache.get(key)
+            if output is not None:
+                self._set_output(output, keep_json)
+                self.__set_initial_solution(routes, keep_json)
+                return
+        output = await loop.run_in_executor(executor, _solve_payload,
+                                            payload, cplex_path)
+        self._set_output(output, keep_json)
+        if cache is not None and \
+                self.status != constants.INTERRUPTED_BY_ERROR:
+            cache.put(key, output)
+        self.__set_initial_solution(routes, keep_json)
+
+
+def _init_worker():
+    """Load the library bapcod once in a worker process"""
+    try:
+        _get_library()
+    except ModelError:
+        # the error is cached and raised by each resolution
+        pass
+
+
+def solve_many(models, max_workers=None, timeout=None, ordered=True):
+    """Solve independent models in parallel with a pool of processes.
+
+    This function is a generator giving tuples (index, model) where
+    index is the position of the model in models and model is
+    solved (status, solution and statistics are updated).
+    Only the models in json format are sent to the processes and only
+    the outputs in json format come back.
+
+    Additional informations:
+        - max_workers : number of processes, by default the number of
+          processors of the machine
+        - timeout : maximal time in seconds to solve all models,
+          a TimeoutError is raised if it's reached and the workers
+          are terminated, the resolutions in progress are lost.
+          The workers are also terminated if the generator is closed
+          before the end or if an error is raised
+        - ordered : if True, models are given in the order of the input,
+          otherwise they are given as soon as they are solved
+    """
+    models = list(models)
+    payloads = [(model._prepare_payload(), model.parameters.cplex_path)
+                for model in models]
+    deadline = None if timeout is None else time.monotonic() + timeout
+    executor = futures.ProcessPoolExecutor(max_workers,
+                                           initializer=_init_worker)
+    completed = False
+    # the workers are the processes started by the submissions
+    children = set(multiprocessing.active_children())
+    workers = []
+    tasks = {}
+    try:
+        for index, payload in enumerate(payloads):
+            tasks[executor.submit(_solve_payload, *payload)] = index
+        workers = [process for process in multiprocessing.active_children()
+                   if process not in children]
+        if ordered:
+            for future, index in tasks.items():
+                remaining = None if deadline is None else \
+                    max(0.0, deadline - time.monotonic())
+                models[index]._set_output(future.result(remaining))
+                yield index, models[index]
+        else:
+            for future in futures.as_completed(tasks, timeout):
+                index = tasks[future]
+                models[index]._set_output(future.result())
+                yield index, models[index]
+        completed = True
+    finally:
+        if completed:
+            executor.shutdown()
+        else:
+            _terminate_executor(executor, tasks, workers)
+
+
+def _terminate_executor(executor, tasks, workers):
+    """Shut down a pool of processes without waiting for the resolutions
+    in progress, the tasks not started are cancelled and the workers
+    are terminated"""
+    for future in tasks:
+        future.cancel()
+    executor.shutdown(wait=False)
+    for process in workers:
+        process.terminate()
+    for process in workers:
+        process.join()
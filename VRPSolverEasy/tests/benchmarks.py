@@ -0,0 +1,290 @@
+""" Micro-benchmarks of the modeler (no resolution with bapcod).
+Run with : python -m VRPSolverEasy.tests.benchmarks """
+
+import json
+import os
+import random
+import tempfile
+import time
+import tracemalloc
+import math
+from VRPSolverEasy.src import solver, constants, io, distances, heuristic
+
+
+def measure_objects(factory, nb_objects=100000):
+    """Return the bytes by object and the number of objects built by
+    second for a function building an object from an index"""
+    start = time.perf_counter()
+    objects = [factory(i) for i in range(nb_objects)]
+    rate = nb_objects / (time.perf_counter() - start)
+    del objects
+    tracemalloc.start()
+    objects = [factory(i) for i in range(nb_objects)]
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return size / nb_objects, rate
+
+
+def bench_objects(nb_objects=100000):
+    """Print the memory and the construction rate of the classes
+    of the model"""
+    factories = {
+        "Point": lambda i: solver.Point(i % 10000, "P", 1, 0.0, 1, 0, 10, 5),
+        "Link": lambda i: solver.Link(i, i + 1, str(), False, 1.5, 2.0),
+        "VehicleType": lambda i: solver.VehicleType(i + 1, 0, 0, "V", 100),
+        "Parameters": lambda i: solver.Parameters()}
+    for name, factory in factories.items():
+        size, rate = measure_objects(factory, nb_objects)
+        print(f"{name:12} {size:8.0f} bytes/object {rate:12.0f} objects/s")
+
+
+def random_model(nb_points=1000, array_links=True, seed=0):
+    """Return a dense cvrp model with random coordinates"""
+    generator = random.Random(seed)
+    coordinates = [(generator.uniform(0, 1000), generator.uniform(0, 1000))
+                   for _ in range(nb_points)]
+    model = solver.Model(array_links)
+    model.add_vehicle_type(1, 0, 0, capacity=100, max_number=nb_points,
+                           var_cost_dist=1)
+    model.add_depot(0)
+    for i in range(1, nb_points):
+        model.add_customer(i, demand=generator.randint(1, 30))
+    matrix = [[round(((x_i - x_j)**2 + (y_i - y_j)**2)**0.5, 3)
+               for x_j, y_j in coordinates] for x_i, y_i in coordinates]
+    if array_links:
+        model.add_links_from_matrix(matrix)
+    else:
+        for i in range(nb_points):
+            for j in range(i + 1, nb_points):
+                model.add_link(i, j, distance=matrix[i][j])
+    return model
+
+
+def indented_json(model):
+    """Serialization of the model used before the compact format"""
+    return json.dumps({constants.JSON_OBJECT.MAXNUMBER.value:
+                       model.max_total_vehicles_number,
+                       constants.JSON_OBJECT.POINTS.value:
+                       list(model.points.values()),
+                       constants.JSON_OBJECT.VEHICLE_TYPES.value:
+                       list(model.vehicle_types.values()),
+                       constants.JSON_OBJECT.LINKS.value:
+                       list(model.links.values()),
+                       constants.JSON_OBJECT.PARAMETERS.value:
+                       model.parameters.get_parameters()},
+                      indent=1).encode('UTF-8')
+
+
+def bench_json(nb_points=1000):
+    """Print the size and the time of serialization of a dense model"""
+    for array_links in (False, True):
+        model = random_model(nb_points, array_links)
+        storage = "ArrayLinksDict" if array_links else "LinksDict"
+        # the second compact serialization reuses the cached json
+        for name, serialize in (("indented", indented_json),
+                                ("compact", solver.Model._prepare_payload),
+                                ("cached", solver.Model._prepare_payload)):
+            start = time.perf_counter()
+            payload = serialize(model)
+            elapsed = (time.perf_counter() - start) * 1000
+            print(f"{storage:15} {name:9} {len(payload):11} bytes "
+                  f"{elapsed:9.1f} ms")
+
+
+def enumeration_output(nb_routes=100000, nb_points=10, seed=0):
+    """Return an output of bapcod in json format with many routes,
+    as given by the action enumAllFeasibleRoutes"""
+    generator = random.Random(seed)
+    routes = []
+    for _ in range(nb_routes):
+        points = [0] + generator.sample(range(1, 100), nb_points - 2) + [0]
+        routes.append({"vehicleTypeId": 1, "routeCost": 0.0,
+                       "visitedPoints": [
+                           {"incomingArcName": "", "pointId": point,
+                            "pointName": "C" + str(point),
+                            "endTime": float(i), "load": float(10 * i)}
+                           for i, point in enumerate(points)]})
+    return json.dumps({"Status": {"code": 0, "message": ""},
+                       "Solution": {"solutionValue": 0.0,
+                                    "Routes": routes}},
+                      indent=4).encode('UTF-8')
+
+
+def decoded_routes(output):
+    """Decoding of the output used before the arrays of routes"""
+    json_output = json.loads(output)
+    return json_output, [
+        (route["vehicleTypeId"], route["routeCost"],
+         [point["pointId"] for point in route["visitedPoints"]],
+         [point["pointName"] for point in route["visitedPoints"]],
+         [point["load"] for point in route["visitedPoints"]],
+         [point["endTime"] for point in route["visitedPoints"]],
+         [point["incomingArcName"] for point in route["visitedPoints"]])
+        for route in json_output["Solution"]["Routes"]]
+
+
+def bench_output(nb_routes=100000):
+    """Print the time and the peak memory of the decoding of
+    an output with many routes"""
+    output = enumeration_output(nb_routes)
+    for name, decode in (("dictionaries", decoded_routes),
+                         ("arrays", solver._decode_output)):
+        tracemalloc.start()
+        start = time.perf_counter()
+        result = decode(output)
+        elapsed = (time.perf_counter() - start) * 1000
+        size, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        del result
+        print(f"{name:12} {elapsed:9.1f} ms {size / 2**20:8.1f} MiB kept "
+              f"{peak / 2**20:8.1f} MiB peak")
+
+
+def bench_io():
+    """Print the time to read all instances of demos"""
+    path_data = os.path.join(os.path.dirname(os.path.realpath(
+        __file__ + "/../")), "demos", "data")
+    paths = [os.path.join(path_data, folder, name)
+             for folder in ("CVRP", "CVRPTW", "HFVRP", "MDVRP")
+             for name in os.listdir(os.path.join(path_data, folder))
+             if not name.startswith("__")]
+    start = time.perf_counter()
+    for path in paths:
+        io.read_instance(path)
+    elapsed = (time.perf_counter() - start) * 1000
+    print(f"{len(paths)} instances read in {elapsed:.1f} ms")
+
+
+def bench_distances(nb_points=1000):
+    """Print the time to compute a matrix of distances by pair
+    and by rows"""
+    generator = random.Random(0)
+    x = [generator.uniform(0, 1000) for _ in range(nb_points)]
+    y = [generator.uniform(0, 1000) for _ in range(nb_points)]
+    start = time.perf_counter()
+    [[round(math.sqrt((x[i] - x[j])**2 + (y[i] - y[j])**2), 3)
+      for j in range(nb_points)] for i in range(nb_points)]
+    print(f"by pair    {(time.perf_counter() - start) * 1000:9.1f} ms")
+    for rounding in ("exact", "nearest", 3):
+        start = time.perf_counter()
+        distances.distance_matrix(x, y, rounding=rounding)
+        print(f"rows {str(rounding):7} {(time.perf_counter() - start) * 1000:7.1f} ms")
+
+
+def bench_binary(nb_points=1000):
+    """Print the size and the time to save and load a dense model
+    in the binary format and in json format"""
+    model = random_model(nb_points)
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "model")
+        start = time.perf_counter()
+        model.export(path)
+        elapsed = (time.perf_counter() - start) * 1000
+        print(f"export json  {os.path.getsize(path + '.json'):11} bytes "
+              f"{elapsed:9.1f} ms")
+        start = time.perf_counter()
+        model.save(path + ".vrp")
+        elapsed = (time.perf_counter() - start) * 1000
+        print(f"save         {os.path.getsize(path + '.vrp'):11} bytes "
+              f"{elapsed:9.1f} ms")
+        for mmap in (True, False):
+            start = time.perf_counter()
+            loaded = solver.Model.load(path + ".vrp", mmap)
+            elapsed = (time.perf_counter() - start) * 1000
+            print(f"load mmap={str(mmap):5} {len(loaded.links):11} keys  "
+                  f"{elapsed:9.1f} ms")
+            del loaded
+
+
+def replayed_model(path, array_links=True):
+    """Model rebuilt from an exported json with a loop on the elements,
+    as done before Model.from_json"""
+    with open(path) as file:
+        document = json.load(file)
+    model = solver.Model(array_links)
+    model.max_total_vehicles_number = document[
+        constants.JSON_OBJECT.MAXNUMBER.value]
+    for point in document[constants.JSON_OBJECT.POINTS.value]:
+        model.add_point(point["id"], point["name"], point["idCustomer"],
+                        point["serviceTime"], point["penaltyOrCost"],
+                        point["twBegin"], point["twEnd"],
+                        point["demandOrCapacity"],
+                        point["incompatibleVehicles"])
+    for vehicle_type in document[constants.JSON_OBJECT.VEHICLE_TYPES.value]:
+        model.add_vehicle_type(
+            vehicle_type["id"], vehicle_type["startPointId"],
+            vehicle_type["endPointId"], vehicle_type["name"],
+            vehicle_type["capacity"], vehicle_type["fixedCost"],
+            vehicle_type["varCostDist"], vehicle_type["varCostTime"],
+            vehicle_type["maxNumber"], vehicle_type["twBegin"],
+            vehicle_type["twEnd"])
+    for link in document[constants.JSON_OBJECT.LINKS.value]:
+        model.add_link(link["startPointId"], link["endPointId"],
+                       link["name"], link["isDirected"], link["distance"],
+                       link["time"], link["fixedCost"])
+    for name, value in document[
+            constants.JSON_OBJECT.PARAMETERS.value].items():
+        setattr(model.parameters, solver._JSON_PARAMETERS[name], value)
+    return model
+
+
+def bench_from_json(nb_points=1000):
+    """Print the time to import an exported dense model with
+    Model.from_json and with a loop on the elements, the imported
+    model must give the same json as the exported one"""
+    for array_links in (True, False):
+        model = random_model(nb_points, array_links)
+        json_model = str(model)
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "model")
+            model.export(path)
+            for name, function in (("from_json", solver.Model.from_json),
+                                   ("loop", replayed_model)):
+                start = time.perf_counter()
+                imported = function(path + ".json", array_links)
+                elapsed = (time.perf_counter() - start) * 1000
+                same = str(imported) == json_model
+                print(f"{name:9} array_links={str(array_links):5} "
+                      f"{elapsed:9.1f} ms same json: {same}")
+                del imported
+
+
+def bench_heuristic(sizes=(100, 200, 500)):
+    """Print the cost and the time of the heuristic on dense models,
+    without and with the perturbations"""
+    for nb_points in sizes:
+        model = random_model(nb_points)
+        for nb_iterations in (0, 100):
+            start = time.perf_counter()
+            cost, routes = heuristic.solve(model, nb_iterations=nb_iterations)
+            elapsed = (time.perf_counter() - start) * 1000
+            print(f"{nb_points:5} points {nb_iterations:4} iterations "
+                  f"cost {cost:12.3f} {len(routes):4} routes "
+                  f"{elapsed:9.1f} ms")
+
+
+def bench_evaluate(nb_routes=1000, nb_customers=10):
+    """Print the time to evaluate a solution with routes of random
+    customers, the index of links is built at the first evaluation"""
+    model = random_model(1000)
+    generator = random.Random(0)
+    routes = [(1, [0] + generator.sample(range(1, 1000), nb_customers) + [0])
+              for _ in range(nb_routes)]
+    for evaluation in ("first", "second"):
+        start = time.perf_counter()
+        report = model.evaluate(routes)
+        elapsed = (time.perf_counter() - start) * 1000
+        print(f"evaluate {evaluation:6} {nb_routes} routes "
+              f"{len(report['errors']):6} errors {elapsed:9.1f} ms")
+
+
+if __name__ == "__main__":
+    bench_objects()
+    bench_json()
+    bench_output()
+    bench_io()
+    bench_distances()
+    bench_binary()
+    bench_from_json()
+    bench_heuristic()
+    bench_evaluate()
@@ -1,7 +1,16 @@
+import asyncio
+import json
+import math
 import random
+import struct
+import sys
+import tempfile
+import time
 import unittest
 import os
-from VRPSolverEasy.src import solver, constants
+from array import array
+from VRPSolverEasy.src import solver, constants, io, distances, cache, \
+    heuristic, bench
 from VRPSolverEasy.demos import CVRPTW,CVRP,HFVRP,MDVRP
 
 class TestAllVariants(unittest.TestCase):
@@ -812,6 +821,1498 @@ class TestAllClass(unittest.TestCase):
         model.solve()
         print(model.solution)
 
+class TestLibrary(unittest.TestCase):
+
+    def tearDown(self):
+        solver.load_library()
+
+    def test_library_is_loaded_once(self):
+        """ the library is shared by all models of the process """
+        first = solver._get_library()
+        model = solver.Model()
+        model.add_vehicle_type(1, 0, 0, capacity=10)
+        model.add_depot(0)
+        model.add_customer(1, demand=5)
+        model.add_link(0, 1, distance=3)
+        model.solve()
+        self.assertIs(first, solver._get_library())
+        self.assertTrue(solver.library_info()["loaded"])
+
+    def test_library_failure_is_cached(self):
+        """ a bad path raises an error and next solves fail fast """
+        with self.assertRaises(solver.ModelError):
+            solver.load_library("unknown-bapcod-library")
+        info = solver.library_info()
+        self.assertFalse(info["loaded"])
+        self.assertIsNotNone(info["error"])
+        with self.assertRaises(solver.ModelError):
+            solver._get_library()
+
+
+class TestSolveAsync(unittest.TestCase):
+
+    @staticmethod
+    def small_model():
+        """ cvrp model with four customers on a cycle """
+        model = solver.Model()
+        model.add_vehicle_type(1, 0, 0, "VEH1", capacity=100, max_number=3,
+                               var_cost_dist=10)
+        model.add_depot(id=0, name="D1")
+        for i in range(1, 5):
+            model.add_customer(id=i, name="C" + str(i), demand=20)
+        for i in range(5):
+            model.add_link(start_point_id=i, end_point_id=(i + 1) % 5,
+                           distance=5)
+        return model
+
+    def test_solve_async(self):
+        """ the coroutine gives the same solution as solve() """
+        model = self.small_model()
+        asyncio.run(model.solve_async())
+        self.assertEqual(constants.OPTIMAL_SOL_FOUND, model.status)
+        self.assertAlmostEqual(250, model.solution.value, places=5)
+        self.assertIsInstance(model.statistics, solver.Statistics)
+
+    def test_solve_async_concurrent(self):
+        """ several coroutines can wait for their resolution together """
+        models = [self.small_model() for _ in range(3)]
+
+        async def solve_all():
+            await asyncio.gather(*(model.solve_async() for model in models))
+
+        asyncio.run(solve_all())
+        for model in models:
+            self.assertAlmostEqual(250, model.solution.value, places=5)
+
+    def test_solve_many(self):
+        """ models solved by a pool of processes come back in order """
+        models = [self.small_model() for _ in range(4)]
+        models[2].vehicle_types[1].capacity = 50
+        results = list(solver.solve_many(models, max_workers=2))
+        self.assertEqual([0, 1, 2, 3], [index for index, _ in results])
+        self.assertAlmostEqual(250, models[0].solution.value, places=5)
+        self.assertEqual(constants.BETTER_SOL_DOES_NOT_EXISTS,
+                         models[2].status)
+
+    def test_solve_many_completion_order(self):
+        """ all models are given when the order is not kept """
+        models = [self.small_model() for _ in range(3)]
+        indexes = [index for index, _ in
+                   solver.solve_many(models, ordered=False, timeout=60)]
+        self.assertEqual([0, 1, 2], sorted(indexes))
+
+    def test_solve_many_timeout(self):
+        """ the resolutions in progress are stopped at the timeout """
+        # the largest instance of the demo CVRP, not solved in 20 seconds
+        model = bench.build_model(io.read_instance(
+            bench.instances(types=("CVRP",))[-1]))
+        model.parameters.print_level = -2
+        model.parameters.time_limit = 20
+        start = time.monotonic()
+        with self.assertRaises(TimeoutError):
+            list(solver.solve_many([model], timeout=0.5))
+        self.assertLess(time.monotonic() - start, 10)
+
+
+class TestLinksMatrix(unittest.TestCase):
+
+    matrix = [[0, 5, 9, 4],
+              [5, 0, 3, 7],
+              [9, 3, 0, 6],
+              [4, 7, 6, 0]]
+
+    def test_same_links_as_add_link(self):
+        """ links from a matrix are the same as links added one by one """
+        model = solver.Model()
+        model.add_links_from_matrix(self.matrix, time=self.matrix)
+        expected = solver.Model()
+        for i in range(4):
+            for j in range(i + 1, 4):
+                expected.add_link(i, j, distance=float(self.matrix[i][j]),
+                                  time=float(self.matrix[i][j]))
+        self.assertIsInstance(model.links, solver.ArrayLinksDict)
+        self.assertEqual(expected.links.values(), model.links.values())
+        self.assertEqual(3, model.links[(1, 2)][0].distance)
+
+    def test_directed_links_with_mask(self):
+        """ only the entries of the mask give directed links """
+        model = solver.Model()
+        model.add_link(0, 1, distance=1)
+        mask = [[i != j and j == (i + 1) % 4 for j in range(4)]
+                for i in range(4)]
+        model.add_links_from_matrix(self.matrix, symmetric=False,
+                                    sparsity_mask=mask,
+                                    point_ids=[0, 1, 2, 3])
+        self.assertEqual(5, len(model.links.values()))
+        self.assertEqual(2, len(model.links[(0, 1)]))
+        self.assertTrue(model.links[(3, 0)][0].is_directed)
+
+    def test_modified_links(self):
+        """ the links read and modified are written in the arrays """
+        model = solver.Model()
+        model.add_links_from_matrix(self.matrix)
+        self.assertIsInstance(model.links, solver.ArrayLinksDict)
+        model.links._json_size()
+        link = model.links[(1, 2)][0]
+        link.distance = 42
+        link.name = "arc"
+        link.is_directed = True
+        self.assertEqual({"startPointId": 1, "endPointId": 2, "name": "arc",
+                          "isDirected": True, "distance": 42.0},
+                         model.links[(1, 2)][0].get_link())
+        buffer = bytearray()
+        model.links._write_json(buffer)
+        self.assertIn(b'"distance":42.0', buffer)
+        link.end_point_id = 3
+        self.assertNotIn((1, 2), model.links)
+        self.assertEqual(2, len(model.links[(1, 3)]))
+        self.assertEqual((2, 1, 0), (model.adjacency.nb_links(1, 3),
+                                     model.adjacency.nb_links(3, 1),
+                                     model.adjacency.nb_links(1, 2)))
+        # a link read before a deletion cannot be written
+        del model.links[(0, 1)]
+        with self.assertRaises(solver.ModelError):
+            link.distance = 1
+
+    def test_bad_matrix(self):
+        """ raise an error if the matrix is not square or negative """
+        model = solver.Model()
+        with self.assertRaises(solver.PropertyError):
+            model.add_links_from_matrix([[0, 1], [1]])
+        with self.assertRaises(solver.PropertyError):
+            model.add_links_from_matrix([[0, -1], [1, 0]])
+        with self.assertRaises(solver.PropertyError):
+            model.add_links_from_matrix([[0, "a"], [1, 0]])
+        with self.assertRaises(solver.PropertyError):
+            model.add_links_from_matrix(self.matrix, time=[[0, 1], [1, 0]])
+        for value in (math.inf, -math.inf, math.nan):
+            with self.assertRaises(solver.PropertyError):
+                model.add_links_from_matrix([[0, value], [1, 0]])
+            with self.assertRaises(solver.PropertyError):
+                model.add_links_from_matrix(
+                    [[0, 1], [1, 0]], fixed_cost=[[0, value], [1, 0]])
+        # the sum of a row overflows but its values are finite
+        model.add_links_from_matrix([[0, 1e308, 1e308]] * 3)
+        with self.assertRaises(solver.PropertyError):
+            model.add_links_from_matrix(self.matrix,
+                                        sparsity_mask=[[True] * 4] * 3 +
+                                        [[True] * 3])
+        self.assertEqual(3, len(model.links.values()))
+
+    def test_solve_from_matrix(self):
+        """ a model built from a matrix is solved like any model """
+        model = solver.Model()
+        model.add_vehicle_type(1, 0, 0, capacity=100, max_number=2,
+                               var_cost_dist=1)
+        model.add_depot(0)
+        for i in range(1, 4):
+            model.add_customer(i, demand=10)
+        model.add_links_from_matrix(self.matrix)
+        model.solve()
+        self.assertEqual(constants.OPTIMAL_SOL_FOUND, model.status)
+        self.assertAlmostEqual(18, model.solution.value, places=5)
+
+
+class TestArrayLinksDict(unittest.TestCase):
+
+    def test_same_interface_as_links_dict(self):
+        """ the array links dictionary behaves like the links dictionary """
+        model = solver.Model()
+        array_model = solver.Model(array_links=True)
+        for current in (model, array_model):
+            current.add_link(0, 1, "arc1", distance=5)
+            current.add_link(0, 1, "arc2", True, distance=6, time=2)
+            current.add_link(1, 2, "arc3", fixed_cost=-1.5)
+            current.delete_link(1, 2)
+            current.links[(2, 3)] = [solver.Link(2, 3, "arc4", distance=1)]
+        self.assertIsInstance(array_model.links, solver.ArrayLinksDict)
+        self.assertEqual(list(model.links), list(array_model.links))
+        self.assertEqual(len(model.links), len(array_model.links))
+        self.assertNotIn((1, 2), array_model.links)
+        self.assertEqual([link.name for link in model.links[(0, 1)]],
+                         [link.name for link in array_model.links[(0, 1)]])
+        self.assertTrue(array_model.links[(0, 1)][1].is_directed)
+        self.assertEqual(model.links.values(True),
+                         array_model.links.values(True))
+
+    def test_bad_values(self):
+        """ raise an error if the value is not a list of links """
+        links = solver.ArrayLinksDict()
+        with self.assertRaises(solver.ModelError):
+            links[(0, 1)] = solver.Link(0, 1)
+        with self.assertRaises(solver.PropertyError):
+            links[(0, 1)] = [5]
+
+    def test_compact(self):
+        """ deleted rows are removed and the bits of directions kept """
+        links = solver.ArrayLinksDict()
+        for i in range(20):
+            links.add(solver.Link(i, i + 1, is_directed=i % 3 == 0))
+        for i in range(11):
+            del links[(i, i + 1)]
+        self.assertEqual(9, len(links))
+        self.assertEqual([i % 3 == 0 for i in range(11, 20)],
+                         [links[key][0].is_directed for key in links])
+        self.assertLess(links.nbytes, 40 * 9)
+
+
+class TestSlots(unittest.TestCase):
+
+    def test_no_instance_dict(self):
+        """ the elements of the model are slotted """
+        for element in (solver.Point(1), solver.Customer(1),
+                        solver.Depot(0), solver.Link(0, 1),
+                        solver.VehicleType(1), solver.Parameters()):
+            self.assertFalse(hasattr(element, "__dict__"))
+            with self.assertRaises(AttributeError):
+                element.unknown_attribute = 1
+
+    def test_validation_without_fast_path(self):
+        """ values refused by the fast path are checked by the setters """
+        link = solver.Link(True, 1, distance=2.5)
+        self.assertEqual(1, link.start_point_id)
+        with self.assertRaises(solver.PropertyError):
+            solver.Link(0, 1, distance=-1)
+        with self.assertRaises(solver.PropertyError):
+            solver.Point(1, penalty_or_cost="a")
+        with self.assertRaises(solver.PropertyError):
+            solver.VehicleType(1, capacity=1.5)
+        point = solver.Point(3, tw_begin=1, tw_end=4)
+        self.assertEqual((1, 4), point.time_windows)
+        point.penalty_or_cost = 5
+        self.assertEqual(5, point.penalty)
+
+
+class TestJsonCache(unittest.TestCase):
+
+    @staticmethod
+    def payload(model):
+        model.set_json()
+        return json.loads(str(model))
+
+    def test_unchanged_model(self):
+        """ a model serialized twice gives the same payload """
+        for array_links in (False, True):
+            model = TestSolveAsync.small_model()
+            model.links = solver.ArrayLinksDict(model.links) \
+                if array_links else model.links
+            first = str(model)
+            self.assertEqual(first, str(model))
+
+    def test_modified_elements(self):
+        """ modified elements are serialized again """
+        model = TestSolveAsync.small_model()
+        model.points[2].incompatible_vehicles = [2]
+        self.payload(model)
+        model.points[1].demand = 7
+        model.points[2].incompatible_vehicles.append(1)
+        model.vehicle_types[1].capacity = 42
+        model.parameters.time_limit = 12
+        model.links[(0, 1)][0].distance = 99.5
+        payload = self.payload(model)
+        points = {point["id"]: point for point in payload["Points"]}
+        self.assertEqual(7, points[1]["demandOrCapacity"])
+        self.assertEqual([2, 1], points[2]["incompatibleVehicles"])
+        self.assertEqual(42, payload["VehicleTypes"][0]["capacity"])
+        self.assertEqual(12, payload["Parameters"]["timeLimit"])
+        self.assertEqual(99.5, payload["Links"][0]["distance"])
+
+    def test_array_links_added_and_deleted(self):
+        """ rows added or deleted after a serialization are taken
+            into account """
+        model = TestSolveAsync.small_model()
+        model.links = solver.ArrayLinksDict(model.links)
+        number = len(self.payload(model)["Links"])
+        for i in range(1, 10):
+            model.add_link(i, i + 1, distance=i, is_directed=i % 3 == 0)
+        links = self.payload(model)["Links"]
+        self.assertEqual(number + 9, len(links))
+        self.assertEqual([i % 3 == 0 for i in range(1, 10)],
+                         [link.get("isDirected", False)
+                          for link in links[number:]])
+        model.delete_link(1, 2)
+        links = self.payload(model)["Links"]
+        self.assertNotIn((1, 2), [(link["startPointId"],
+                                   link["endPointId"]) for link in links])
+
+
+class TestRoutesArray(unittest.TestCase):
+
+    OUTPUT = {"Status": {"code": 0, "message": "optimal"},
+              "Solution": {"solutionValue": 30.0, "Routes": [
+                  {"vehicleTypeId": 2, "routeCost": 10.0,
+                   "visitedPoints": [
+                       {"incomingArcName": "", "pointId": 0,
+                        "pointName": "D", "endTime": 0.0, "load": 0.0},
+                       {"incomingArcName": "a", "pointId": 3,
+                        "pointName": "C3", "endTime": 4.0, "load": 5.0},
+                       {"incomingArcName": "", "pointId": 0,
+                        "pointName": "D", "endTime": 8.0, "load": 5.0}]},
+                  {"vehicleTypeId": 1, "routeCost": 20.0,
+                   "visitedPoints": [
+                       {"incomingArcName": "", "pointId": 0,
+                        "pointName": "D", "endTime": 0.0, "load": 0.0},
+                       {"incomingArcName": "", "pointId": 0,
+                        "pointName": "D", "endTime": 0.0, "load": 0.0}]}]}}
+
+    def test_decode_output(self):
+        """ the routes decoded in arrays are the same as in json """
+        output, routes = solver._decode_output(
+            json.dumps(self.OUTPUT).encode('UTF-8'))
+        self.assertNotIn("Routes", output["Solution"])
+        self.assertEqual(2, len(routes))
+        self.assertEqual([2, 1], list(routes.vehicle_type_ids))
+        self.assertEqual([0, 3, 5], list(routes.offsets))
+        for index, route in enumerate(self.OUTPUT["Solution"]["Routes"]):
+            self.assertEqual(route, routes.route(index))
+            self.assertEqual(route, routes[index].route)
+        self.assertEqual(["", "a", ""], routes[0].incoming_arc_names)
+        self.assertEqual([0.0, 4.0, 8.0], routes[-2].time_consumption)
+        with self.assertRaises(IndexError):
+            routes[2]
+
+    def test_solution(self):
+        """ the solution gives the same routes and json from
+            arrays or from json """
+        output, routes = solver._decode_output(
+            json.dumps(self.OUTPUT).encode('UTF-8'))
+        from_arrays = solver.Solution(output, 0, routes)
+        from_json = solver.Solution(self.OUTPUT, 0)
+        self.assertEqual(self.OUTPUT, from_arrays.json)
+        self.assertEqual(str(from_json), str(from_arrays))
+        self.assertTrue(from_arrays.is_defined())
+        self.assertEqual([3], solver.Route(
+            self.OUTPUT["Solution"]["Routes"][0]).point_ids[1:2])
+        self.assertIsInstance(from_arrays.routes, list)
+        self.assertIs(routes, from_arrays.routes_array)
+        self.assertEqual([0, 3, 0], from_arrays.routes[:1][0].point_ids)
+
+    def test_integer_values(self):
+        """ the integer loads and times stay integers """
+        route = json.loads(json.dumps(
+            self.OUTPUT["Solution"]["Routes"][0]).replace(".0", ""))
+        for routes in (solver.RoutesArray([route]), solver._decode_output(
+                json.dumps({"Solution": {"Routes": [route]}}).encode())[1]):
+            self.assertEqual("q", routes.loads.typecode)
+            self.assertEqual([0, 5, 5], routes[0].cap_consumption)
+            self.assertIs(int, type(routes[0].time_consumption[1]))
+            self.assertEqual(route, routes.route(0))
+        # the columns become floats at the first float
+        routes = solver.RoutesArray([route, self.OUTPUT["Solution"][
+            "Routes"][0]])
+        self.assertEqual("d", routes.loads.typecode)
+        self.assertEqual([0.0, 5.0, 5.0], routes[1].cap_consumption)
+
+
+class TestSolutionAggregates(unittest.TestCase):
+
+    def test_aggregates(self):
+        """ the aggregates are computed from the arrays of routes """
+        model = TestSolveAsync.small_model()
+        model.solve()
+        self.assertEqual(1, model.solution.num_routes)
+        self.assertEqual({1: 1}, model.solution.vehicle_type_counts)
+        self.assertAlmostEqual(25, model.solution.total_distance)
+        self.assertIsNone(solver.Solution().total_distance)
+        # the distance is computed when the solution is built
+        output = json.dumps(model.solution.json).encode()
+        links = dict(model.links)
+        model.links.clear()
+        self.assertAlmostEqual(25, model.solution.total_distance)
+        self.assertIsNone(solver.Solution.from_json(
+            output, model.links).total_distance)
+        self.assertAlmostEqual(25, solver.Solution.from_json(
+            output, links).total_distance)
+
+    def test_named_parallel_links(self):
+        """ the link of the incoming arc given by bapcod is taken
+            between parallel links """
+        links = solver.LinksDict()
+        links[(0, 3)] = [solver.Link(0, 3, "a", distance=7),
+                         solver.Link(0, 3, distance=2)]
+        solution = solver.Solution(TestRoutesArray.OUTPUT, 0, links=links)
+        self.assertAlmostEqual(9, solution.total_distance)
+
+    def test_keep_json(self):
+        """ the output in json format is kept only on request """
+        model = TestSolveAsync.small_model()
+        model.solve()
+        rebuilt = model.solution.json
+        self.assertIsNot(rebuilt, model.solution.json)
+        model.solve(keep_json=True)
+        self.assertIs(model.solution.json, model.solution.json)
+        self.assertEqual(rebuilt["Solution"]["Routes"],
+                         model.solution.json["Solution"]["Routes"])
+
+
+class TestIo(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def write(self, content):
+        path = os.path.join(self.directory.name, "instance.vrp")
+        with open(path, "w", encoding="UTF-8") as file:
+            file.write(content)
+        return path
+
+    def test_package_module(self):
+        """ the module io of the package is not hidden by the module io
+            of the standard library """
+        from VRPSolverEasy import io as package_io
+        self.assertIs(io.read_cvrplib, package_io.read_cvrplib)
+
+    def test_read_all_demos(self):
+        """ all instances of demos are read with their format """
+        path_data = os.path.join(os.path.dirname(os.path.realpath(
+            __file__ + "/../")), "demos", "data")
+        types = {"CVRP": "CVRP", "CVRPTW": "CVRPTW", "HFVRP": "HFVRP",
+                 "MDVRP": "MDVRP"}
+        for folder, instance_type in types.items():
+            for name in os.listdir(os.path.join(path_data, folder)):
+                if name.startswith("__"):
+                    continue
+                instance = io.read_instance(
+                    os.path.join(path_data, folder, name))
+                self.assertEqual(instance_type, instance.type)
+                self.assertEqual(instance.dimension, len(instance.x))
+                self.assertGreater(len(instance.vehicle_capacities), 0)
+
+    def test_read_solomon(self):
+        """ the columns of a solomon instance """
+        path = os.path.join(os.path.dirname(os.path.realpath(
+            __file__ + "/../")), "demos", "data", "CVRPTW", "C101.txt")
+        instance = io.read_solomon(path)
+        self.assertEqual(101, instance.dimension)
+        self.assertEqual([200], list(instance.vehicle_capacities))
+        self.assertEqual([25], list(instance.vehicle_max_numbers))
+        self.assertEqual((45.0, 68.0, 10), (instance.x[1], instance.y[1],
+                                            instance.demands[1]))
+        self.assertEqual((912.0, 967.0, 90.0), (instance.tw_begin[1],
+                                                instance.tw_end[1],
+                                                instance.service_times[1]))
+
+    def test_explicit_weights(self):
+        """ explicit weights in the triangular formats """
+        header = ("NAME : explicit\nTYPE : CVRP\nDIMENSION : 3\n"
+                  "CAPACITY : 10\nEDGE_WEIGHT_TYPE : EXPLICIT\n"
+                  "EDGE_WEIGHT_FORMAT : %s\nEDGE_WEIGHT_SECTION\n%s\n"
+                  "DEMAND_SECTION\n1 0\n2 3\n3 4\nDEPOT_SECTION\n1\n-1\nEOF\n")
+        expected = [[0, 1, 2], [1, 0, 3], [2, 3, 0]]
+        for weight_format, weights in (
+                ("FULL_MATRIX", "0 1 2\n1 0 3\n2 3 0"),
+                ("LOWER_ROW", "1\n2 3"),
+                ("UPPER_ROW", "1 2\n3"),
+                ("LOWER_DIAG_ROW", "0\n1 0\n2 3 0"),
+                ("UPPER_DIAG_ROW", "0 1 2\n0 3\n0")):
+            instance = io.read_cvrplib(self.write(
+                header % (weight_format, weights)))
+            self.assertEqual(expected, [[instance.distance(i, j)
+                                         for j in range(3)]
+                                        for i in range(3)])
+            self.assertEqual([0, 3, 4], list(instance.demands))
+            self.assertEqual([10], list(instance.vehicle_capacities))
+
+    def test_edge_weight_types(self):
+        """ distances with the conventions of TSPLIB """
+        header = ("NAME : t\nDIMENSION : 2\nEDGE_WEIGHT_TYPE : %s\n"
+                  "NODE_COORD_SECTION\n1 0 0\n2 3 4.4\nEOF\n")
+        for weight_type, distance in (("EUC_2D", 5), ("CEIL_2D", 6),
+                                      ("MAN_2D", 7), ("MAX_2D", 4),
+                                      ("ATT", 2)):
+            instance = io.read_cvrplib(self.write(header % weight_type))
+            self.assertEqual(distance, instance.distance(0, 1))
+        with self.assertRaises(io.InstanceError):
+            io.read_cvrplib(self.write(header % "XRAY1"))
+        with self.assertRaises(io.InstanceError):
+            io.read_cvrplib(self.write("NAME : t\nDIMENSION : 3\n"
+                                       "NODE_COORD_SECTION\n1 0 0\nEOF\n"))
+
+
+class TestDistances(unittest.TestCase):
+
+    X = [0, 3, 3.26, 10]
+    Y = [0, 4, 0.01, 10]
+
+    def test_roundings(self):
+        """ the rows are the same as the distances computed by pair """
+        for rounding, function in (
+                ("exact", lambda value: value),
+                ("nearest", lambda value: float(int(value + 0.5))),
+                ("one_decimal_floor",
+                 lambda value: math.floor(value * 10) / 10),
+                (2, lambda value: round(value, 2))):
+            matrix = distances.distance_matrix(self.X, self.Y,
+                                               rounding=rounding)
+            for i in range(4):
+                for j in range(4):
+                    self.assertAlmostEqual(function(math.sqrt(
+                        (self.X[i] - self.X[j])**2 +
+                        (self.Y[i] - self.Y[j])**2)), matrix[i][j], 12)
+
+    def test_metrics(self):
+        """ manhattan and haversine metrics, float32 rows """
+        matrix = distances.distance_matrix(self.X, self.Y, "manhattan",
+                                           dtype="float32")
+        self.assertEqual('f', matrix[0].typecode)
+        self.assertEqual([0, 7, 20], [matrix[0][0], matrix[0][1],
+                                      matrix[0][3]])
+        # Paris - London
+        matrix = distances.distance_matrix([48.8566, 51.5074],
+                                           [2.3522, -0.1278], "haversine")
+        self.assertAlmostEqual(343.5, matrix[0][1], 0)
+        times = distances.time_matrix(self.X, self.Y, speed=2.0)
+        self.assertAlmostEqual(2.5, times[0][1])
+        with self.assertRaises(ValueError):
+            distances.distance_matrix(self.X, self.Y, "chebyshev")
+
+    def test_blocks_and_neighbors(self):
+        """ the blocks give the full matrix, the neighbors are sorted """
+        blocks = list(distances.matrix_blocks(self.X, self.Y, block_size=3))
+        self.assertEqual([0, 3], [first_row for first_row, _ in blocks])
+        self.assertEqual(distances.distance_matrix(self.X, self.Y),
+                         blocks[0][1] + blocks[1][1])
+        neighbors, lengths = distances.nearest_neighbors(self.X, self.Y, 2)
+        self.assertEqual([[2, 1], [2, 0], [0, 1], [1, 2]],
+                         [list(row) for row in neighbors])
+        self.assertAlmostEqual(3.26, lengths[2][0], 3)
+        self.assertEqual(3, len(distances.nearest_neighbors(
+            self.X, self.Y, 10)[0][0]))
+
+    def test_feed_model(self):
+        """ the rows are given to the model without conversion """
+        model = solver.Model()
+        model.add_links_from_matrix(distances.distance_matrix(
+            self.X, self.Y, rounding="nearest", dtype="float32"))
+        self.assertEqual(6, len(model.links))
+        self.assertEqual(5, model.links[(0, 1)][0].distance)
+
+
+class TestSparsifyLinks(unittest.TestCase):
+
+    @staticmethod
+    def line_model():
+        """ customers on a line, the depot 0 at the origin """
+        model = solver.Model()
+        model.add_vehicle_type(1, 0, 0, capacity=10, max_number=5,
+                               var_cost_dist=1)
+        model.add_depot(id=0)
+        for i in range(1, 6):
+            model.add_customer(id=i, demand=4)
+        positions = list(range(6))
+        model.add_links_from_matrix(distances.distance_matrix(
+            positions, [0] * 6))
+        return model
+
+    def test_neighbors(self):
+        """ each customer keeps its nearest neighbors and the depot """
+        model = self.line_model()
+        report = model.sparsify_links(k=1, keep=[(5, 1)])
+        self.assertEqual(15, report["links_before"])
+        self.assertEqual(5 + 4 + 1, report["links_after"])
+        self.assertEqual(5, report["removed_neighbors"])
+        self.assertIn((0, 5), model.links)
+        self.assertIn((1, 2), model.links)
+        self.assertIn((1, 5), model.links)
+        self.assertNotIn((1, 3), model.links)
+        self.assertGreater(report["json_bytes_saved"], 0)
+        self.assertEqual(report["json_bytes_before"] -
+                         report["json_bytes_after"],
+                         report["json_bytes_saved"])
+        self.assertEqual(len(str(model)), len(str(model)))
+
+    def test_infeasible(self):
+        """ links exceeding the capacity or the time windows """
+        model = self.line_model()
+        model.points[1].demand = 7
+        model.points[2].tw_begin = 50
+        model.points[2].tw_end = 60
+        model.points[3].tw_end = 10
+        model.points[3].service_time = 3
+        report = model.sparsify_links()
+        self.assertEqual(4, report["removed_capacity"])
+        # 2 -> 3 : max(0, 50 + 0 + 1) + 3 > 10, 3 -> 2 is feasible
+        self.assertIn((2, 3), model.links)
+        model.links = solver.ArrayLinksDict()
+        model.add_link(2, 3, distance=1, time=1, is_directed=True)
+        model.add_link(3, 2, distance=1, time=1, is_directed=True)
+        report = model.sparsify_links()
+        self.assertEqual(1, report["removed_time_windows"])
+        self.assertEqual([(3, 2)], list(model.links))
+
+
+class TestPreprocess(unittest.TestCase):
+
+    @staticmethod
+    def tw_model(array_links=False):
+        """ a depot open from 0 to 100 and 3 customers """
+        model = solver.Model(array_links)
+        model.add_vehicle_type(1, 0, 0, capacity=10, max_number=3,
+                               var_cost_dist=1, tw_end=100)
+        model.add_vehicle_type(2, 0, 0, capacity=5, max_number=3,
+                               var_cost_dist=1, tw_end=100)
+        model.add_depot(id=0, tw_end=100)
+        model.add_customer(id=1, demand=7, tw_end=20)
+        model.add_customer(id=2, demand=2, tw_end=15)
+        model.add_customer(id=3, demand=2, tw_begin=30, tw_end=60,
+                           service_time=5)
+        for i in range(1, 4):
+            model.add_link(0, i, distance=10, time=10)
+        model.add_link(1, 2, distance=5, time=5)
+        model.add_link(2, 3, distance=5, time=5)
+        model.add_link(1, 3, distance=50, time=50)
+        return model
+
+    def test_time_window_zero(self):
+        """ tw_end=0 is a time window closed at 0, as in bapcod """
+        model = self.tw_model()
+        model.points[2].tw_end = 0
+        model.parameters.print_level = -2
+        model.solve(preprocess=True)
+        self.assertEqual(0, model.points[2].tw_end)
+        self.assertEqual([2], model.preprocessing["infeasible_customers"])
+        self.assertEqual(constants.INFEASIBLE, model.status)
+        self.assertFalse(model.solution.is_defined())
+
+    def test_preprocess(self):
+        """ time windows tightened, incompatibilities and links removed """
+        for array_links in (False, True):
+            model = self.tw_model(array_links)
+            report = model.preprocess()
+            self.assertEqual([2], model.points[1].incompatible_vehicles)
+            self.assertEqual(1, report["incompatibilities_added"])
+            self.assertEqual(2, report["time_windows_tightened"])
+            self.assertEqual((10, 20), (model.points[1].tw_begin,
+                                        model.points[1].tw_end))
+            self.assertEqual((10, 15), (model.points[2].tw_begin,
+                                        model.points[2].tw_end))
+            self.assertEqual((30, 60), (model.points[3].tw_begin,
+                                        model.points[3].tw_end))
+            self.assertEqual(1, report["removed_time_windows"])
+            self.assertNotIn((1, 3), model.links)
+            self.assertEqual(5, len(model.links))
+            self.assertEqual([], report["infeasible_customers"])
+            self.assertEqual({"incompatibilities", "time_windows", "links"},
+                             set(report["times"]))
+
+    def test_same_solution(self):
+        """ the preprocessing does not change the optimal value """
+        values = []
+        for preprocess in (False, True):
+            model = self.tw_model()
+            model.parameters.print_level = -2
+            model.solve(preprocess=preprocess)
+            values.append(model.solution.value)
+        self.assertAlmostEqual(values[0], values[1])
+        self.assertIsNotNone(model.preprocessing)
+
+    def test_infeasible(self):
+        """ bapcod is not called when a customer cannot be served """
+        model = self.tw_model()
+        model.points[2].demand = 11
+        model.points[3].tw_end = 12
+        model.solve(preprocess=True)
+        self.assertEqual(constants.INFEASIBLE, model.status)
+        self.assertEqual([2, 3], model.preprocessing["infeasible_customers"])
+        self.assertFalse(model.solution.is_defined())
+        # an optional customer does not make the model infeasible
+        model = self.tw_model()
+        model.points[3].tw_end = 12
+        model.points[3].penalty_or_cost = 100.0
+        self.assertEqual([], model.preprocess()["infeasible_customers"])
+
+
+class TestCheckDepots(unittest.TestCase):
+
+    @staticmethod
+    def depots_model():
+        """ 3 depots, the vehicle type i starts and ends at the depot i """
+        model = solver.Model()
+        for i in range(1, 4):
+            model.add_depot(id=i)
+            model.add_vehicle_type(i, i, i, capacity=10)
+        model.add_customer(id=10, demand=1)
+        model.add_link(1, 10, distance=1)
+        return model
+
+    def test_incompatibilities(self):
+        """ the unused depots are incompatible with the vehicle types """
+        model = self.depots_model()
+        model.check_depots()
+        self.assertEqual([2, 3], model.points[1].incompatible_vehicles)
+        self.assertEqual([1, 3], model.points[2].incompatible_vehicles)
+        self.assertEqual([], model.points[10].incompatible_vehicles)
+        model.check_depots()
+        self.assertEqual([2, 3], model.points[1].incompatible_vehicles)
+
+    def test_index_updates(self):
+        """ the depots and vehicle types added, deleted or modified """
+        model = self.depots_model()
+        model.set_json()
+        model.check_depots()
+        model.add_depot(id=4)
+        model.add_vehicle_type(4, 1, 4)
+        model.delete_vehicle_type(3)
+        model.check_depots()
+        self.assertEqual([1, 2], model.points[4].incompatible_vehicles)
+        self.assertEqual([2], model.points[1].incompatible_vehicles)
+        self.assertEqual([1, 4], model.points[2].incompatible_vehicles)
+        model.vehicle_types[2].end_point_id = 3
+        model.delete_depot(4)
+        model.check_depots()
+        self.assertEqual([1, 4], model.points[3].incompatible_vehicles)
+        # the incompatibilities removed by the user are restored
+        model.set_json()
+        model.points[1].incompatible_vehicles = []
+        model.check_depots()
+        self.assertEqual([2], model.points[1].incompatible_vehicles)
+
+    def test_points_set(self):
+        """ the depots set in the dictionary of points or by id_customer,
+            without the functions of the model """
+        model = self.depots_model()
+        model.check_depots()
+        model.points[7] = solver.Point(7)
+        model.check_depots()
+        self.assertEqual([1, 2, 3], model.points[7].incompatible_vehicles)
+        model.points[10].id_customer = 0
+        model.check_depots()
+        self.assertEqual([1, 2, 3], model.points[10].incompatible_vehicles)
+        del model.points[7]
+        model.points[10].id_customer = 10
+        model.add_customer(id=11, id_customer=10, penalty=5)
+        model.set_json()
+        self.assertEqual(5, model.points[10].penalty_or_cost)
+
+    def test_vehicle_types_replaced(self):
+        """ a vehicle type deleted and another one set in the dictionary
+            of vehicle types """
+        model = self.depots_model()
+        model.check_depots()
+        del model.vehicle_types[3]
+        model.vehicle_types[4] = solver.VehicleType(4, 1, 1, capacity=10)
+        model.check_depots()
+        self.assertEqual([2], model.points[1].incompatible_vehicles)
+        self.assertEqual([1, 2, 4], model.points[3].incompatible_vehicles)
+
+
+class TestCustomerClusters(unittest.TestCase):
+
+    def test_penalties(self):
+        """ the points of a customer share its penalty """
+        model = solver.Model()
+        model.add_customer(id=10, id_customer=1, demand=1)
+        model.add_customer(id=11, id_customer=1, demand=1, penalty=10.0)
+        model.add_customer(id=12, id_customer=1, demand=1)
+        model.add_customer(id=13, id_customer=2, demand=1, penalty=3.0)
+        model.add_customer(id=14, id_customer=2, demand=1)
+        model.add_depot(id=0)
+        model.add_vehicle_type(1, 0, 0, capacity=10)
+        model.add_link(0, 10, distance=1)
+        model.set_json()
+        self.assertEqual([10.0, 10.0, 10.0, 3.0, 3.0],
+                         [model.points[id].penalty_or_cost
+                          for id in range(10, 15)])
+        self.assertIn('"penaltyOrCost":10.0', str(model))
+        # a point modified after is kept as it is
+        model.points[12].penalty_or_cost = 5.0
+        model.set_json()
+        self.assertEqual(5.0, model.points[12].penalty_or_cost)
+
+    def test_delete(self):
+        """ the point deleted is removed from its customer only """
+        model = solver.Model()
+        model.add_customer(id=1, id_customer=7, demand=1)
+        model.add_customer(id=10, id_customer=1, demand=1, penalty=8.0)
+        model.add_customer(id=11, id_customer=1, demand=1)
+        model.delete_customer(1)
+        model.delete_customers([11])
+        model.add_customer(id=12, id_customer=1, demand=1)
+        model.add_customer(id=13, id_customer=7, demand=1, penalty=2.0)
+        with self.assertRaises(solver.ModelError):
+            model.delete_customers([10, 11])
+        self.assertIn(10, model.points)
+        model.add_depot(id=0)
+        model.add_vehicle_type(1, 0, 0, capacity=10)
+        model.add_link(0, 10, distance=1)
+        model.set_json()
+        self.assertEqual(8.0, model.points[12].penalty_or_cost)
+        self.assertEqual(2.0, model.points[13].penalty_or_cost)
+
+
+class TestBulkAdd(unittest.TestCase):
+
+    def test_same_model(self):
+        """ the bulk functions give the same model as one by one """
+        model = solver.Model()
+        model.add_vehicle_type(1, 0, 0, capacity=10, max_number=2,
+                               var_cost_dist=1.5)
+        model.add_vehicle_type(2, 0, 5, name="big", capacity=20)
+        model.add_depot(id=0, tw_end=100.0)
+        model.add_depot(id=5, cost=3.0, incompatible_vehicles=[1])
+        model.add_customer(id=1, demand=3, tw_begin=2.0, tw_end=30.0,
+                           incompatible_vehicles=[2])
+        model.add_customer(id=2, id_customer=7, demand=4, penalty=9.0)
+        model.add_customer(id=3, id_customer=7, demand=1,
+                           service_time=2.5)
+        bulk = solver.Model()
+        bulk.add_vehicle_types([1, 2], start_point_ids=[0, 0],
+                               end_point_ids=[0, 5], names=["", "big"],
+                               capacities=[10, 20], max_numbers=[2, 1],
+                               var_costs_dist=[1.5, 0.0])
+        bulk.add_depots(array('i', [0, 5]), costs=[0.0, 3.0],
+                        tw_ends=array('d', [100.0, 0.0]),
+                        incompatible_offsets=[0, 0, 1],
+                        incompatible_vehicles=[1])
+        bulk.add_customers([1, 2, 3], demands=array('q', [3, 4, 1]),
+                           id_customers=[0, 7, 7],
+                           penalties=[0.0, 9.0, 0.0],
+                           service_times=[0.0, 0.0, 2.5],
+                           tw_begins=[2.0, 0.0, 0.0],
+                           tw_ends=[30.0, 0.0, 0.0],
+                           incompatible_offsets=[0, 1, 1, 1],
+                           incompatible_vehicles=[2])
+        for model_ in (model, bulk):
+            model_.add_link(0, 1, distance=1)
+        self.assertEqual(str(model), str(bulk))
+        self.assertEqual(9.0, bulk.points[3].penalty_or_cost)
+        bulk.check_depots()
+        self.assertEqual([1], bulk.points[5].incompatible_vehicles)
+        self.assertEqual([], bulk.points[0].incompatible_vehicles)
+
+    def test_errors(self):
+        """ all errors are given at once and nothing is added """
+        model = solver.Model()
+        model.add_customer(id=1, demand=1)
+        with self.assertRaises(solver.BulkError) as context:
+            model.add_customers([1, 2, "x", 4, 4], demands=[1, -2, 3, 1, 1],
+                                tw_ends=[0, 1, "a", 3, 4],
+                                names=[""] * 4)
+        self.assertEqual(["ids[2] must be an integer",
+                          "ids[0] : " + constants.ERRORS_MODEL[
+                              constants.ADD_POINT_ERROR],
+                          "ids[4] : " + constants.ERRORS_MODEL[
+                              constants.ADD_POINT_ERROR],
+                          "names must have one value for each id",
+                          "tw_ends[2] must be a number",
+                          "demands[1] must be greater or equal than 0"],
+                         context.exception.errors)
+        self.assertEqual([1], list(model.points))
+        with self.assertRaises(solver.ModelError):
+            model.add_customers([2, 3], incompatible_offsets=[0, 2, 1],
+                                incompatible_vehicles=[1, 2])
+        with self.assertRaises(solver.BulkError) as context:
+            model.add_vehicle_types([0, 1], capacities=[1.5, 2],
+                                    start_point_ids=[-2, 0])
+        self.assertEqual(3, len(context.exception.errors))
+        self.assertEqual(0, len(model.vehicle_types))
+        with self.assertRaises(solver.BulkError):
+            model.add_depots(range(1100, 3100))
+        self.assertEqual(1, len(model.points))
+        # the id 0 is accepted with an id_customer, as in add_customer
+        with self.assertRaises(solver.BulkError) as context:
+            model.add_customers([0], demands=[1])
+        self.assertEqual(["ids[0] must be greater or equal than 1"],
+                         context.exception.errors)
+        model.add_customers([0], id_customers=[3], demands=[1])
+        self.assertEqual(3, model.points[0].id_customer)
+
+
+class TestBinaryFormat(unittest.TestCase):
+
+    def test_save_load(self):
+        """ the model loaded gives the same json """
+        model = TestSolveAsync.small_model()
+        model.add_vehicle_type(2, 0, 0, name="small", capacity=3,
+                               fixed_cost=2.5, tw_end=50)
+        model.add_customer(id=5, id_customer=2, demand=1, penalty=7.5,
+                           tw_begin=3, tw_end=20.5,
+                           incompatible_vehicles=[2])
+        model.add_link(2, 5, name="arc6", distance=3.5, time=2,
+                       is_directed=True)
+        model.parameters.time_limit = 12
+        model.parameters.solver_name = "CPLEX"
+        model.max_total_vehicles_number = 7
+        json_model = str(model)
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "model.vrp")
+            model.save(path)
+            for mmap in (True, False):
+                loaded = solver.Model.load(path, mmap=mmap)
+                # links are stored in arrays of floats
+                self.assertEqual(json.loads(json_model),
+                                 json.loads(str(loaded)))
+                loaded.save(path + "2")
+                self.assertEqual(str(loaded),
+                                 str(solver.Model.load(path + "2", mmap)))
+                self.assertEqual(7.5, loaded.points[5].penalty_or_cost)
+                self.assertIs(type(loaded.points[5].tw_begin), int)
+                self.assertEqual([2], loaded.points[5].incompatible_vehicles)
+                self.assertEqual("small", loaded.vehicle_types[2].name)
+                self.assertEqual(12, loaded.parameters.time_limit)
+                # the arrays are copied before the deletion, not the
+                # mapped file
+                loaded = solver.Model.load(path, mmap=mmap)
+                del loaded.links[(0, 1)]
+                self.assertIsInstance(loaded.links._start_point_ids, array)
+                self.assertNotIn((0, 1), loaded.links)
+                self.assertIn((0, 1), solver.Model.load(path, mmap).links)
+                loaded.add_link(1, 5, distance=1)
+                self.assertIn((1, 5), loaded.links)
+                self.assertEqual([], model.points[1].incompatible_vehicles)
+                del loaded
+
+    def test_invalid_file(self):
+        """ a file which is not a model """
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "model.vrp")
+            for content in (b"", b"{}", b"VRPSEASY\x09\0\0\0\0\0\0\0"):
+                with open(path, "wb") as file:
+                    file.write(content)
+                for mmap in (True, False):
+                    with self.assertRaises(solver.ModelError):
+                        solver.Model.load(path, mmap)
+            TestSolveAsync.small_model().save(path)
+            with open(path, "rb") as file:
+                content = file.read()
+            magic, version, size = struct.unpack_from("<8sII", content)
+            header = json.loads(content[16:16 + size])
+            sections = content[16 + size + (-(16 + size) % 8):]
+
+            def modified(header):
+                header = json.dumps(header).encode()
+                return struct.pack("<8sII", magic, version, len(header)) + \
+                    header + bytes(-(16 + len(header)) % 8) + sections
+
+            wrong_size = json.loads(json.dumps(header))
+            wrong_size["sections"]["points.tw_end"][2] += 1
+            wrong_offset = json.loads(json.dumps(header))
+            wrong_offset["sections"]["links.distances"][0] = len(sections)
+            # truncated files and headers which don't match the sections
+            for content in (content[:len(content) - 8], content[:100],
+                            modified(wrong_size), modified(wrong_offset),
+                            modified({"byteorder": sys.byteorder}),
+                            modified(dict(header, names=None))):
+                with open(path, "wb") as file:
+                    file.write(content)
+                for mmap in (True, False):
+                    with self.assertRaises(solver.ModelError):
+                        solver.Model.load(path, mmap)
+
+
+class TestFromJson(unittest.TestCase):
+
+    @staticmethod
+    def model(array_links):
+        """ model with all kinds of elements """
+        model = solver.Model(array_links)
+        model.add_vehicle_type(1, 0, 0, "VEH1", capacity=100, max_number=3,
+                               var_cost_dist=10)
+        model.add_vehicle_type(2, 6, 6, name="small", capacity=3,
+                               fixed_cost=2.5, tw_end=50)
+        model.add_depot(id=0, name="D1")
+        for i in range(1, 5):
+            model.add_customer(id=i, name="C" + str(i), demand=20)
+        model.add_depot(id=6, cost=1.5, tw_end=60.5,
+                        incompatible_vehicles=[1])
+        model.add_point(id=7, name="D3", demand=4)
+        model.add_customer(id=5, id_customer=2, demand=1, penalty=7.5,
+                           tw_begin=3, tw_end=20.5,
+                           incompatible_vehicles=[2])
+        for i in range(5):
+            model.add_link(start_point_id=i, end_point_id=(i + 1) % 5,
+                           distance=5)
+        model.add_link(2, 5, name="arc6", distance=3.5, time=2,
+                       is_directed=True, fixed_cost=-1)
+        model.add_link(2, 5, distance=4)
+        model.add_link(6, 5, distance=1.25)
+        model.parameters.time_limit = 12
+        model.parameters.heuristic_used = True
+        model.max_total_vehicles_number = 7
+        return model
+
+    def test_round_trip(self):
+        """ the model imported gives the same json as the model exported """
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "model")
+            for array_links in (False, True):
+                model = self.model(array_links)
+                json_model = str(model)
+                for all_elements in (False, True):
+                    # the incompatibilities of depots are added in the
+                    # model exported with all elements
+                    model.export(path, all_elements)
+                    imported = solver.Model.from_json(path + ".json",
+                                                      array_links)
+                    self.assertEqual(str(model), str(imported))
+                self.assertEqual(json_model, str(solver.Model.from_json(
+                    json_model.encode() + b"\0", array_links)))
+                self.assertEqual(7.5, imported.points[5].penalty)
+                self.assertEqual([1], imported.points[6].incompatible_vehicles)
+                self.assertEqual(4, imported.points[7].demand)
+                self.assertTrue(imported.parameters.heuristic_used)
+
+    def test_demo_models(self):
+        """ the round trip on a model of each demo, the customer 0
+            of MDVRP included """
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "model")
+            for type_ in bench.TYPES:
+                model = bench.build_model(io.read_instance(
+                    bench.instances(types=(type_,))[0]))
+                for all_elements in (False, True):
+                    model.export(path, all_elements)
+                    imported = solver.Model.from_json(path + ".json")
+                    self.assertEqual(str(model), str(imported))
+
+    def test_errors(self):
+        """ invalid documents and values """
+        for document in (b"", b"[]", b'{"Points":3}', b'{"Unknown":[]}',
+                         b'{"Links":[{"startPointId":0}'):
+            with self.assertRaises(solver.ModelError):
+                solver.Model.from_json(document)
+        with self.assertRaises(solver.BulkError) as error:
+            solver.Model.from_json(
+                b'{"Links":[{"startPointId":0,"endPointId":1,"distance":-1}]}')
+        self.assertEqual(1, len(error.exception.errors))
+
+    def test_solution(self):
+        """ the solution imported gives the same routes """
+        model = TestSolveAsync.small_model()
+        model.solve()
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "solution")
+            model.solution.export(path)
+            solution = solver.Solution.from_json(path + ".json", model.links)
+        self.assertEqual(model.solution.json, solution.json)
+        self.assertEqual(model.solution.value, solution.value)
+        self.assertEqual(model.solution.total_distance,
+                         solution.total_distance)
+        self.assertEqual(str(model.solution), str(solution))
+        self.assertFalse(solver.Solution.from_json(b"{}").is_defined())
+        with self.assertRaises(solver.ModelError):
+            solver.Solution.from_json(b"{")
+
+
+class TestSolutionCache(unittest.TestCase):
+
+    def check_cached(self, solutions_cache):
+        """ the second resolution is taken in the cache """
+        model = TestSolveAsync.small_model()
+        model.solve(cache=solutions_cache)
+        solved = TestSolveAsync.small_model()
+        solved.solve(cache=solutions_cache)
+        self.assertEqual((1, 1), (solutions_cache.hits,
+                                  solutions_cache.misses))
+        self.assertEqual(1, len(solutions_cache))
+        self.assertEqual((model.status, model.message),
+                         (solved.status, solved.message))
+        self.assertEqual(str(model.solution), str(solved.solution))
+        self.assertEqual(model.solution.json, solved.solution.json)
+        self.assertEqual(repr(model.statistics), repr(solved.statistics))
+        # another parameter gives another model
+        solved.parameters.time_limit = 10
+        asyncio.run(solved.solve_async(cache=solutions_cache))
+        self.assertEqual((1, 2), (solutions_cache.hits,
+                                  solutions_cache.misses))
+        asyncio.run(solved.solve_async(cache=solutions_cache))
+        self.assertEqual(2, solutions_cache.hits)
+        self.assertAlmostEqual(250, solved.solution.value, places=5)
+
+    def test_memory_cache(self):
+        """ outputs in memory, the last used are kept """
+        self.check_cached(cache.MemoryCache())
+        outputs = cache.MemoryCache(max_size=2)
+        for key in ("a", "b", "a", "c"):
+            if outputs.get(key) is None:
+                outputs.put(key, key.encode())
+        self.assertEqual(b"a", outputs.get("a"))
+        self.assertIsNone(outputs.get("b"))
+        self.assertEqual({"hits": 2, "misses": 4, "size": 2}, outputs.stats)
+        with self.assertRaises(ValueError):
+            cache.MemoryCache(0)
+
+    def test_sqlite_cache(self):
+        """ outputs in a file, kept until they expire """
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "cache.db")
+            with cache.SQLiteCache(path) as outputs:
+                self.check_cached(outputs)
+            with cache.SQLiteCache(path) as outputs:
+                self.assertEqual(2, len(outputs))
+                outputs.put("a", b"output")
+                self.assertEqual(b"output", outputs.get("a"))
+            with cache.SQLiteCache(path, ttl=0.01) as outputs:
+                time.sleep(0.02)
+                self.assertIsNone(outputs.get("a"))
+                outputs.put("b", bytearray(b"output"))
+                self.assertEqual(1, len(outputs))
+                outputs.clear()
+                self.assertEqual(0, len(outputs))
+
+    def test_key(self):
+        """ the final null byte is not in the key """
+        model = TestSolveAsync.small_model()
+        model.set_json()
+        payload = str(model).encode()
+        self.assertEqual(cache.payload_key(payload),
+                         cache.payload_key(bytearray(payload + b"\0")))
+
+
+class TestWarmStart(unittest.TestCase):
+
+    def test_optimal_initial_solution(self):
+        """ the initial solution is kept if no better solution exists """
+        model = TestSolveAsync.small_model()
+        model.solve()
+        for keep_json in (False, True):
+            solved = TestSolveAsync.small_model()
+            solved.solve(keep_json, initial_solution=model.solution)
+            self.assertAlmostEqual(250, solved.warm_start["cost"])
+            self.assertEqual(constants.BETTER_SOL_DOES_NOT_EXISTS,
+                             solved.status)
+            self.assertAlmostEqual(250, solved.solution.value, places=5)
+            self.assertEqual(model.solution.routes[0].point_ids,
+                             solved.solution.routes[0].point_ids)
+            self.assertEqual(1, len(solved.solution.json["Solution"]["Routes"]))
+            # the upper bound of the model is not changed
+            self.assertEqual(1000000, solved.parameters.upper_bound)
+
+    def test_repair(self):
+        """ the points which cannot be visited are dropped and the
+        customers not served are inserted """
+        model = TestPreprocess.tw_model()
+        model.add_customer(id=4, demand=1, penalty=100, tw_end=100)
+        model.add_link(0, 4, distance=30, time=30)
+        model.parameters.print_level = -2
+        # customer 3 is too late after 1, 5 is unknown, there is no
+        # vehicle type 3
+        routes = [(1, [0, 2, 1, 3, 0]), (3, [0, 4, 0]), (2, [0, 5, 0])]
+        model.solve(initial_solution=routes)
+        report = model.warm_start
+        self.assertEqual(2, report["routes"])
+        self.assertEqual(2, report["dropped_routes"])
+        self.assertEqual(2, report["dropped_points"])
+        self.assertEqual(1, report["inserted_customers"])
+        # 0-2-1-0 and 0-3-0, customer 4 is optional
+        self.assertAlmostEqual(25 + 20 + 100, report["cost"])
+        # the solver serves customer 4
+        self.assertEqual(constants.OPTIMAL_SOL_FOUND, model.status)
+        self.assertAlmostEqual(25 + 20 + 60, model.solution.value, places=5)
+
+    def test_not_repaired(self):
+        """ a customer which cannot be inserted """
+        model = TestPreprocess.tw_model()
+        model.add_customer(id=4, demand=11)
+        model.add_link(0, 4, distance=30, time=30)
+        model.parameters.print_level = -2
+        model.solve(initial_solution=[(1, [0, 1, 0])])
+        self.assertIsNone(model.warm_start["cost"])
+        self.assertEqual(1000000, model.parameters.upper_bound)
+
+
+class TestHeuristic(unittest.TestCase):
+
+    @staticmethod
+    def depots_model():
+        """ open routes from a depot and closed routes from another one """
+        model = solver.Model()
+        model.add_vehicle_type(1, start_point_id=0, capacity=10,
+                               max_number=2, var_cost_dist=1)
+        model.add_vehicle_type(2, 10, 10, capacity=10, max_number=1,
+                               var_cost_dist=1, fixed_cost=5)
+        model.add_depot(0)
+        model.add_depot(10)
+        for i in (1, 2, 3, 11, 12):
+            model.add_customer(i, demand=4)
+        for ids in ((0, 1, 2, 3), (10, 11, 12)):
+            for i in ids:
+                for j in ids:
+                    if i < j:
+                        model.add_link(i, j, distance=j - i)
+        model.add_link(0, 11, distance=20)
+        model.add_link(3, 10, distance=30)
+        return model
+
+    def test_time_windows(self):
+        """ the optimal routes of a model with time windows """
+        for array_links in (False, True):
+            model = TestPreprocess.tw_model(array_links)
+            cost, routes = heuristic.solve(model)
+            self.assertAlmostEqual(45, cost)
+            self.assertEqual([(1, [0, 1, 0]), (1, [0, 2, 3, 0])], routes)
+
+    def test_optional_customer(self):
+        """ an optional customer is served if its penalty is greater """
+        for penalty, expected in ((10, 55), (100, 75)):
+            model = TestPreprocess.tw_model()
+            model.add_customer(id=4, demand=1, penalty=penalty, tw_end=100)
+            model.add_link(0, 4, distance=20, time=20)
+            model.add_link(3, 4, distance=20, time=20)
+            cost, routes = heuristic.solve(model)
+            self.assertAlmostEqual(expected, cost)
+            served = [id for _, point_ids in routes for id in point_ids]
+            self.assertEqual(penalty == 100, 4 in served)
+
+    def test_depots(self):
+        """ heterogeneous vehicle types with their own depots """
+        cost, routes = heuristic.solve(self.depots_model())
+        self.assertAlmostEqual(4 + 5 + 4, cost)
+        self.assertEqual([(1, [0, 1]), (1, [0, 2, 3]),
+                          (2, [10, 12, 11, 10])], routes)
+
+    def test_not_found(self):
+        """ customers which cannot be served """
+        model = TestPreprocess.tw_model()
+        model.points[1].incompatible_vehicles = [1]
+        self.assertEqual((None, []), heuristic.solve(model))
+        # a customer without link to the depot
+        self.assertEqual((None, []),
+                         heuristic.solve(TestSolveAsync.small_model()))
+        with self.assertRaises(ValueError):
+            heuristic.solve(model, time_limit=-1)
+        with self.assertRaises(ValueError):
+            heuristic.solve(model, nb_neighbors=0)
+        with self.assertRaises(ValueError):
+            heuristic.solve(model, nb_iterations=-1)
+
+    def test_heuristic_time(self):
+        """ the routes of the heuristic give the upper bound """
+        model = TestPreprocess.tw_model()
+        model.parameters.print_level = -2
+        # the heuristic of bapcod only, without heuristic_time
+        model.parameters.heuristic_used = True
+        model.solve()
+        self.assertIsNone(model.warm_start)
+        model.solve(heuristic_time=5)
+        self.assertEqual("heuristic", model.warm_start["source"])
+        self.assertAlmostEqual(45, model.warm_start["cost"])
+        self.assertAlmostEqual(45, model.solution.value, places=5)
+        self.assertEqual(2, len(model.solution.routes))
+        self.assertEqual(1000000, model.parameters.upper_bound)
+        # no routes found by the heuristic
+        model = TestSolveAsync.small_model()
+        model.parameters.print_level = -2
+        asyncio.run(model.solve_async(heuristic_time=5))
+        self.assertIsNone(model.warm_start["cost"])
+        self.assertAlmostEqual(250, model.solution.value, places=5)
+
+
+class TestEvaluate(unittest.TestCase):
+
+    def test_feasible(self):
+        """ the values of routes are computed again from the model """
+        for array_links in (False, True):
+            model = TestPreprocess.tw_model(array_links)
+            report = model.evaluate([(1, [0, 1, 0]), (1, [0, 2, 3, 0])])
+            self.assertTrue(report["feasible"])
+            self.assertEqual([], report["errors"])
+            self.assertAlmostEqual(45, report["cost"])
+            self.assertEqual([20, 25], list(report["costs"]))
+            self.assertEqual([20, 45], list(report["times"]))
+            self.assertEqual([7, 4], list(report["loads"]))
+            self.assertEqual([0, 3, 7], list(report["offsets"]))
+            self.assertEqual([0, 10, 35, 45], list(report["end_times"][3:]))
+            self.assertEqual([0, 2, 4, 4], list(report["point_loads"][3:]))
+
+    def test_violations(self):
+        """ each violation is given with its route """
+        model = TestPreprocess.tw_model()
+        model.add_customer(id=4, demand=1, penalty=8)
+        report = model.evaluate([(2, [0, 1, 2, 0]), (1, [0, 3, 1]),
+                                 (5, [0, 2, 0]), (1, [0, 0, 4, 0])])
+        self.assertFalse(report["feasible"])
+        self.assertEqual([(0, "capacity", 9), (1, "end_depot", 0),
+                          (1, "served_twice", 1), (1, "time_window", 1),
+                          (2, "vehicle_type", 5), (3, "depot", 0),
+                          (3, "link", 0), (3, "link", 4)],
+                         sorted(report["errors"]))
+        self.assertEqual([1, 3, 1, 3], list(report["violations"]))
+        self.assertEqual(0, report["penalties"])
+
+    def test_parallel_links(self):
+        """ the link named in the solution is used, otherwise the
+            cheapest one """
+        model = TestPreprocess.tw_model()
+        model.add_link(0, 3, name="a", distance=40, time=40)
+        model.add_link(3, 0, name="b", distance=1, time=1,
+                       is_directed=True)
+        model.add_customer(id=4, demand=1, penalty=8)
+        output, routes = solver._decode_output(
+            json.dumps(TestRoutesArray.OUTPUT).encode('UTF-8'))
+        for solution in (routes, list(routes),
+                         solver.Solution(output, 0, routes)):
+            report = model.evaluate(solution)
+            self.assertEqual([40 + 1, 0], list(report["costs"]))
+            self.assertEqual([41, 0], list(report["distances"]))
+            self.assertAlmostEqual(8 + 41, report["cost"])
+            self.assertEqual(8, report["penalties"])
+            self.assertEqual([(-1, "not_served", 1),
+                              (-1, "not_served", 2)], report["errors"])
+
+
+class TestAdjacencyIndex(unittest.TestCase):
+
+    @staticmethod
+    def links_model(array_links=False):
+        """ parallel links, a link not directed and a directed one """
+        model = solver.Model(array_links)
+        model.add_vehicle_type(1, 0, 0, var_cost_dist=1, var_cost_time=2)
+        model.add_link(0, 1, distance=3)
+        model.add_link(0, 1, name="b", distance=1, fixed_cost=5)
+        model.add_link(1, 2, is_directed=True, distance=2, time=1)
+        return model
+
+    def test_arcs(self):
+        """ the arcs by point with the links not directed in both
+            directions and the parallel links """
+        for array_links in (False, True):
+            model = self.links_model(array_links)
+            adjacency = model.adjacency
+            self.assertEqual([0, 2], adjacency.successors(1))
+            self.assertEqual([0], adjacency.predecessors(1))
+            self.assertEqual([0], adjacency.neighbors(1))
+            self.assertEqual([], adjacency.neighbors(2))
+            self.assertEqual(2, adjacency.nb_links(1, 0))
+            self.assertEqual(0, adjacency.nb_links(2, 1))
+            self.assertIn((1, 2), adjacency)
+            self.assertNotIn((2, 1), adjacency)
+            self.assertEqual(3, len(adjacency))
+            self.assertEqual([0, 0, 2],
+                             [id for id, _ in model.out_arcs(1)])
+            self.assertEqual([1, 1], [id for id, _ in model.in_arcs(0)])
+            self.assertEqual(2, len(model.arcs(1, 0)))
+            self.assertEqual([], model.arcs(2, 1))
+            self.assertEqual(3, model.arc_cost(1, 0, 1))
+            self.assertEqual(4, model.arc_cost(1, 2, 1))
+            self.assertIsNone(model.arc_cost(2, 1, 1))
+
+    def test_updates(self):
+        """ the index is updated by add_link and delete_link and built
+            again after the other modifications """
+        for array_links in (False, True):
+            model = self.links_model(array_links)
+            adjacency = model.adjacency
+            model.add_link(2, 0, is_directed=True)
+            model.add_link(3, 3)
+            model.delete_link(0, 1)
+            self.assertIs(adjacency, model.adjacency)
+            expected = solver.AdjacencyIndex(
+                [1, 2, 3], [2, 0, 3], [True, True, False])
+            for direction in ("out", "in", "undirected"):
+                self.assertEqual(expected.csr(direction),
+                                 adjacency.csr(direction))
+            self.assertEqual(([1, 2, 3], [0, 1, 2, 3], [2, 0, 3],
+                              [1, 1, 1]),
+                             tuple(map(list, adjacency.csr())))
+            model.links[(4, 5)] = [solver.Link(4, 5)]
+            self.assertIsNot(adjacency, model.adjacency)
+            self.assertEqual([4], model.adjacency.predecessors(5))
+            with self.assertRaises(ValueError):
+                adjacency.csr("both")
+        # the points and is_directed of a link modified in place
+        model = self.links_model(False)
+        link = solver.Link(4, 5)
+        model.links[(4, 5)] = [link]
+        self.assertEqual([5], model.adjacency.predecessors(4))
+        link.is_directed = True
+        self.assertEqual([], model.adjacency.predecessors(4))
+        adjacency = model.adjacency
+        link.start_point_id = 6
+        self.assertIsNot(adjacency, model.adjacency)
+        self.assertEqual([6], model.adjacency.predecessors(5))
+        link.end_point_id = link.end_point_id
+        self.assertIs(model.adjacency, model.adjacency)
+
+
+class TestBench(unittest.TestCase):
+
+    def test_measure(self):
+        """ the stages before the resolution on an instance of each type,
+            without bapcod """
+        for type_ in bench.TYPES:
+            path = bench.instances(types=(type_,))[0]
+            result = bench.measure(path, solve=False)
+            self.assertIsNone(result["error"])
+            self.assertEqual(type_, result["type"])
+            self.assertTrue(result["instance"].startswith(type_ + "/"))
+            self.assertGreater(result["payload_bytes"], 0)
+            self.assertGreaterEqual(result["set_json_time"], 0)
+            self.assertIsNone(result["solve_time"])
+            self.assertIsNone(result["best_lb"])
+        self.assertEqual(4, len(bench.instances(pattern="p0[1-4]")))
+
+    def test_results(self):
+        """ the results written and compared with a baseline """
+        baseline = [{"instance": "CVRP/a", "build_time": 0.1,
+                     "payload_bytes": 100, "peak_rss": None},
+                    {"instance": "CVRP/b", "build_time": 0.1,
+                     "error": "ModelError: "}]
+        results = [{"instance": "CVRP/a", "build_time": 0.2,
+                    "payload_bytes": 101, "peak_rss": 10},
+                   {"instance": "CVRP/b", "build_time": 0.2},
+                   {"instance": "CVRP/c", "build_time": 0.2}]
+        regressions = bench.compare(results, baseline)
+        self.assertEqual([("build_time", 2.0), ("payload_bytes", 1.01)],
+                         [(regression["measure"], regression["ratio"])
+                          for regression in regressions])
+        self.assertEqual([], bench.compare(results, baseline,
+                                           {"build_time": 1.5}))
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "results.json")
+            bench.write_json(results, path)
+            self.assertEqual(results, bench.read_json(path))
+            path = os.path.join(directory, "results.csv")
+            bench.write_csv(results, path)
+            with open(path, encoding="UTF-8") as file:
+                lines = file.read().splitlines()
+            self.assertEqual(",".join(bench.FIELDS), lines[0])
+            self.assertEqual(4, len(lines))
+
+
+class TestJsonNumbers(unittest.TestCase):
+
+    class Number(float):
+        """ a subclass of float with another repr, as numpy.float64 """
+
+        def __repr__(self):
+            return "Number(%s)" % float(self)
+
+    def test_float_subclass(self):
+        """ the values of a subclass of float give valid json """
+        for array_links in (False, True):
+            model = TestSolveAsync.small_model()
+            if array_links:
+                model.links = solver.ArrayLinksDict(model.links)
+            model.add_link(1, 2, distance=self.Number(2.5),
+                           time=self.Number(1), fixed_cost=self.Number(-3))
+            link = model.links[(1, 2)][-1]
+            self.assertIs(float, type(link.distance))
+            links = [link for link in TestJsonCache.payload(model)["Links"]
+                     if link.get("fixedCost")]
+            self.assertEqual([(2.5, 1, -3)], [
+                (link["distance"], link["time"], link["fixedCost"])
+                for link in links])
+
+    def test_not_finite(self):
+        """ the infinite values and nan are rejected """
+        for value in (math.inf, -math.inf, math.nan):
+            for name in ("distance", "time", "fixed_cost"):
+                with self.assertRaises(solver.PropertyError):
+                    solver.Link(0, 1, **{name: value})
+        with self.assertRaises(solver.BulkError) as error:
+            solver.Model.from_json(
+                b'{"Links":[{"startPointId":0,"endPointId":1,'
+                b'"distance":Infinity},{"startPointId":1,"endPointId":2,'
+                b'"fixedCost":NaN}]}')
+        self.assertEqual(["distances[0] must be a finite number",
+                          "fixed_costs[1] must be a finite number"],
+                         error.exception.errors)
+
+
 class TestAllDemos(unittest.TestCase):
     def test_cvrp_demos_an32k5(self):
         """test demo A-n32-k5 in augerat format"""
@@ -901,6 +2402,54 @@ def VRPSolverEasyTestAll():
         unittest.TestLoader().loadTestsFromTestCase(TestAllClass))
     suite_all.addTests(
         unittest.TestLoader().loadTestsFromTestCase(TestAllDemos))
+    suite_all.addTests(
+        unittest.TestLoader().loadTestsFromTestCase(TestJsonNumbers))
+    suite_all.addTests(
+        unittest.TestLoader().loadTestsFromTestCase(TestBench))
+    suite_all.addTests(
+        unittest.TestLoader().loadTestsFromTestCase(TestAdjacencyIndex))
+    suite_all.addTests(
+        unittest.TestLoader().loadTestsFromTestCase(TestEvaluate))
+    suite_all.addTests(
+        unittest.TestLoader().loadTestsFromTestCase(TestHeuristic))
+    suite_all.addTests(
+        unittest.TestLoader().loadTestsFromTestCase(TestWarmStart))
+    suite_all.addTests(
+        unittest.TestLoader().loadTestsFromTestCase(TestSolutionCache))
+    suite_all.addTests(
+        unittest.TestLoader().loadTestsFromTestCase(TestFromJson))
+    suite_all.addTests(
+        unittest.TestLoader().loadTestsFromTestCase(TestBinaryFormat))
+    suite_all.addTests(
+        unittest.TestLoader().loadTestsFromTestCase(TestBulkAdd))
+    suite_all.addTests(
+        unittest.TestLoader().loadTestsFromTestCase(TestCustomerClusters))
+    suite_all.addTests(
+        unittest.TestLoader().loadTestsFromTestCase(TestCheckDepots))
+    suite_all.addTests(
+        unittest.TestLoader().loadTestsFromTestCase(TestPreprocess))
+    suite_all.addTests(
+        unittest.TestLoader().loadTestsFromTestCase(TestSparsifyLinks))
+    suite_all.addTests(
+        unittest.TestLoader().loadTestsFromTestCase(TestDistances))
+    suite_all.addTests(
+        unittest.TestLoader().loadTestsFromTestCase(TestIo))
+    suite_all.addTests(
+        unittest.TestLoader().loadTestsFromTestCase(TestSolutionAggregates))
+    suite_all.addTests(
+        unittest.TestLoader().loadTestsFromTestCase(TestRoutesArray))
+    suite_all.addTests(
+        unittest.TestLoader().loadTestsFromTestCase(TestJsonCache))
+    suite_all.addTests(
+        unittest.TestLoader().loadTestsFromTestCase(TestSlots))
+    suite_all.addTests(
+        unittest.TestLoader().loadTestsFromTestCase(TestArrayLinksDict))
+    suite_all.addTests(
+        unittest.TestLoader().loadTestsFromTestCase(TestLinksMatrix))
+    suite_all.addTests(
+        unittest.TestLoader().loadTestsFromTestCase(TestSolveAsync))
+    suite_all.addTests(
+        unittest.TestLoader().loadTestsFromTestCase(TestLibrary))
     result_test = unittest.TextTestRunner().run(suite_all)
     if not result_test.wasSuccessful():
         raise Exception("Tests failed")